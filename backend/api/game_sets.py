@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-from db.database import get_db
+from db.database import get_db, get_async_read_db
 from models.game_set import GameSet
 from models.player import Player, game_set_players
 from models.schemas import GameSetCreate, GameSetResponse, PlayerResponse
-from services import game_service
+from services import game_service, standings_service
 
 router = APIRouter(prefix="/api/game-sets", tags=["game-sets"])
 
@@ -26,9 +27,9 @@ def create_game_set(game_set_data: GameSetCreate, db: Session = Depends(get_db))
 
 
 @router.get("/{game_set_id}", response_model=GameSetResponse)
-def get_game_set(game_set_id: str, db: Session = Depends(get_db)):
+async def get_game_set(game_set_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get a game set by ID."""
-    game_set = db.query(GameSet).filter(GameSet.game_set_id == game_set_id).first()
+    game_set = await db.get(GameSet, game_set_id)
     if not game_set:
         raise HTTPException(status_code=404, detail="Game set not found")
     return game_set
@@ -63,11 +64,18 @@ def join_game_set(game_set_id: str, player_id: str, db: Session = Depends(get_db
 
 
 @router.get("/{game_set_id}/players")
-def list_players(game_set_id: str, db: Session = Depends(get_db)):
+async def list_players(game_set_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """List all players in a game set."""
+    out = await db.run_sync(_list_players, game_set_id)
+    if out is None:
+        raise HTTPException(status_code=404, detail="Game set not found")
+    return out
+
+
+def _list_players(db: Session, game_set_id: str) -> dict | None:
     game_set = db.query(GameSet).filter(GameSet.game_set_id == game_set_id).first()
     if not game_set:
-        raise HTTPException(status_code=404, detail="Game set not found")
+        return None
 
     return {
         "players": [player.to_dict() for player in game_set.players],
@@ -77,13 +85,13 @@ def list_players(game_set_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{game_set_id}/active-game")
-def get_active_game_endpoint(game_set_id: str, db: Session = Depends(get_db)):
+async def get_active_game_endpoint(game_set_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get the current active game for a game set, if one exists."""
-    game_set = db.query(GameSet).filter(GameSet.game_set_id == game_set_id).first()
+    game_set = await db.get(GameSet, game_set_id)
     if not game_set:
         raise HTTPException(status_code=404, detail="Game set not found")
     
-    active_game = game_service.get_active_game(db, game_set_id)
+    active_game = await db.run_sync(game_service.get_active_game, game_set_id)
     if not active_game:
         raise HTTPException(status_code=404, detail="No active game found")
     
@@ -94,11 +102,19 @@ def get_active_game_endpoint(game_set_id: str, db: Session = Depends(get_db)):
 def start_game_endpoint(game_set_id: str, db: Session = Depends(get_db)):
     """Start a new game in a game set. Returns existing active game if one already exists."""
     try:
-        game = game_service.start_game(db, game_set_id)
-        return game.to_dict()
+        return game_service.start_game_bulk(db, game_set_id)
     except ValueError as e:
         # Convert ValueError from service to appropriate HTTP error
         if "not found" in str(e).lower():
             raise HTTPException(status_code=404, detail=str(e))
         else:
             raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{game_set_id}/standings")
+def get_standings(game_set_id: str, db: Session = Depends(get_db)):
+    """Get every player's cumulative wins, deaths and votes received across the set's finished games."""
+    try:
+        return standings_service.get_standings(db, game_set_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
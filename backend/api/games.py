@@ -1,9 +1,12 @@
 """API endpoints for games."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.database import get_db
-from models.game import Game, GameState
+from db.database import get_db, get_async_read_db, AsyncReadSessionLocal
+from models.game import Game
 from models.player_role import PlayerRole
+from models import roles
 from models.schemas import (
     NightStatusCompleteRequest,
     ViewCenterRequest,
@@ -28,25 +31,71 @@ from services import (
     discussion_service,
     voting_service,
     results_service,
+    snapshot_service,
+    event_hub,
+    version_service,
+    version_watch,
 )
 
 router = APIRouter(prefix="/api/games", tags=["games"])
 
+# Seconds between SSE keepalive comments when no events arrive
+SSE_KEEPALIVE_SECONDS = 15
+
+
+async def _check_version(request: Request, response: Response, db: AsyncSession, game_id: str) -> Response | None:
+    """
+    Tag the response with the game's version as ETag.
+
+    Returns a 304 response when the client's If-None-Match already names that
+    version, so the caller can skip the service call entirely.
+    """
+    version = await db.run_sync(version_service.get_version, game_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
+    etag = version_service.make_etag(version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if version_service.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+async def _wait_for_version_change(game_id: str, wait_for_version: int, timeout: float) -> None:
+    """
+    Long-poll: hold the request until the game's version differs from wait_for_version.
+
+    Returns as soon as the version moves on (or immediately if it already has);
+    after timeout seconds the caller answers with the unchanged state. Each check
+    uses a fresh session so no connection is held while waiting.
+    """
+    async def changed() -> bool:
+        async with AsyncReadSessionLocal() as db:
+            version = await db.run_sync(version_service.get_version, game_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
+        return version != wait_for_version
+
+    timeout = max(0.0, min(timeout, version_watch.LONG_POLL_MAX_SECONDS))
+    await version_watch.watcher.wait(game_id, changed, timeout)
+
+
 @router.get("/{game_id}")
-def get_game(game_id: str, db: Session = Depends(get_db)):
+async def get_game(game_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)):
     """Get a game by ID."""
+    not_modified = await _check_version(request, response, db, game_id)
+    if not_modified:
+        return not_modified
+    out = await db.run_sync(_get_game_view, game_id)
+    if out is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return out
+
+
+def _get_game_view(db: Session, game_id: str) -> dict | None:
     game = db.query(Game).filter(Game.game_id == game_id).first()
     if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
-    
-    # Check and advance simulated roles if needed (when in NIGHT state)
-    if game.state == GameState.NIGHT:
-        night_service.check_and_advance_simulated_role(db, game_id)
-        db.refresh(game)
-    # Check discussion timer and maybe transition to DAY_VOTING
-    if game.state == GameState.DAY_DISCUSSION:
-        discussion_service.check_discussion_timer_and_maybe_transition(db, game_id)
-        db.refresh(game)
+        return None
 
     out = game.to_dict()
     # All players have acknowledged their role reveal when every player_role has role_revealed=True
@@ -58,10 +107,10 @@ def get_game(game_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{game_id}/players/{player_id}/role")
-def get_player_role(game_id: str, player_id: str, db: Session = Depends(get_db)):
+async def get_player_role(game_id: str, player_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get a player's role in a specific game."""
     try:
-        player_role = game_service.get_player_role(db, game_id, player_id)
+        player_role = await db.run_sync(game_service.get_player_role, game_id, player_id)
         return player_role.to_dict()
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -78,20 +127,65 @@ def acknowledge_role(game_id: str, player_id: str, db: Session = Depends(get_db)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     player_role.role_revealed = True
+    version_service.bump_version(db, game_id)
     db.commit()
     db.refresh(player_role)
+    event_hub.publish(game_id, "role_acknowledged", {"player_id": player_id})
+    version_watch.notify(game_id)
     return {"status": "ok", "role_revealed": True}
 
 
+async def _game_exists(game_id: str) -> bool:
+    async with AsyncReadSessionLocal() as db:
+        return await db.get(Game, game_id) is not None
+
+
+@router.get("/{game_id}/events")
+async def stream_game_events(game_id: str, request: Request):
+    """Server-sent event stream of game state changes (night steps, actions, vote-now, votes)."""
+    # Own short-lived session: a Depends(get_db) session would stay checked out for the whole stream
+    if not await _game_exists(game_id):
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    subscription = event_hub.hub.subscribe(game_id)
+
+    async def event_stream():
+        try:
+            yield event_hub.format_sse({"type": "connected", "game_id": game_id})
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield event_hub.format_sse(event)
+        finally:
+            event_hub.hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{game_id}/discussion-status")
-def get_discussion_status(
+async def get_discussion_status(
     game_id: str,
     player_id: str | None = None,
-    db: Session = Depends(get_db),
+    wait_for_version: int | None = None,
+    timeout: float = 25,
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """Get discussion phase timer status. Include vote-now counts when player_id query param provided."""
+    """
+    Get discussion phase timer status. Include vote-now counts when player_id query param provided.
+
+    With ?wait_for_version=N the request is held until the game's version is no
+    longer N or ?timeout= seconds pass.
+    """
+    if wait_for_version is not None:
+        await _wait_for_version_change(game_id, wait_for_version, timeout)
     try:
-        return discussion_service.get_discussion_status(db, game_id, player_id)
+        return await db.run_sync(discussion_service.get_discussion_status, game_id, player_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -106,21 +200,27 @@ def post_vote_now(game_id: str, player_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{game_id}/night-status")
-def get_night_status(game_id: str, db: Session = Depends(get_db)):
-    """Get the current night phase status."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
-
-    if game.current_role_step is None and game.state == GameState.NIGHT:
-        try:
-            night_service.initialize_night_phase(db, game_id)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-
+async def get_night_status(
+    game_id: str,
+    request: Request,
+    response: Response,
+    wait_for_version: int | None = None,
+    timeout: float = 25,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Get the current night phase status.
+
+    With ?wait_for_version=N the request is held until the game's version is no
+    longer N or ?timeout= seconds pass.
+    """
+    if wait_for_version is not None:
+        await _wait_for_version_change(game_id, wait_for_version, timeout)
+    not_modified = await _check_version(request, response, db, game_id)
+    if not_modified:
+        return not_modified
     try:
-        # This will also check and advance simulated roles if needed
-        return night_service.get_night_status(db, game_id)
+        return await db.run_sync(night_service.get_night_status, game_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -161,16 +261,11 @@ def get_night_info(game_id: str, player_id: str, db: Session = Depends(get_db)):
     step = game.current_role_step
     if not step or step != pr.initial_role:
         raise HTTPException(status_code=400, detail="Night info only available when it is your role's turn")
-    try:
-        if step == "Werewolf":
-            return werewolf_service.get_night_info(db, game_id, player_id)
-        if step == "Minion":
-            return minion_service.get_night_info(db, game_id, player_id)
-        if step == "Mason":
-            return mason_service.get_night_info(db, game_id, player_id)
-        if step == "Insomniac":
-            return insomniac_service.get_night_info(db, game_id, player_id)
+    descriptor = roles.get(step)
+    if descriptor is None or descriptor.night_info is None:
         raise HTTPException(status_code=400, detail=f"Night info not available for role {step}")
+    try:
+        return descriptor.night_info(db, game_id, player_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -191,39 +286,52 @@ def view_center_card(
 
 @router.post("/{game_id}/players/{player_id}/acknowledge")
 def acknowledge_night_info(game_id: str, player_id: str, db: Session = Depends(get_db)):
-    """Acknowledge night info (Werewolf, Minion, Mason, Insomniac). Dispatches by current role step."""
+    """Acknowledge night info (Werewolf, Minion, Mason, Insomniac). Dispatches on the current role step via the role registry."""
     game = db.query(Game).filter(Game.game_id == game_id).first()
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     step = game.current_role_step
-    try:
-        if step == "Werewolf":
-            return werewolf_service.acknowledge_werewolf(db, game_id, player_id)
-        if step == "Minion":
-            return minion_service.acknowledge_minion(db, game_id, player_id)
-        if step == "Mason":
-            return mason_service.acknowledge_mason(db, game_id, player_id)
-        if step == "Insomniac":
-            return insomniac_service.acknowledge_insomniac(db, game_id, player_id)
+    descriptor = roles.get(step)
+    if descriptor is None or descriptor.acknowledge is None:
         raise HTTPException(status_code=400, detail=f"Acknowledge not applicable for role step {step}")
+    try:
+        return descriptor.acknowledge(db, game_id, player_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{game_id}/players/{player_id}/available-actions")
-def get_available_actions(game_id: str, player_id: str, db: Session = Depends(get_db)):
+async def get_available_actions(game_id: str, player_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get which players/center cards are actionable for the current player."""
     try:
-        return action_service.get_available_actions(db, game_id, player_id)
+        return await db.run_sync(action_service.get_available_actions, game_id, player_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/{game_id}/players/{player_id}/actions")
-def get_player_actions(game_id: str, player_id: str, db: Session = Depends(get_db)):
+async def get_player_actions(
+    game_id: str,
+    player_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """Get all accrued actions visible to the player."""
+    not_modified = await _check_version(request, response, db, game_id)
+    if not_modified:
+        return not_modified
+    try:
+        return await db.run_sync(action_service.get_player_actions, game_id, player_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{game_id}/players/{player_id}/snapshot")
+async def get_player_snapshot(game_id: str, player_id: str, db: AsyncSession = Depends(get_async_read_db)):
+    """Get the player's full game view (game, night status, actions, discussion, votes, players) in one call."""
     try:
-        return action_service.get_player_actions(db, game_id, player_id)
+        return await db.run_sync(snapshot_service.get_player_snapshot, game_id, player_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -301,10 +409,13 @@ def cast_vote(
 
 
 @router.get("/{game_id}/votes")
-def get_votes(game_id: str, db: Session = Depends(get_db)):
+async def get_votes(game_id: str, request: Request, response: Response, db: AsyncSession = Depends(get_async_read_db)):
     """Get vote status (who voted, count, total players)."""
+    not_modified = await _check_version(request, response, db, game_id)
+    if not_modified:
+        return not_modified
     try:
-        return voting_service.get_votes(db, game_id)
+        return await db.run_sync(voting_service.get_votes, game_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from db.database import get_db
+from db.database import get_db, get_async_read_db
 from models.player import Player
 from models.schemas import PlayerCreate, PlayerResponse
 
@@ -22,9 +23,9 @@ def create_player(player_data: PlayerCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{player_id}", response_model=PlayerResponse)
-def get_player(player_id: str, db: Session = Depends(get_db)):
+async def get_player(player_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """Get a player by ID."""
-    player = db.query(Player).filter(Player.player_id == player_id).first()
+    player = await db.get(Player, player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     return player
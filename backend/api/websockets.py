@@ -0,0 +1,75 @@
+"""WebSocket endpoints for pushing per-player game updates."""
+import asyncio
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from db.database import AsyncReadSessionLocal
+from models.player_role import PlayerRole
+from services import action_service, snapshot_service, event_hub
+
+router = APIRouter(tags=["websockets"])
+
+
+async def _run_with_session(fn, *args):
+    """Run a sync service function on its own short-lived async read session."""
+    async with AsyncReadSessionLocal() as db:
+        return await db.run_sync(fn, *args)
+
+
+def _get_initial_role(db, game_id: str, player_id: str) -> str | None:
+    pr = db.query(PlayerRole).filter(
+        PlayerRole.game_id == game_id,
+        PlayerRole.player_id == player_id
+    ).first()
+    return pr.initial_role if pr else None
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Drain client messages (the feed is push-only) until the client goes away."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+async def _messages_for_event(event: dict, game_id: str, player_id: str, initial_role: str) -> list[dict]:
+    """The event itself plus any derived per-player delta (turn start, refreshed accrued actions)."""
+    messages = [event]
+    if event["type"] == "night_step" and event.get("current_role") == initial_role:
+        turn = await _run_with_session(snapshot_service.get_turn_view, game_id, player_id)
+        messages.append({"type": "your_turn", "game_id": game_id, "role": initial_role, **turn})
+    elif event["type"] == "night_result":
+        accrued = await _run_with_session(action_service.get_player_actions, game_id, player_id)
+        messages.append({"type": "actions", "game_id": game_id, **accrued})
+    return messages
+
+
+@router.websocket("/ws/games/{game_id}/players/{player_id}")
+async def player_game_feed(websocket: WebSocket, game_id: str, player_id: str):
+    """
+    Push a player's view of a game: a full snapshot on connect, then deltas.
+
+    Broadcast events (night steps, actions, votes) go to every player; night
+    results (e.g. the Robber's new role, the Seer's viewed cards) only to the
+    player who acted.
+    """
+    initial_role = await _run_with_session(_get_initial_role, game_id, player_id)
+    if initial_role is None:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    subscription = event_hub.hub.subscribe(game_id, player_id=player_id)
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        snapshot = await _run_with_session(snapshot_service.get_player_snapshot, game_id, player_id)
+        await websocket.send_json({"type": "snapshot", **snapshot})
+        while True:
+            next_event = asyncio.create_task(subscription.get())
+            await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_event.cancel()
+                break
+            for message in await _messages_for_event(next_event.result(), game_id, player_id, initial_role):
+                await websocket.send_json(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        event_hub.hub.unsubscribe(subscription)
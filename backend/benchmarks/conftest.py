@@ -0,0 +1,165 @@
+"""Fixtures for the service benchmarks: a database with a large game history and a factory for new games."""
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+from db.database import Base, create_db_engine
+from db.ids import new_id
+from models.action import Action, ActionType
+from models.center_card import CenterCard
+from models.game import Game, GameState
+from models.game_result import GameResult
+from models.game_set import GameSet
+from models.player import Player, game_set_players
+from models.player_role import PlayerRole
+from models.vote import Vote
+from models.vote_now import VoteNow  # noqa: F401  (registers the table)
+from models import roles
+from services import game_service
+
+# Finished games already in the database when the benchmarks run, to expose table scans.
+# Seeding 100k games takes about a minute; set e.g. BENCH_HISTORY_GAMES=1000 for a quick run.
+HISTORY_GAMES = int(os.getenv("BENCH_HISTORY_GAMES", "100000"))
+HISTORY_PLAYERS = 1000
+HISTORY_GAME_SET_SIZE = 10  # games per historical game set
+HISTORY_BATCH = 2000
+
+# Roles for a game of N players are the first N + 3, so every game has two Werewolves
+# and larger games wake more roles
+ROLE_POOL = [
+    "Werewolf", "Werewolf", "Seer", "Robber", "Troublemaker", "Drunk", "Insomniac",
+    "Minion", "Mason", "Mason", "Villager", "Tanner", "Hunter",
+]
+HISTORY_ROLES = ROLE_POOL[:8]
+
+
+def roles_for(num_players: int) -> list[str]:
+    return ROLE_POOL[:num_players + 3]
+
+
+def _seed_history(engine, num_games: int) -> None:
+    """Insert num_games finished 5-player games (roles, center cards, actions, votes, results)."""
+    players = [{"player_id": new_id(), "player_name": f"Past{i}"} for i in range(HISTORY_PLAYERS)]
+    with engine.begin() as conn:
+        conn.execute(insert(Player), players)
+
+    for batch_start in range(0, num_games, HISTORY_BATCH):
+        rows = {table: [] for table in ("game_sets", "members", "games", "roles", "center", "actions", "votes", "results")}
+        game_set_id = None
+        for n in range(batch_start, min(batch_start + HISTORY_BATCH, num_games)):
+            seats = [players[(n * 5 + seat) % HISTORY_PLAYERS]["player_id"] for seat in range(5)]
+            if n % HISTORY_GAME_SET_SIZE == 0:
+                game_set_id = new_id()
+                rows["game_sets"].append({
+                    "game_set_id": game_set_id, "num_players": 5, "selected_roles": HISTORY_ROLES,
+                    "discussion_timer_seconds": 300, "assign_in_order": False,
+                })
+                rows["members"].extend({"game_set_id": game_set_id, "player_id": pid} for pid in seats)
+            game_id = new_id()
+            rows["games"].append({
+                "game_id": game_id, "game_set_id": game_set_id, "game_number": n % HISTORY_GAME_SET_SIZE + 1,
+                "state": GameState.RESULTS, "current_role_step": None,
+                "active_roles": roles.wake_plan(HISTORY_ROLES), "version": 20,
+            })
+            rows["roles"].extend({
+                "player_role_id": new_id(), "game_id": game_id, "player_id": pid,
+                "initial_role": role, "current_role": role, "team": roles.team_for(role),
+                "was_killed": seat == 0, "night_action_completed": True, "role_revealed": True,
+            } for seat, (pid, role) in enumerate(zip(seats, HISTORY_ROLES)))
+            rows["center"].extend({
+                "center_card_id": new_id(), "game_id": game_id, "position": position, "role": role,
+            } for position, role in zip(("left", "center", "right"), HISTORY_ROLES[5:]))
+            rows["actions"].extend({
+                "action_id": new_id(), "game_id": game_id, "player_id": seats[seat],
+                "action_type": ActionType.VIEW_CARD, "source_id": seats[0], "target_id": seats[0],
+                "source_role": "Werewolf", "target_role": "Werewolf",
+            } for seat in (0, 1, 2))
+            rows["votes"].extend({
+                "vote_id": new_id(), "game_id": game_id,
+                "voter_player_id": pid, "target_player_id": seats[(seat + 1) % 5 if seat else 1],
+            } for seat, pid in enumerate(seats))
+            rows["results"].append({"game_id": game_id, "results": {"winning_team": "village"}})
+
+        with engine.begin() as conn:
+            conn.execute(insert(GameSet), rows["game_sets"])
+            conn.execute(insert(game_set_players), rows["members"])
+            conn.execute(insert(Game), rows["games"])
+            conn.execute(insert(PlayerRole), rows["roles"])
+            conn.execute(insert(CenterCard), rows["center"])
+            conn.execute(insert(Action), rows["actions"])
+            conn.execute(insert(Vote), rows["votes"])
+            conn.execute(insert(GameResult), rows["results"])
+
+
+@pytest.fixture(scope="session")
+def history_engine(tmp_path_factory):
+    """File-backed SQLite database (with the app's pragmas) seeded with HISTORY_GAMES past games."""
+    path = tmp_path_factory.mktemp("bench") / "history.db"
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    _seed_history(engine, HISTORY_GAMES)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def record_history_size(request):
+    """Store the history size with each benchmark so saved runs are only compared like for like."""
+    if "benchmark" in request.fixturenames:
+        request.getfixturevalue("benchmark").extra_info["history_games"] = HISTORY_GAMES
+
+
+@pytest.fixture
+def db(history_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=history_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture(params=[3, 6, 10], ids=lambda n: f"{n}_players")
+def num_players(request):
+    return request.param
+
+
+@pytest.fixture
+def new_game_set(db: Session):
+    """Factory: create a game set of N players, all joined, with roles_for(N). Returns its ID."""
+    def create(num_players: int) -> str:
+        game_set = GameSet(num_players=num_players, selected_roles=roles_for(num_players), discussion_timer_seconds=300)
+        db.add(game_set)
+        db.flush()
+        for i in range(num_players):
+            player = Player(player_name=f"Player{i + 1}")
+            db.add(player)
+            db.flush()
+            game_set.players.append(player)
+        db.commit()
+        return game_set.game_set_id
+
+    return create
+
+
+@pytest.fixture
+def new_game(db: Session, new_game_set, monkeypatch):
+    """
+    Factory: start a game in a new game set of N players.
+
+    Roles are dealt in order (no shuffle), so the same roles wake for the same N
+    every round. Returns (game_id, {player_id: initial_role}).
+    """
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+
+    def start(num_players: int) -> tuple[str, dict[str, str]]:
+        game = game_service.start_game_bulk(db, new_game_set(num_players))
+        player_roles = db.query(PlayerRole.player_id, PlayerRole.initial_role).filter(
+            PlayerRole.game_id == game["game_id"]
+        ).all()
+        return game["game_id"], dict(player_roles)
+
+    return start
@@ -0,0 +1,147 @@
+"""
+Benchmarks for the service-layer hot paths, at 3, 6 and 10 players on top of a large game history.
+
+Not part of the test run (pytest.ini only collects tests/). Run them with
+./scripts/run_benchmarks.sh, which writes the results as JSON; compare saved runs
+with pytest-benchmark's --benchmark-autosave / --benchmark-compare.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.orm import Session
+from models.game import Game, GameState
+from models import roles
+from services import (
+    action_service,
+    discussion_service,
+    drunk_service,
+    game_service,
+    night_service,
+    results_service,
+    robber_service,
+    seer_service,
+    troublemaker_service,
+    voting_service,
+    werewolf_service,
+    minion_service,  # noqa: F401  (registers night handlers)
+    mason_service,  # noqa: F401
+    insomniac_service,  # noqa: F401
+)
+
+
+def _play_night(db: Session, game_id: str, player_roles: dict[str, str]) -> None:
+    """Take every night action through the services, as the players would, until the day starts."""
+    players_by_role: dict[str, list[str]] = {}
+    for player_id, role in player_roles.items():
+        players_by_role.setdefault(role, []).append(player_id)
+
+    while True:
+        db.expire_all()
+        step = night_service.get_night_status(db, game_id)["current_role"]
+        if step is None:
+            return
+        acting = players_by_role.get(step, [])
+        if not acting:
+            # Only in the center: skip the simulated turn instead of waiting it out
+            night_service.mark_role_complete(db, game_id, step)
+            continue
+        player_id = acting[0]
+        others = [pid for pid in player_roles if pid != player_id]
+        if step == "Werewolf" and len(acting) == 1:
+            werewolf_service.view_center_card(db, game_id, player_id, 0)
+        elif step == "Seer":
+            seer_service.perform_seer_action(db, game_id, player_id, "view_player", others[0])
+        elif step == "Robber":
+            robber_service.perform_robber_action(db, game_id, player_id, others[0])
+        elif step == "Troublemaker":
+            troublemaker_service.perform_troublemaker_action(db, game_id, player_id, others[0], others[1])
+        elif step == "Drunk":
+            drunk_service.perform_drunk_action(db, game_id, player_id, 0)
+        else:
+            for pid in acting:
+                roles.get(step).acknowledge(db, game_id, pid)
+
+
+def _play_day(db: Session, game_id: str, player_roles: dict[str, str]) -> None:
+    """Everyone votes to end the discussion, then votes for the next player, which ends the game."""
+    player_ids = list(player_roles)
+    for player_id in player_ids:
+        db.expire_all()
+        if db.get(Game, game_id).state != GameState.DAY_DISCUSSION:
+            break
+        discussion_service.record_vote_now(db, game_id, player_id)
+    for seat, player_id in enumerate(player_ids):
+        voting_service.cast_vote(db, game_id, player_id, player_ids[(seat + 1) % len(player_ids)])
+    db.expire_all()
+
+
+def _werewolf(player_roles: dict[str, str]) -> str:
+    return next(pid for pid, role in player_roles.items() if role == "Werewolf")
+
+
+def test_get_available_actions(benchmark, db, new_game, num_players):
+    """The acting Werewolf's available actions at the start of the night."""
+    game_id, player_roles = new_game(num_players)
+    werewolf_id = _werewolf(player_roles)
+
+    result = benchmark(action_service.get_available_actions, db, game_id, werewolf_id)
+    assert "instructions" in result
+
+
+def test_get_player_actions(benchmark, db, new_game, num_players):
+    """A Werewolf's accrued actions once the whole night has been played."""
+    game_id, player_roles = new_game(num_players)
+    _play_night(db, game_id, player_roles)
+
+    result = benchmark(action_service.get_player_actions, db, game_id, _werewolf(player_roles))
+    assert result["actions"]
+
+
+def test_get_night_status(benchmark, db, new_game, num_players):
+    game_id, _ = new_game(num_players)
+
+    result = benchmark(night_service.get_night_status, db, game_id)
+    assert result["current_role"] == "Werewolf"
+
+
+def test_get_results_cached(benchmark, db, new_game, num_players):
+    """Repeat results reads, served from the in-process cache."""
+    game_id, player_roles = new_game(num_players)
+    _play_night(db, game_id, player_roles)
+    _play_day(db, game_id, player_roles)
+
+    result = benchmark(results_service.get_results, db, game_id)
+    assert len(result["players"]) == num_players
+
+
+def test_get_results_uncached(benchmark, db, new_game, num_players):
+    """First results read in a process: loads the recorded results row."""
+    game_id, player_roles = new_game(num_players)
+    _play_night(db, game_id, player_roles)
+    _play_day(db, game_id, player_roles)
+
+    def clear_cache():
+        results_service._results_cache.clear()
+        db.expire_all()
+
+    result = benchmark.pedantic(results_service.get_results, args=(db, game_id), setup=clear_cache, rounds=200)
+    assert len(result["players"]) == num_players
+
+
+def test_start_game(benchmark, db, new_game_set, num_players):
+    """Starting a game, in a new game set with N players joined each round."""
+    def setup():
+        return (db, new_game_set(num_players)), {}
+
+    game = benchmark.pedantic(game_service.start_game, setup=setup, rounds=50)
+    assert game.state == GameState.NIGHT
+
+
+def test_full_night(benchmark, db, new_game, num_players):
+    """Every night action from the first wake-up to the day, like test_full_night_integration."""
+    def start():
+        return (db, *new_game(num_players)), {}
+
+    benchmark.pedantic(_play_night, setup=start, rounds=20)
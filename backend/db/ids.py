@@ -0,0 +1,36 @@
+"""Time-ordered primary keys (UUIDv7, RFC 9562) in the usual UUID string format."""
+import secrets
+import threading
+import time
+import uuid
+
+# Sub-millisecond counter bits (the v7 rand_a field) keep IDs from one process strictly increasing
+_COUNTER_MAX = 0xFFF
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def new_id() -> str:
+    """
+    A new primary key: a UUIDv7 string (48-bit Unix ms timestamp, then counter and random bits).
+
+    Keys sort in creation order, so inserts append to the end of primary key and
+    foreign key indexes instead of landing on random pages, and ordering by the
+    key follows creation order (e.g. actions recorded in the same second).
+    Existing random (v4) keys stay valid; both are 36-character UUID strings.
+    """
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms, _counter = ms, 0
+        elif _counter < _COUNTER_MAX:
+            _counter += 1
+        else:
+            # Counter exhausted within this millisecond: borrow the next one
+            _last_ms, _counter = _last_ms + 1, 0
+        ms, counter = _last_ms, _counter
+    value = (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | secrets.randbits(62)
+    return str(uuid.UUID(int=value))
@@ -1,22 +1,37 @@
 import os
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from db.database import init_db
+from starlette.datastructures import MutableHeaders
+from db.database import QueryStats, SessionLocal, init_db, query_stats
+from services import event_bus, game_locks, night_service, phase_scheduler, timer_service, request_metrics
 from api.game_sets import router as game_sets_router
 from api.players import router as players_router
 from api.games import router as games_router
+from api.websockets import router as websockets_router
 # Import models to ensure they're registered with SQLAlchemy
 from models import action  # noqa: F401
 from models import vote  # noqa: F401
 from models import vote_now  # noqa: F401
+from models import game_result  # noqa: F401
+from models import game_set_standing  # noqa: F401
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup."""
+    """Initialize database, wake stranded nights, join the event bus and start the phase scheduler on startup."""
     init_db()
+    with SessionLocal() as db:
+        night_service.start_stranded_nights(db)
+    await event_bus.start()
+    await phase_scheduler.scheduler.start(
+        timer_service.run_due_transition,
+        timer_service.load_pending_deadlines,
+    )
     yield
+    await phase_scheduler.scheduler.stop()
+    await event_bus.stop()
 
 
 app = FastAPI(
@@ -29,6 +44,7 @@ app = FastAPI(
 app.include_router(game_sets_router)
 app.include_router(players_router)
 app.include_router(games_router)
+app.include_router(websockets_router)
 
 # Get allowed origins from environment or default to localhost
 allowed_origins = os.getenv(
@@ -46,6 +62,48 @@ app.add_middleware(
 )
 
 
+class RequestMetricsMiddleware:
+    """
+    Time each HTTP request and count the SQL it runs.
+
+    The totals go out as a Server-Timing header and into the per-route
+    aggregates served at /metrics. Both are taken when the response starts,
+    so a streamed response (event stream) counts its time to first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                seconds = time.perf_counter() - started
+                MutableHeaders(scope=message).append("Server-Timing", request_metrics.server_timing(seconds, stats))
+                # The router stores the matched route in the scope; its path is the template
+                route = scope.get("route")
+                request_metrics.metrics.observe(
+                    scope["method"], getattr(route, "path", None), message["status"], seconds, stats
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            query_stats.reset(token)
+
+
+# Outermost, so the timing covers CORS handling too
+app.add_middleware(RequestMetricsMiddleware)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint to verify API is running."""
@@ -57,3 +115,10 @@ async def ping():
     """Legacy ping endpoint for compatibility."""
     return {"message": "pong"}
 
+
+@app.get("/metrics")
+async def metrics():
+    """Per-route request counts, durations, SQL statements, SQL time and commits, and game lock waits (Prometheus text format)."""
+    return Response(
+        request_metrics.metrics.render() + game_locks.locks.render(), media_type=request_metrics.CONTENT_TYPE
+    )
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from db.database import Base
-import uuid
+from db.ids import new_id
 import enum
 
 
@@ -17,8 +17,9 @@ class ActionType(str, enum.Enum):
 class Action(Base):
     """Represents a night phase action performed by a player."""
     __tablename__ = "actions"
+    __table_args__ = (Index("ix_actions_game_player_timestamp", "game_id", "player_id", "timestamp"),)
 
-    action_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    action_id = Column(String, primary_key=True, default=new_id)
     game_id = Column(String, ForeignKey('games.game_id'), nullable=False)
     player_id = Column(String, ForeignKey('players.player_id'), nullable=False)
     action_type = Column(SQLEnum(ActionType), nullable=False)
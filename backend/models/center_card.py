@@ -1,14 +1,15 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from db.database import Base
-import uuid
+from db.ids import new_id
 
 
 class CenterCard(Base):
     """Represents one of the three center cards in a game."""
     __tablename__ = "center_cards"
+    __table_args__ = (Index("ix_center_cards_game_position", "game_id", "position"),)
 
-    center_card_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    center_card_id = Column(String, primary_key=True, default=new_id)
     game_id = Column(String, ForeignKey('games.game_id'), nullable=False)
     position = Column(String, nullable=False)  # "left", "center", "right"
     role = Column(String, nullable=False)  # The role card in this position
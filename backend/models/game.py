@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Enum as SQLEnum, JSON
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Index, Enum as SQLEnum, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from db.database import Base
-import uuid
+from db.ids import new_id
 import enum
 
 
@@ -17,8 +17,9 @@ class GameState(str, enum.Enum):
 class Game(Base):
     """Represents a single game instance within a game set."""
     __tablename__ = "games"
+    __table_args__ = (Index("ix_games_game_set_number", "game_set_id", "game_number"),)
 
-    game_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    game_id = Column(String, primary_key=True, default=new_id)
     game_set_id = Column(String, ForeignKey('game_sets.game_set_id'), nullable=False)
     game_number = Column(Integer, nullable=False)  # Sequence number within game set (1, 2, 3...)
     state = Column(SQLEnum(GameState), nullable=False, default=GameState.NIGHT)
@@ -27,6 +28,7 @@ class Game(Base):
     simulated_role_started_at = Column(DateTime(timezone=True), nullable=True)  # When a simulated (center card) role started acting
     discussion_started_at = Column(DateTime(timezone=True), nullable=True)  # When day discussion phase started (for timer)
     simulated_role_duration_seconds = Column(Integer, nullable=True)  # Random duration for simulated role (15-40 seconds)
+    version = Column(Integer, nullable=False, default=0)  # Bumped by every state change; served as the ETag of game reads
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     ended_at = Column(DateTime(timezone=True), nullable=True)
@@ -48,6 +50,7 @@ class Game(Base):
             "simulated_role_started_at": self.simulated_role_started_at.isoformat() if self.simulated_role_started_at else None,
             "simulated_role_duration_seconds": self.simulated_role_duration_seconds,
             "discussion_started_at": self.discussion_started_at.isoformat() if self.discussion_started_at else None,
+            "version": self.version,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "ended_at": self.ended_at.isoformat() if self.ended_at else None,
@@ -0,0 +1,13 @@
+"""GameResult model: a game's outcome, computed once when voting ends."""
+from sqlalchemy import Column, String, ForeignKey, DateTime, JSON
+from sqlalchemy.sql import func
+from db.database import Base
+
+
+class GameResult(Base):
+    """Deaths, winning team and per-player outcome of a finished game (immutable)."""
+    __tablename__ = "game_results"
+
+    game_id = Column(String, ForeignKey("games.game_id"), primary_key=True)
+    results = Column(JSON, nullable=False)  # Same shape as the GET results response
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
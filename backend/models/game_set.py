@@ -2,14 +2,14 @@ from sqlalchemy import Column, String, Integer, JSON, DateTime, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from db.database import Base
-import uuid
+from db.ids import new_id
 
 
 class GameSet(Base):
     """Represents a set of games played together with cumulative scoring."""
     __tablename__ = "game_sets"
 
-    game_set_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    game_set_id = Column(String, primary_key=True, default=new_id)
     created_by = Column(String, nullable=True)  # User/session ID of creator
     num_players = Column(Integer, nullable=False)
     selected_roles = Column(JSON, nullable=False)  # Array of role names
@@ -0,0 +1,17 @@
+"""GameSetStanding model: a player's running totals over the finished games of a game set."""
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from db.database import Base
+
+
+class GameSetStanding(Base):
+    """One player's cumulative score in a game set, updated as each game reaches RESULTS."""
+    __tablename__ = "game_set_standings"
+
+    game_set_id = Column(String, ForeignKey("game_sets.game_set_id"), primary_key=True)
+    player_id = Column(String, ForeignKey("players.player_id"), primary_key=True)
+    games_played = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    deaths = Column(Integer, nullable=False, default=0)
+    votes_received = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
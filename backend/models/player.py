@@ -2,7 +2,7 @@ from sqlalchemy import Column, String, DateTime, ForeignKey, Table
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from db.database import Base
-import uuid
+from db.ids import new_id
 
 
 # Association table for many-to-many relationship between players and game sets
@@ -19,7 +19,7 @@ class Player(Base):
     """Represents a player identity (persistent across game sets)."""
     __tablename__ = "players"
 
-    player_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    player_id = Column(String, primary_key=True, default=new_id)
     user_id = Column(String, nullable=True)  # User/session ID
     player_name = Column(String, nullable=False)
     avatar_url = Column(String, nullable=True)
@@ -1,20 +1,25 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey
+from sqlalchemy import Column, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from db.database import Base
-import uuid
+from db.ids import new_id
 
 
 class PlayerRole(Base):
     """Represents a player's role in a specific game."""
     __tablename__ = "player_roles"
+    __table_args__ = (
+        Index("ix_player_roles_game_player", "game_id", "player_id"),
+        Index("ix_player_roles_game_initial_role", "game_id", "initial_role"),
+    )
 
-    player_role_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    player_role_id = Column(String, primary_key=True, default=new_id)
     game_id = Column(String, ForeignKey('games.game_id'), nullable=False)
     player_id = Column(String, ForeignKey('players.player_id'), nullable=False)
     initial_role = Column(String, nullable=False)  # Role at start of night
     current_role = Column(String, nullable=False)  # Role after night actions (can change)
     team = Column(String, nullable=True)  # village, werewolf, tanner
     was_killed = Column(Boolean, default=False)  # Died during voting
+    won = Column(Boolean, nullable=True)  # Set with the game's results; None until then
     night_action_completed = Column(Boolean, default=False)  # Action/acknowledgment done for night role
     role_revealed = Column(Boolean, default=False)  # Player has acknowledged seeing their initial role
 
@@ -32,6 +37,7 @@ class PlayerRole(Base):
             "current_role": self.current_role,
             "team": self.team,
             "was_killed": self.was_killed,
+            "won": self.won,
             "night_action_completed": self.night_action_completed,
             "role_revealed": getattr(self, "role_revealed", False),
         }
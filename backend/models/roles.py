@@ -0,0 +1,92 @@
+"""Role registry: one descriptor per role card (team, place in the wake order, night handlers)."""
+import enum
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+
+class Role(str, enum.Enum):
+    """Enum for role cards."""
+    DOPPELGANGER = "Doppelganger"
+    WEREWOLF = "Werewolf"
+    MINION = "Minion"
+    MASON = "Mason"
+    SEER = "Seer"
+    ROBBER = "Robber"
+    TROUBLEMAKER = "Troublemaker"
+    DRUNK = "Drunk"
+    INSOMNIAC = "Insomniac"
+    VILLAGER = "Villager"
+    TANNER = "Tanner"
+    HUNTER = "Hunter"
+
+
+@dataclass(slots=True)
+class RoleDescriptor:
+    """Everything the game needs to know about a role."""
+    role: Role
+    team: str  # "werewolf", "village" or "tanner"
+    wake_index: int | None = None  # Position in the official wake order; None if the role never wakes
+    playable: bool = True  # Whether game sets may select this role
+    # Night handlers, registered by the role's service: (db, game_id, player_id) -> dict
+    night_info: Callable | None = None
+    acknowledge: Callable | None = None
+
+
+# Official wake order from One Night Ultimate Werewolf (instructions.md)
+ROLES: dict[Role, RoleDescriptor] = {d.role: d for d in (
+    RoleDescriptor(Role.DOPPELGANGER, "village", wake_index=0, playable=False),
+    RoleDescriptor(Role.WEREWOLF, "werewolf", wake_index=1),
+    RoleDescriptor(Role.MINION, "werewolf", wake_index=2),
+    RoleDescriptor(Role.MASON, "village", wake_index=3),
+    RoleDescriptor(Role.SEER, "village", wake_index=4),
+    RoleDescriptor(Role.ROBBER, "village", wake_index=5),
+    RoleDescriptor(Role.TROUBLEMAKER, "village", wake_index=6),
+    RoleDescriptor(Role.DRUNK, "village", wake_index=7),
+    RoleDescriptor(Role.INSOMNIAC, "village", wake_index=8),
+    RoleDescriptor(Role.VILLAGER, "village"),
+    RoleDescriptor(Role.TANNER, "tanner"),
+    RoleDescriptor(Role.HUNTER, "village"),
+)}
+
+WAKE_ORDER: tuple[str, ...] = tuple(
+    d.role.value for d in sorted((d for d in ROLES.values() if d.wake_index is not None), key=lambda d: d.wake_index)
+)
+VALID_ROLES: frozenset[str] = frozenset(d.role.value for d in ROLES.values() if d.playable)
+
+
+def get(role: str) -> RoleDescriptor | None:
+    """Look up a role's descriptor by name; None for unknown roles (or no role)."""
+    try:
+        return ROLES[Role(role)]
+    except ValueError:
+        return None
+
+
+def team_for(role: str) -> str:
+    """
+    Get the team for a given role.
+
+    Returns:
+        Team name: "werewolf", "village", or "tanner"
+    """
+    descriptor = get(role)
+    return descriptor.team if descriptor else "village"
+
+
+def wake_plan(roles_in_game: Iterable[str]) -> list[str]:
+    """Order the waking roles among roles_in_game (players' and center cards) by the wake order."""
+    waking = {d.role.value: d.wake_index for d in map(get, set(roles_in_game)) if d and d.wake_index is not None}
+    return sorted(waking, key=waking.__getitem__)
+
+
+def register_night_handlers(
+    role: Role,
+    night_info: Callable | None = None,
+    acknowledge: Callable | None = None,
+) -> None:
+    """Attach a role's night-info builder and acknowledge handler (called by the role's service)."""
+    descriptor = ROLES[role]
+    if night_info is not None:
+        descriptor.night_info = night_info
+    if acknowledge is not None:
+        descriptor.acknowledge = acknowledge
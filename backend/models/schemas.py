@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from typing import List, Optional
 from datetime import datetime
+from models import roles
 
 
 class PlayerCreate(BaseModel):
@@ -41,12 +42,8 @@ class GameSetCreate(BaseModel):
     @classmethod
     def validate_roles(cls, v):
         """Ensure all roles are valid."""
-        valid_roles = {
-            'Werewolf', 'Villager', 'Seer', 'Robber', 'Troublemaker',
-            'Drunk', 'Insomniac', 'Minion', 'Mason', 'Tanner', 'Hunter'
-        }
         for role in v:
-            if role not in valid_roles:
+            if role not in roles.VALID_ROLES:
                 raise ValueError(f'Invalid role: {role}')
         return v
 
@@ -1,15 +1,16 @@
 """Vote model for day voting phase."""
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index
 from sqlalchemy.sql import func
 from db.database import Base
-import uuid
+from db.ids import new_id
 
 
 class Vote(Base):
     """A player's vote for who to kill (target) in a game."""
     __tablename__ = "votes"
+    __table_args__ = (Index("ix_votes_game_voter", "game_id", "voter_player_id"),)
 
-    vote_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    vote_id = Column(String, primary_key=True, default=new_id)
     game_id = Column(String, ForeignKey("games.game_id"), nullable=False)
     voter_player_id = Column(String, ForeignKey("players.player_id"), nullable=False)
     target_player_id = Column(String, ForeignKey("players.player_id"), nullable=False)
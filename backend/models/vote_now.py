@@ -1,7 +1,7 @@
 """VoteNow model: players requesting to skip discussion and go to voting."""
 from sqlalchemy import Column, String, ForeignKey, UniqueConstraint
 from db.database import Base
-import uuid
+from db.ids import new_id
 
 
 class VoteNow(Base):
@@ -9,6 +9,6 @@ class VoteNow(Base):
     __tablename__ = "vote_now"
     __table_args__ = (UniqueConstraint("game_id", "player_id", name="uq_vote_now_game_player"),)
 
-    vote_now_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    vote_now_id = Column(String, primary_key=True, default=new_id)
     game_id = Column(String, ForeignKey("games.game_id"), nullable=False)
     player_id = Column(String, ForeignKey("players.player_id"), nullable=False)
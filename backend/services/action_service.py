@@ -1,11 +1,9 @@
 """Service for action-related operations."""
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from models.game import Game, GameState
 from models.player_role import PlayerRole
 from models.action import Action, ActionType
-from models.center_card import CenterCard
-from models.player import Player
-from services import werewolf_service
+from services import game_service, werewolf_service
 
 
 def get_available_actions(db: Session, game_id: str, player_id: str) -> dict:
@@ -72,7 +70,7 @@ def get_available_actions(db: Session, game_id: str, player_id: str) -> dict:
     elif current_role == "Seer":
         # Seer can view one player OR two center cards
         # Get all other players
-        all_players = db.query(PlayerRole).filter(
+        all_players = db.query(PlayerRole).options(joinedload(PlayerRole.player)).filter(
             PlayerRole.game_id == game_id,
             PlayerRole.player_id != player_id
         ).all()
@@ -85,7 +83,7 @@ def get_available_actions(db: Session, game_id: str, player_id: str) -> dict:
     
     elif current_role == "Robber":
         # Robber can exchange with another player
-        all_players = db.query(PlayerRole).filter(
+        all_players = db.query(PlayerRole).options(joinedload(PlayerRole.player)).filter(
             PlayerRole.game_id == game_id,
             PlayerRole.player_id != player_id
         ).all()
@@ -97,7 +95,7 @@ def get_available_actions(db: Session, game_id: str, player_id: str) -> dict:
     
     elif current_role == "Troublemaker":
         # Troublemaker can exchange two other players
-        all_players = db.query(PlayerRole).filter(
+        all_players = db.query(PlayerRole).options(joinedload(PlayerRole.player)).filter(
             PlayerRole.game_id == game_id,
             PlayerRole.player_id != player_id
         ).all()
@@ -169,7 +167,10 @@ def get_player_actions(db: Session, game_id: str, player_id: str) -> dict:
     db_actions = db.query(Action).filter(
         Action.game_id == game_id,
         Action.player_id == player_id
-    ).order_by(Action.timestamp).all()
+    ).order_by(Action.timestamp, Action.action_id).all()  # Time-ordered IDs break same-second ties
+
+    # One roster query for every name in the descriptions below
+    player_names = game_service.get_player_names(db, game_id) if db_actions else {}
 
     # Collect werewolf-fellow VIEW_CARDs so we can emit one combined description
     werewolf_fellow_target_ids = []
@@ -201,24 +202,20 @@ def get_player_actions(db: Session, game_id: str, player_id: str) -> dict:
                 werewolf_fellow_target_ids.append(action.target_id)
             else:
                 # Viewed another player's card
-                target_player = db.query(Player).filter(Player.player_id == action.target_id).first()
-                target_name = target_player.player_name if target_player else action.target_id
+                target_name = player_names.get(action.target_id, action.target_id)
                 actions.append({
                     "action_type": "VIEW_CARD",
                     "description": f"You viewed {target_name}'s card. It is: {action.target_role}"
                 })
         elif action.action_type == ActionType.SWAP_PLAYER_TO_PLAYER:
-            target_player = db.query(Player).filter(Player.player_id == action.target_id).first()
-            target_name = target_player.player_name if target_player else action.target_id
+            target_name = player_names.get(action.target_id, action.target_id)
             actions.append({
                 "action_type": "SWAP_PLAYER_TO_PLAYER",
                 "description": f"You exchanged cards with {target_name}. You are now: {action.target_role}"
             })
         elif action.action_type == ActionType.SWAP_TWO_PLAYERS:
-            p1 = db.query(Player).filter(Player.player_id == action.source_id).first()
-            p2 = db.query(Player).filter(Player.player_id == action.target_id).first()
-            n1 = p1.player_name if p1 else action.source_id
-            n2 = p2.player_name if p2 else action.target_id
+            n1 = player_names.get(action.source_id, action.source_id)
+            n2 = player_names.get(action.target_id, action.target_id)
             actions.append({
                 "action_type": "SWAP_TWO_PLAYERS",
                 "description": f"You swapped the cards of {n1} and {n2}."
@@ -232,10 +229,7 @@ def get_player_actions(db: Session, game_id: str, player_id: str) -> dict:
 
     # Emit one description for multiple werewolves (werewolf-fellow VIEW_CARDs collected above)
     if werewolf_fellow_target_ids:
-        names = []
-        for tid in werewolf_fellow_target_ids:
-            p = db.query(Player).filter(Player.player_id == tid).first()
-            names.append(p.player_name if p else tid)
+        names = [player_names.get(tid, tid) for tid in werewolf_fellow_target_ids]
         if len(names) == 1:
             actions.append({
                 "action_type": "VIEW_CARD",
@@ -1,10 +1,13 @@
 """Service for day discussion phase (timer and transition to voting)."""
-from datetime import datetime
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+from db.database import lock_for_write
 from models.game import Game, GameState
 from models.game_set import GameSet
 from models.player_role import PlayerRole
 from models.vote_now import VoteNow
+from services import event_hub, version_service, version_watch
+from services.game_locks import serialized
 
 
 def _vote_now_majority(total_players: int) -> int:
@@ -12,17 +15,27 @@ def _vote_now_majority(total_players: int) -> int:
     return (total_players // 2) + 1
 
 
+def get_discussion_deadline(db: Session, game: Game) -> datetime | None:
+    """When the discussion timer runs out, or None if the discussion clock has not started."""
+    if not game.discussion_started_at:
+        return None
+    game_set = db.query(GameSet).filter(GameSet.game_set_id == game.game_set_id).first()
+    if not game_set:
+        return None
+    return game.discussion_started_at + timedelta(seconds=game_set.discussion_timer_seconds)
+
+
 def get_discussion_status(db: Session, game_id: str, player_id: str | None = None) -> dict:
     """
-    Get discussion timer status. If game is DAY_DISCUSSION and timer expired,
-    transition to DAY_VOTING. Optionally include vote-now counts when player_id given.
+    Get discussion timer status (read-only; the phase scheduler moves the game to
+    DAY_VOTING when the timer expires). Optionally include vote-now counts when player_id given.
     """
     game = db.query(Game).filter(Game.game_id == game_id).first()
     if not game:
         raise ValueError(f"Game {game_id} not found")
 
     if game.state == GameState.DAY_VOTING or game.state == GameState.RESULTS:
-        out = {"time_remaining_seconds": 0, "state": game.state.value}
+        out = {"time_remaining_seconds": 0, "state": game.state.value, "version": game.version}
         if player_id:
             out["vote_now_count"] = 0
             out["total_players"] = 0
@@ -51,31 +64,13 @@ def get_discussion_status(db: Session, game_id: str, player_id: str | None = Non
     timer_seconds = game_set.discussion_timer_seconds
 
     started_at = game.discussion_started_at
-    if not started_at:
-        game.discussion_started_at = datetime.utcnow()
-        db.commit()
-        db.refresh(game)
-        started_at = game.discussion_started_at
-
-    now = datetime.utcnow()
-    elapsed = (now - started_at).total_seconds() if started_at else 0
+    elapsed = (datetime.utcnow() - started_at).total_seconds() if started_at else 0
     remaining = max(0, int(timer_seconds - elapsed))
 
-    if remaining <= 0:
-        game.state = GameState.DAY_VOTING
-        db.commit()
-        db.refresh(game)
-        out = {"time_remaining_seconds": 0, "state": GameState.DAY_VOTING.value}
-        if player_id:
-            out["vote_now_count"] = vote_now_count
-            out["total_players"] = total_players
-            out["vote_now_majority"] = majority
-            out["current_player_voted_now"] = current_player_voted_now
-        return out
-
     out = {
         "time_remaining_seconds": remaining,
         "state": GameState.DAY_DISCUSSION.value,
+        "version": game.version,
     }
     if player_id:
         out["vote_now_count"] = vote_now_count
@@ -85,9 +80,15 @@ def get_discussion_status(db: Session, game_id: str, player_id: str | None = Non
     return out
 
 
+@serialized
 def record_vote_now(db: Session, game_id: str, player_id: str) -> dict:
-    """Record that this player wants to vote now. If majority reached, transition to DAY_VOTING."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
+    """
+    Record that this player wants to vote now. If majority reached, transition to DAY_VOTING.
+
+    The request and the transition commit together, with the game row locked.
+    """
+    lock_for_write(db)
+    game = db.query(Game).filter(Game.game_id == game_id).with_for_update().first()
     if not game:
         raise ValueError(f"Game {game_id} not found")
     if game.state != GameState.DAY_DISCUSSION:
@@ -104,30 +105,57 @@ def record_vote_now(db: Session, game_id: str, player_id: str) -> dict:
     ).first()
     if not existing:
         db.add(VoteNow(game_id=game_id, player_id=player_id))
-        db.commit()
+        db.flush()
 
     vote_now_count = db.query(VoteNow).filter(VoteNow.game_id == game_id).count()
     majority = _vote_now_majority(total_players)
-    if vote_now_count >= majority:
-        game.state = GameState.DAY_VOTING
+    state = GameState.DAY_VOTING if vote_now_count >= majority else game.state
+
+    if existing and state == GameState.DAY_DISCUSSION:
+        # A repeated request changes nothing: release the write lock and wake nobody
+        db.rollback()
+    else:
+        game.state = state
+        version_service.bump_version(db, game_id)
         db.commit()
-        db.refresh(game)
+        event_hub.publish(game_id, "vote_now", {
+            "vote_now_count": vote_now_count,
+            "vote_now_majority": majority,
+            "state": state.value,
+        })
+        version_watch.notify(game_id)
 
     return {
         "status": "ok",
         "vote_now_count": vote_now_count,
         "total_players": total_players,
         "vote_now_majority": majority,
-        "state": game.state.value,
+        "state": state.value,
     }
 
 
+@serialized
 def check_discussion_timer_and_maybe_transition(db: Session, game_id: str) -> None:
     """If game is DAY_DISCUSSION and timer expired, transition to DAY_VOTING. No-op otherwise."""
     game = db.query(Game).filter(Game.game_id == game_id).first()
     if not game or game.state != GameState.DAY_DISCUSSION:
         return
-    try:
-        get_discussion_status(db, game_id)
-    except ValueError:
-        pass
+
+    if not game.discussion_started_at:
+        # Older games started the clock lazily; start it now
+        game.discussion_started_at = datetime.utcnow()
+        version_service.bump_version(db, game_id)
+        db.commit()
+        version_watch.notify(game_id)
+        return
+
+    deadline = get_discussion_deadline(db, game)
+    if deadline is None or datetime.utcnow() < deadline:
+        return
+
+    game.state = GameState.DAY_VOTING
+    version_service.bump_version(db, game_id)
+    db.commit()
+    db.refresh(game)
+    event_hub.publish(game_id, "state_changed", {"state": game.state.value})
+    version_watch.notify(game_id)
@@ -1,14 +1,12 @@
 """Service for Drunk night actions: swap with a center card (no looking)."""
 from sqlalchemy.orm import Session
-from models.game import Game, GameState
-from models.player_role import PlayerRole
-from models.center_card import CenterCard
-from models.action import Action, ActionType
-from services import night_service
-
-CENTER_POSITIONS = ["left", "center", "right"]
+from models.game import GameState
+from models.action import ActionType
+from services import night_service, event_hub, game_engine, rules
+from services.game_locks import serialized
 
 
+@serialized
 def perform_drunk_action(
     db: Session,
     game_id: str,
@@ -27,80 +25,45 @@ def perform_drunk_action(
     Returns:
         {"message": "You exchanged your card with center card [position]. You don't know your new role."}
     """
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
-
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
-
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-
-    if game.current_role_step != "Drunk":
-        raise ValueError("Drunk role is not currently active")
-
-    drunk_role = _get_player_role(db, game_id, player_id)
-    if drunk_role.initial_role != "Drunk":
-        raise ValueError("Player is not the Drunk (only original Drunk acts)")
-
-    if drunk_role.night_action_completed:
-        raise ValueError("Drunk has already performed their action")
-
-    if card_index not in (0, 1, 2):
-        raise ValueError("card_index must be 0, 1, or 2")
-
-    position = CENTER_POSITIONS[card_index]
-    center_card = db.query(CenterCard).filter(
-        CenterCard.game_id == game_id,
-        CenterCard.position == position
-    ).first()
-    if not center_card:
-        raise ValueError(f"Center card at index {card_index} not found")
-
-    drunk_old = drunk_role.current_role
-    center_old = center_card.role
-
-    action = Action(
-        game_id=game_id,
-        player_id=player_id,
-        action_type=ActionType.SWAP_PLAYER_TO_CENTER,
-        source_id=player_id,
-        target_id=str(card_index),
-        source_role=drunk_old,
-        target_role=center_old
-    )
-    db.add(action)
-
-    drunk_role.night_action_completed = True
-    _complete_drunk_role_if_ready(db, game_id)  # Must run while player still has current_role Drunk
-
-    drunk_role.current_role = center_old
-    center_card.role = drunk_old
-    db.commit()
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
+
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
+
+        if live.current_role_step != "Drunk":
+            raise ValueError("Drunk role is not currently active")
+
+        drunk_seat = live.seat_of(player_id)
+        if live.initial_roles[drunk_seat] != "Drunk":
+            raise ValueError("Player is not the Drunk (only original Drunk acts)")
+
+        if live.completed[drunk_seat]:
+            raise ValueError("Drunk has already performed their action")
+
+        drunk_old = live.current_roles[drunk_seat]
+        rules.drink(live, drunk_seat, card_index)
+        center_old = live.current_roles[drunk_seat]
+
+        live.record_action(
+            drunk_seat,
+            ActionType.SWAP_PLAYER_TO_CENTER,
+            source_id=player_id,
+            target_id=str(card_index),
+            source_role=drunk_old,
+            target_role=center_old
+        )
+
+        live.complete(drunk_seat)
+        completed_step = night_service.commit_role_action(db, live, "Drunk")
+        event_hub.publish(game_id, "night_action", {"role": "Drunk"})
+        event_hub.publish(game_id, "night_result", {
+            "role": "Drunk",
+            "card_index": card_index,
+        }, to_player_id=player_id)
+
+        night_service.announce_role_complete(db, game_id, "Drunk", completed_step)
 
     card_label = ["Left", "Center", "Right"][card_index]
     return {"message": f"You exchanged your card with center card {card_label}. You don't know your new role."}
-
-
-def _get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
-    pr = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.player_id == player_id
-    ).first()
-    if not pr:
-        raise ValueError(f"Player {player_id} not found in game {game_id}")
-    return pr
-
-
-def _complete_drunk_role_if_ready(db: Session, game_id: str) -> None:
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game or game.current_role_step != "Drunk":
-        return
-    roles = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.initial_role == "Drunk"
-    ).all()
-    if roles and all(r.night_action_completed for r in roles):
-        night_service.mark_role_complete(db, game_id, "Drunk")
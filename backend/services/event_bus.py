@@ -0,0 +1,280 @@
+"""
+Cross-process fan-out of game notifications, so every worker's clients hear about every game.
+
+event_hub.publish and version_watch.notify deliver to this process's listeners directly
+and forward() the notification on the bus; notifications from other processes come back
+through the handlers registered with on(). Pick the bus with EVENT_BUS_URL:
+
+- memory:// (default): in-process only, for a single worker
+- redis://[:password@]host[:port]: Redis PUBLISH/SUBSCRIBE, or services.local_broker
+  where no Redis is available
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import defaultdict
+from typing import Callable
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUS_URL = os.getenv("EVENT_BUS_URL", "memory://")
+EVENT_BUS_CHANNEL = os.getenv("EVENT_BUS_CHANNEL", "onw:events")
+
+# Seconds between reconnect attempts after the broker connection drops
+RECONNECT_SECONDS = 1.0
+
+# How long startup waits for the first subscription before carrying on (and retrying in the background)
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+# Messages waiting to be published while the broker is slow or away; the oldest are dropped beyond this
+OUTBOX_SIZE = 10000
+
+# Tags this process's messages, so it skips its own when they come back from the broker
+PROCESS_ID = uuid.uuid4().hex
+
+Handler = Callable[[dict], None]
+
+
+class EventBus:
+    """
+    Publish/subscribe transport between processes.
+
+    publish() may be called from any thread (services run in the threadpool);
+    start() and stop() run on the app's event loop. on_message is called with
+    every message published on the bus, including this process's own.
+    """
+
+    async def start(self, on_message: Handler) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+    def publish(self, message: dict) -> None:
+        raise NotImplementedError
+
+
+class InMemoryEventBus(EventBus):
+    """A bus inside one process: published messages go straight to the started handlers."""
+
+    def __init__(self):
+        self._handlers: list[Handler] = []
+        self._lock = threading.Lock()
+
+    async def start(self, on_message: Handler) -> None:
+        with self._lock:
+            self._handlers.append(on_message)
+
+    async def stop(self) -> None:
+        with self._lock:
+            self._handlers.clear()
+
+    def publish(self, message: dict) -> None:
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            handler(message)
+
+
+class RedisEventBus(EventBus):
+    """
+    PUBLISH/SUBSCRIBE on one channel over the Redis protocol (RESP), on plain asyncio streams.
+
+    One connection stays subscribed and one publishes from an outbox queue. Both
+    reconnect after a drop; messages published meanwhile are dropped once the outbox
+    is full (clients catch up from their next snapshot or poll).
+    """
+
+    def __init__(self, url: str, channel: str = EVENT_BUS_CHANNEL):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.channel = channel
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._outbox: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self, on_message: Handler) -> None:
+        """Subscribe (waiting for the first attempt, so messages published after start() are seen) and start publishing."""
+        self._loop = asyncio.get_running_loop()
+        self._outbox = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        subscribed = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._subscribe_forever(on_message, subscribed)),
+            asyncio.create_task(self._publish_forever()),
+        ]
+        try:
+            await asyncio.wait_for(subscribed.wait(), CONNECT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("Event bus broker %s:%s not reachable yet; retrying in the background", self.host, self.port)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def publish(self, message: dict) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue, json.dumps(message))
+        except RuntimeError:
+            pass  # Loop closed: shutting down
+
+    def _enqueue(self, payload: str) -> None:
+        if self._outbox.full():
+            self._outbox.get_nowait()
+        self._outbox.put_nowait(payload)
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await send_command(writer, "AUTH", self.password)
+            await read_reply(reader)
+        return reader, writer
+
+    async def _subscribe_forever(self, on_message: Handler, subscribed: asyncio.Event) -> None:
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._connect()
+                await send_command(writer, "SUBSCRIBE", self.channel)
+                await read_reply(reader)  # ["subscribe", channel, 1]
+                subscribed.set()
+                while True:
+                    reply = await read_reply(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        on_message(json.loads(reply[2]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Event bus subscription to %s:%s lost (%s); reconnecting", self.host, self.port, exc)
+                subscribed.set()  # Don't hold up startup; keep retrying in the background
+            finally:
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def _publish_forever(self) -> None:
+        batch: list[str] = []
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._connect()
+                while True:
+                    if not batch:
+                        # Everything queued goes out in one pipelined write
+                        batch.append(await self._outbox.get())
+                        while not self._outbox.empty():
+                            batch.append(self._outbox.get_nowait())
+                    writer.write(b"".join(encode_command("PUBLISH", self.channel, payload) for payload in batch))
+                    await writer.drain()
+                    for _ in batch:
+                        await read_reply(reader)
+                    batch = []
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Event bus publisher to %s:%s lost (%s); reconnecting", self.host, self.port, exc)
+            finally:
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+
+class RedisError(Exception):
+    """An error reply from the broker."""
+
+
+def encode_command(*args: str | bytes) -> bytes:
+    """A command as a RESP array of bulk strings."""
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg.encode() if isinstance(arg, str) else arg
+        out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(out)
+
+
+async def send_command(writer: asyncio.StreamWriter, *args: str | bytes) -> None:
+    writer.write(encode_command(*args))
+    await writer.drain()
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """Read one RESP value: bytes, int, list, None or (for +OK) str. Raises RedisError on -ERR."""
+    line = await reader.readuntil(b"\r\n")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        raise RedisError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(rest)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RedisError(f"Unexpected reply {line!r}")
+
+
+def create_bus(url: str) -> EventBus:
+    """
+    The bus for an EVENT_BUS_URL.
+
+    Raises:
+        ValueError: If the URL's scheme is not memory or redis
+    """
+    scheme = urlsplit(url).scheme
+    if scheme == "memory":
+        return InMemoryEventBus()
+    if scheme == "redis":
+        return RedisEventBus(url)
+    raise ValueError(f"Unsupported EVENT_BUS_URL {url!r}; use memory:// or redis://host:port")
+
+
+bus = create_bus(EVENT_BUS_URL)
+_handlers: dict[str, list[Handler]] = defaultdict(list)
+
+
+def on(kind: str, handler: Handler) -> None:
+    """Call handler(message) for each message of this kind published by another process."""
+    _handlers[kind].append(handler)
+
+
+def forward(kind: str, **payload) -> None:
+    """Publish a notification for the other processes (this one has already handled it)."""
+    bus.publish({"kind": kind, "origin": PROCESS_ID, **payload})
+
+
+def dispatch(message: dict) -> None:
+    """Hand a message from the bus to its handlers, unless this process sent it."""
+    if message.get("origin") == PROCESS_ID:
+        return
+    for handler in _handlers.get(message.get("kind"), ()):
+        try:
+            handler(message)
+        except Exception:
+            logger.exception("Event bus handler failed for %s", message.get("kind"))
+
+
+async def start() -> None:
+    """Connect this process to the bus (app startup)."""
+    await bus.start(dispatch)
+
+
+async def stop() -> None:
+    await bus.stop()
@@ -0,0 +1,124 @@
+"""Publish/subscribe hub for game state change events, shared across processes through the event bus."""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from services import event_bus
+
+# Events buffered per subscriber before the oldest are dropped (slow client)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """
+    A single listener on one game's events, bound to the event loop it was created on.
+
+    Subscriptions with a player_id also receive events addressed to that player;
+    anonymous ones (SSE) only receive broadcast events.
+    """
+
+    def __init__(self, game_id: str, loop: asyncio.AbstractEventLoop, player_id: str | None = None):
+        self.game_id = game_id
+        self.loop = loop
+        self.player_id = player_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, event: dict) -> None:
+        """Enqueue an event; must run on self.loop."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Wait for the next event. Returns None if timeout elapses first."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """
+    Fan out game events to subscribers keyed by game_id.
+
+    publish() is safe to call from any thread (sync services run in the
+    threadpool); events are handed to each subscriber's own event loop.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, game_id: str, player_id: str | None = None) -> Subscription:
+        """Register a listener for game_id. Must be called from a running event loop."""
+        subscription = Subscription(game_id, asyncio.get_running_loop(), player_id)
+        with self._lock:
+            self._subscribers[game_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.game_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.game_id]
+
+    def subscriber_count(self, game_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(game_id, ()))
+
+    def publish(
+        self,
+        game_id: str,
+        event_type: str,
+        data: dict | None = None,
+        to_player_id: str | None = None,
+    ) -> None:
+        """
+        Send an event to subscribers of game_id. No-op if nobody is listening.
+
+        With to_player_id, only that player's subscriptions receive it (private
+        night results); otherwise every subscriber does.
+        """
+        with self._lock:
+            subscribers = [
+                s for s in self._subscribers.get(game_id, ())
+                if to_player_id is None or s.player_id == to_player_id
+            ]
+        if not subscribers:
+            return
+        event = {"type": event_type, "game_id": game_id, **(data or {})}
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Subscriber's loop already closed; it will be unsubscribed on disconnect
+                pass
+
+
+hub = EventHub()
+
+
+def publish(
+    game_id: str,
+    event_type: str,
+    data: dict | None = None,
+    to_player_id: str | None = None,
+) -> None:
+    """Publish a game event to this process's subscribers and, through the event bus, every other process's."""
+    hub.publish(game_id, event_type, data, to_player_id)
+    event_bus.forward("event", game_id=game_id, event_type=event_type, data=data, to_player_id=to_player_id)
+
+
+def _publish_remote(message: dict) -> None:
+    hub.publish(message["game_id"], message["event_type"], message["data"], message["to_player_id"])
+
+
+event_bus.on("event", _publish_remote)
+
+
+def format_sse(event: dict) -> str:
+    """Format an event as a Server-Sent Events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
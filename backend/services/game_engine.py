@@ -0,0 +1,265 @@
+"""In-memory night state for live games, with batched persistence of card changes and actions."""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from db.database import lock_for_write
+from models.game import Game, GameState
+from models.player_role import PlayerRole
+from models.center_card import CenterCard
+from models.action import Action, ActionType
+from services import event_bus, rules, version_service, version_watch
+
+CENTER_POSITIONS = ["left", "center", "right"]
+
+# Live games kept in memory; least recently used are dropped beyond this (the DB is always current)
+MAX_LIVE_GAMES = 10000
+
+
+class LiveGame(rules.Table):
+    """
+    Compact night state of one game: seat-indexed role arrays, the three center
+    slots (the cards themselves are the rules.Table base) and the wake pointer.
+
+    Mutations apply in memory and mark the touched rows dirty; GameEngine.flush
+    writes them (and recorded actions) to the DB in one batch.
+    """
+
+    __slots__ = (
+        "game_id", "state", "active_roles", "wake_index",
+        "player_ids", "seat_by_player_id", "player_role_ids",
+        "initial_roles", "completed",
+        "center_card_ids",
+        "dirty_seats", "dirty_center", "pending_actions", "lock",
+    )
+
+    def __init__(self, game: Game, player_roles: list[PlayerRole], center_cards: list[CenterCard]):
+        self.game_id = game.game_id
+        self.state = game.state
+        self.active_roles = list(game.active_roles or [])
+        self.wake_index = None
+        self.set_step(game.state, game.current_role_step)
+
+        self.player_ids = [pr.player_id for pr in player_roles]
+        self.seat_by_player_id = {pid: seat for seat, pid in enumerate(self.player_ids)}
+        self.player_role_ids = [pr.player_role_id for pr in player_roles]
+        self.initial_roles = [pr.initial_role for pr in player_roles]
+        self.current_roles = [pr.current_role for pr in player_roles]
+        self.completed = [bool(pr.night_action_completed) for pr in player_roles]
+
+        by_position = {cc.position: cc for cc in center_cards}
+        self.center_card_ids = [by_position[p].center_card_id if p in by_position else None for p in CENTER_POSITIONS]
+        self.center = [by_position[p].role if p in by_position else None for p in CENTER_POSITIONS]
+
+        self.dirty_seats = set()
+        self.dirty_center = set()
+        self.pending_actions = []
+        self.lock = threading.RLock()
+
+    @property
+    def current_role_step(self) -> str | None:
+        if self.wake_index is None:
+            return None
+        return self.active_roles[self.wake_index]
+
+    @property
+    def has_pending_writes(self) -> bool:
+        return bool(self.dirty_seats or self.dirty_center or self.pending_actions)
+
+    def set_step(self, state: GameState, step: str | None) -> None:
+        self.state = state
+        if step is not None and step not in self.active_roles:
+            # Steps set outside active_roles (older games) are still honoured
+            self.active_roles.append(step)
+        self.wake_index = self.active_roles.index(step) if step is not None else None
+
+    def seat_of(self, player_id: str) -> int:
+        seat = self.seat_by_player_id.get(player_id)
+        if seat is None:
+            raise ValueError(f"Player {player_id} not found in game {self.game_id}")
+        return seat
+
+    def seats_with_initial_role(self, role: str) -> list[int]:
+        return [seat for seat, r in enumerate(self.initial_roles) if r == role]
+
+    def seats_with_current_role(self, role: str) -> list[int]:
+        return [seat for seat, r in enumerate(self.current_roles) if r == role]
+
+    def role_complete(self, role: str) -> bool:
+        """True when every player whose initial role is `role` has completed their night action."""
+        seats = self.seats_with_initial_role(role)
+        return bool(seats) and all(self.completed[seat] for seat in seats)
+
+    def swap_seats(self, seat_a: int, seat_b: int) -> None:
+        super().swap_seats(seat_a, seat_b)
+        self.dirty_seats.update((seat_a, seat_b))
+
+    def swap_with_center(self, seat: int, card_index: int) -> None:
+        super().swap_with_center(seat, card_index)
+        self.dirty_seats.add(seat)
+        self.dirty_center.add(card_index)
+
+    def complete(self, seat: int) -> None:
+        self.completed[seat] = True
+        self.dirty_seats.add(seat)
+
+    def record_action(
+        self,
+        seat: int,
+        action_type: ActionType,
+        source_id: str,
+        target_id: str,
+        source_role: str,
+        target_role: str | None,
+    ) -> None:
+        self.pending_actions.append({
+            "game_id": self.game_id,
+            "player_id": self.player_ids[seat],
+            "action_type": action_type,
+            "source_id": source_id,
+            "target_id": target_id,
+            "source_role": source_role,
+            "target_role": target_role,
+        })
+
+    def pending_writes(self) -> tuple[list[dict], list[dict], list[dict]]:
+        """The pending row writes: (player_roles, center_cards, actions). They stay pending until clear_pending()."""
+        player_roles = [
+            {
+                "player_role_id": self.player_role_ids[seat],
+                "current_role": self.current_roles[seat],
+                "night_action_completed": self.completed[seat],
+            }
+            for seat in sorted(self.dirty_seats)
+        ]
+        center_cards = [
+            {"center_card_id": self.center_card_ids[index], "role": self.center[index]}
+            for index in sorted(self.dirty_center)
+        ]
+        return player_roles, center_cards, list(self.pending_actions)
+
+    def clear_pending(self) -> None:
+        """Forget the pending writes, once they are committed."""
+        self.dirty_seats = set()
+        self.dirty_center = set()
+        self.pending_actions = []
+
+
+class GameEngine:
+    """
+    Process-wide cache of LiveGame objects for games in their night phase.
+
+    Role services validate and mutate against the cached state instead of
+    re-querying Game/PlayerRole/CenterCard, then flush the touched rows in one
+    batch. Every card change goes through the engine, so a cached game is
+    always in step with the DB and can be dropped at any time; a change made
+    by another worker process drops it (via the event bus).
+    """
+
+    def __init__(self, max_games: int = MAX_LIVE_GAMES):
+        self.max_games = max_games
+        self._games: OrderedDict[str, LiveGame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def peek(self, game_id: str) -> LiveGame | None:
+        """The cached game, or None if it is not loaded (never queries)."""
+        with self._lock:
+            return self._games.get(game_id)
+
+    def get(self, db: Session, game_id: str) -> LiveGame:
+        """
+        The cached game, loading it from the DB on first use.
+
+        Raises:
+            ValueError: If game not found
+        """
+        with self._lock:
+            live = self._games.get(game_id)
+            if live is not None:
+                self._games.move_to_end(game_id)
+                return live
+            live = self._load(db, game_id)
+            self._games[game_id] = live
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+            return live
+
+    @contextmanager
+    def acquire(self, db: Session, game_id: str):
+        """
+        Hold the game's lock, and its row lock in the DB, while validating and mutating it.
+
+        The row lock (SELECT ... FOR UPDATE; BEGIN IMMEDIATE on SQLite) lasts
+        until the action's single commit, so concurrent actions on the game,
+        from any process, apply one after the other. If the block fails, the
+        transaction is rolled back and, if it had mutated the cached copy, the
+        copy is dropped so the next request reloads it from the DB.
+        """
+        # DB lock before the in-process lock, in that order everywhere
+        lock_for_write(db)
+        try:
+            db.query(Game).filter(Game.game_id == game_id).with_for_update().first()
+            live = self.get(db, game_id)
+        except BaseException:
+            db.rollback()
+            raise
+        with live.lock:
+            try:
+                yield live
+            except BaseException:
+                db.rollback()
+                if live.has_pending_writes:
+                    self.evict(game_id)
+                raise
+
+    def flush(self, db: Session, live: LiveGame) -> None:
+        """
+        Write the game's pending row changes in one batch and commit.
+
+        The changes stay pending until the commit succeeds, so if it fails,
+        acquire sees them and drops the cached copy along with the rollback.
+        """
+        player_roles, center_cards, actions = live.pending_writes()
+        if player_roles:
+            db.execute(update(PlayerRole), player_roles)
+        if center_cards:
+            db.execute(update(CenterCard), center_cards)
+        if actions:
+            db.execute(insert(Action), actions)
+        version_service.bump_version(db, live.game_id)
+        db.commit()
+        live.clear_pending()
+        version_watch.notify(live.game_id)
+
+    def set_step(self, game_id: str, state: GameState, step: str | None) -> None:
+        """Keep a cached game's wake pointer in step with the games row; drop it once night is over."""
+        with self._lock:
+            live = self._games.get(game_id)
+            if live is None:
+                return
+            if state != GameState.NIGHT:
+                del self._games[game_id]
+                return
+        live.set_step(state, step)
+
+    def evict(self, game_id: str) -> None:
+        with self._lock:
+            self._games.pop(game_id, None)
+
+    @staticmethod
+    def _load(db: Session, game_id: str) -> LiveGame:
+        game = db.query(Game).filter(Game.game_id == game_id).first()
+        if not game:
+            raise ValueError(f"Game {game_id} not found")
+        player_roles = db.query(PlayerRole).filter(
+            PlayerRole.game_id == game_id
+        ).order_by(PlayerRole.player_role_id).all()
+        center_cards = db.query(CenterCard).filter(CenterCard.game_id == game_id).all()
+        return LiveGame(game, player_roles, center_cards)
+
+
+engine = GameEngine()
+
+# Another process changed a game: its cards may have moved, so reload on next use
+event_bus.on("version", lambda message: engine.evict(message["game_id"]))
@@ -0,0 +1,142 @@
+"""
+Per-game locks: mutating service calls on one game run one at a time in this process.
+
+Concurrent actions on a game (two werewolves acknowledging, the last two votes) queue
+on the game's lock instead of on the database's write lock, so each sees the other's
+commit and a phase transition happens once. Calls on different games never wait on
+each other here. With the shard router (shard_router.py) every request for a game
+reaches one process; between processes the row lock each service takes still arbitrates.
+
+Time spent waiting for a lock is recorded per service function and served at /metrics.
+"""
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# Upper bounds (seconds) of the lock wait histogram buckets
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+
+@dataclass(slots=True)
+class WaitMetrics:
+    """Running lock wait totals for one service function."""
+    bucket_counts: list[int] = field(default_factory=lambda: [0] * len(WAIT_BUCKETS))
+    count: int = 0
+    seconds: float = 0.0
+
+
+class _GameLock:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0  # Threads holding or waiting for the lock; it is dropped at zero
+
+
+class GameLocks:
+    """Locks keyed by game_id, created on first use and dropped once no thread holds or waits for them."""
+
+    def __init__(self):
+        self._locks: dict[str, _GameLock] = {}
+        self._waits: dict[str, WaitMetrics] = {}
+        self._lock = threading.Lock()
+        self._held = threading.local()
+
+    @contextmanager
+    def hold(self, game_id: str, name: str):
+        """
+        Hold the game's lock for the block, recording the wait under name.
+
+        Re-entrant: a service that calls another on the same game (the timer
+        completing a simulated role) holds the lock once.
+        """
+        held = getattr(self._held, "games", None)
+        if held is None:
+            held = self._held.games = set()
+        if game_id in held:
+            yield
+            return
+
+        with self._lock:
+            entry = self._locks.get(game_id)
+            if entry is None:
+                entry = self._locks[game_id] = _GameLock()
+            entry.users += 1
+        started = time.perf_counter()
+        entry.lock.acquire()
+        self._observe(name, time.perf_counter() - started)
+        held.add(game_id)
+        try:
+            yield
+        finally:
+            held.discard(game_id)
+            entry.lock.release()
+            with self._lock:
+                entry.users -= 1
+                if not entry.users:
+                    del self._locks[game_id]
+
+    def locked_games(self) -> int:
+        """Games whose lock is held or waited for right now."""
+        with self._lock:
+            return len(self._locks)
+
+    def _observe(self, name: str, seconds: float) -> None:
+        bucket = bisect_left(WAIT_BUCKETS, seconds)
+        with self._lock:
+            metrics = self._waits.get(name)
+            if metrics is None:
+                metrics = self._waits[name] = WaitMetrics()
+            if bucket < len(WAIT_BUCKETS):
+                metrics.bucket_counts[bucket] += 1
+            metrics.count += 1
+            metrics.seconds += seconds
+
+    def render(self) -> str:
+        """Lock wait histograms in the Prometheus text exposition format."""
+        with self._lock:
+            waits = sorted(
+                (name, WaitMetrics(list(m.bucket_counts), m.count, m.seconds))
+                for name, m in self._waits.items()
+            )
+            locked = len(self._locks)
+
+        lines = [
+            "# HELP onw_game_lock_wait_seconds Time mutating service calls waited for their game's lock.",
+            "# TYPE onw_game_lock_wait_seconds histogram",
+        ]
+        for name, m in waits:
+            cumulative = 0
+            for bound, count in zip(WAIT_BUCKETS, m.bucket_counts):
+                cumulative += count
+                lines.append(f'onw_game_lock_wait_seconds_bucket{{service="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'onw_game_lock_wait_seconds_bucket{{service="{name}",le="+Inf"}} {m.count}')
+            lines.append(f'onw_game_lock_wait_seconds_sum{{service="{name}"}} {m.seconds:.6f}')
+            lines.append(f'onw_game_lock_wait_seconds_count{{service="{name}"}} {m.count}')
+        lines += [
+            "# HELP onw_game_locks_active Games whose lock is held or waited for.",
+            "# TYPE onw_game_locks_active gauge",
+            f"onw_game_locks_active {locked}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+locks = GameLocks()
+
+
+def serialized(func):
+    """Run a service function holding the lock of the game named by its game_id argument."""
+    position = list(inspect.signature(func).parameters).index("game_id")
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        game_id = kwargs["game_id"] if "game_id" in kwargs else args[position]
+        with locks.hold(game_id, name):
+            return func(*args, **kwargs)
+
+    return wrapper
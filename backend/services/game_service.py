@@ -1,24 +1,16 @@
 """Service for game creation and role assignment."""
 import random
+from datetime import datetime
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
+from db.ids import new_id
 from models.game import Game, GameState
 from models.game_set import GameSet
+from models.player import Player
 from models.player_role import PlayerRole
 from models.center_card import CenterCard
-
-# Official wake order from One Night Ultimate Werewolf (instructions.md)
-# This should eventually come from the roles table ordered by wake_order
-WAKE_ORDER = [
-    "Doppelganger",
-    "Werewolf",
-    "Minion",
-    "Mason",
-    "Seer",
-    "Robber",
-    "Troublemaker",
-    "Drunk",
-    "Insomniac",
-]
+from models import roles
+from services import night_service, game_engine
 
 
 def start_game(db: Session, game_set_id: str) -> Game:
@@ -38,6 +30,31 @@ def start_game(db: Session, game_set_id: str) -> Game:
     Returns:
         The created Game instance or existing active game
 
+    Raises:
+        ValueError: If game set not found or doesn't have enough players
+    """
+    game = start_game_bulk(db, game_set_id)
+    return db.get(Game, game["game_id"])
+
+
+def start_game_bulk(db: Session, game_set_id: str) -> dict:
+    """
+    Start a new game in the game set with a fixed number of statements.
+
+    The game, its player roles and center cards are each written with one
+    multi-row INSERT (IDs generated client-side), and the first night role is
+    woken in the same transaction, so no row is read back after the commit.
+
+    If an active game already exists (not ended, not in RESULTS state),
+    returns that game instead of creating a duplicate.
+
+    Args:
+        db: Database session
+        game_set_id: ID of the game set
+
+    Returns:
+        The game as a dictionary (same shape as Game.to_dict())
+
     Raises:
         ValueError: If game set not found or doesn't have enough players
     """
@@ -48,15 +65,11 @@ def start_game(db: Session, game_set_id: str) -> Game:
 
     # Check if there's already an active game (not ended, not in RESULTS)
     # This prevents multiple games from being created simultaneously
-    existing_active_game = db.query(Game).filter(
-        Game.game_set_id == game_set_id,
-        Game.ended_at.is_(None),
-        Game.state != GameState.RESULTS
-    ).order_by(Game.created_at.desc()).first()
+    existing_active_game = get_active_game(db, game_set_id)
 
     if existing_active_game:
         # Return the existing active game instead of creating a duplicate
-        return existing_active_game
+        return existing_active_game.to_dict()
 
     # Get all players in this game set
     players = game_set.players
@@ -69,99 +82,65 @@ def start_game(db: Session, game_set_id: str) -> Game:
         )
 
     # Get the selected roles from game set
-    roles = game_set.selected_roles
-    if not roles or len(roles) != game_set.num_players + 3:
+    selected_roles = game_set.selected_roles
+    if not selected_roles or len(selected_roles) != game_set.num_players + 3:
         raise ValueError(
             f"Invalid role configuration. Expected {game_set.num_players + 3} roles, "
-            f"but got {len(roles) if roles else 0}"
+            f"but got {len(selected_roles) if selected_roles else 0}"
         )
 
     # Calculate game number (count existing games + 1)
-    existing_games_count = len(game_set.games) if game_set.games else 0
+    existing_games_count = db.query(func.count(Game.game_id)).filter(Game.game_set_id == game_set_id).scalar()
     game_number = existing_games_count + 1
 
-    # Create the game
-    game = Game(
-        game_set_id=game_set_id,
-        game_number=game_number,
-        state=GameState.NIGHT,
-        current_role_step=None  # Will be set when night phase starts
-    )
-    db.add(game)
-    db.flush()  # Get the game_id
-
     # Shuffle roles
-    shuffled_roles = roles.copy()
+    shuffled_roles = selected_roles.copy()
     random.shuffle(shuffled_roles)
 
-    # Assign roles to players (first N roles)
+    # First N roles go to players, the remaining 3 to the center
     player_roles = shuffled_roles[:game_set.num_players]
-    for i, player in enumerate(players):
-        role = player_roles[i]
-        team = _get_team_for_role(role)
-
-        player_role = PlayerRole(
-            game_id=game.game_id,
-            player_id=player.player_id,
-            initial_role=role,
-            current_role=role,  # Same as initial at start
-            team=team,
-            was_killed=False
-        )
-        db.add(player_role)
-
-    # Put remaining 3 roles in center
     center_roles = shuffled_roles[game_set.num_players:]
-    positions = ["left", "center", "right"]
-
-    for i, role in enumerate(center_roles):
-        center_card = CenterCard(
-            game_id=game.game_id,
-            position=positions[i],
-            role=role
-        )
-        db.add(center_card)
-
-    # Create ordered list of active roles (roles with wake_order) in this game
-    # Get all unique roles from player roles and center cards
-    all_roles_in_game = set(player_roles + center_roles)
-    
-    # Only include roles that have wake_order (active roles that wake up at night)
-    # Order them according to wake_order sequence
-    active_roles = []
-    
-    for role in WAKE_ORDER:
-        if role in all_roles_in_game:
-            active_roles.append(role)
-    
-    # Set the active roles on the game
-    game.active_roles = active_roles
 
+    # The game's wake plan: roles that wake at night (from players and center), in wake order
+    active_roles = roles.wake_plan(player_roles + center_roles)
+
+    game_id = new_id()
+    game_values = {
+        "game_id": game_id,
+        "game_set_id": game_set_id,
+        "game_number": game_number,
+        "state": GameState.NIGHT,
+        "active_roles": active_roles,
+        # Wake the first role now so night status reads never have to write
+        **night_service.first_step_values(active_roles, player_roles),
+        "version": 1,
+        "created_at": datetime.utcnow(),
+    }
+    db.execute(insert(Game).values(game_values))
+    db.execute(insert(PlayerRole).values([
+        {
+            "player_role_id": new_id(),
+            "game_id": game_id,
+            "player_id": player.player_id,
+            "initial_role": role,
+            "current_role": role,  # Same as initial at start
+            "team": roles.team_for(role),
+            "was_killed": False,
+            "night_action_completed": False,
+            "role_revealed": False,
+        }
+        for player, role in zip(players, player_roles)
+    ]))
+    db.execute(insert(CenterCard).values([
+        {"center_card_id": new_id(), "game_id": game_id, "position": position, "role": role}
+        for position, role in zip(game_engine.CENTER_POSITIONS, center_roles)
+    ]))
     db.commit()
-    db.refresh(game)
-
-    return game
-
 
-def _get_team_for_role(role: str) -> str:
-    """
-    Get the team for a given role.
-
-    Args:
-        role: The role name
-
-    Returns:
-        Team name: "werewolf", "village", or "tanner"
-    """
-    werewolf_team = ["Werewolf", "Minion"]
-    tanner_team = ["Tanner"]
+    night_service.announce_night_start(game_id, game_values)
 
-    if role in werewolf_team:
-        return "werewolf"
-    elif role in tanner_team:
-        return "tanner"
-    else:
-        return "village"
+    # Transient instance, only to format the response like a loaded game
+    return Game(**game_values).to_dict()
 
 
 def get_active_game(db: Session, game_set_id: str) -> Game | None:
@@ -208,3 +187,20 @@ def get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
         raise ValueError(f"Player {player_id} not found in game {game_id}")
 
     return player_role
+
+
+def get_player_names(db: Session, game_id: str) -> dict[str, str]:
+    """
+    Map player_id -> player_name for everyone in a game, loaded in one query.
+
+    Args:
+        db: Database session
+        game_id: ID of the game
+
+    Returns:
+        Dictionary of player names keyed by player_id
+    """
+    rows = db.query(Player.player_id, Player.player_name).join(
+        PlayerRole, PlayerRole.player_id == Player.player_id
+    ).filter(PlayerRole.game_id == game_id).all()
+    return {player_id: player_name for player_id, player_name in rows}
@@ -2,8 +2,11 @@
 from sqlalchemy.orm import Session
 from models.game import Game, GameState
 from models.player_role import PlayerRole
-from models.action import Action, ActionType
-from services import night_service
+from models.action import ActionType
+from models import roles
+from models.roles import Role
+from services import night_service, event_hub, game_engine
+from services.game_locks import serialized
 
 
 def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
@@ -13,9 +16,6 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
         raise ValueError(f"Game {game_id} not found")
     if game.state != GameState.NIGHT:
         raise ValueError(f"Game {game_id} is not in NIGHT state")
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
 
     player_role = _get_player_role(db, game_id, player_id)
     if player_role.initial_role != "Insomniac":
@@ -30,38 +30,42 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
     }
 
 
+@serialized
 def acknowledge_insomniac(db: Session, game_id: str, player_id: str) -> dict:
     """Insomniac acknowledges they've seen their card; create action record and advance."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-    if game.current_role_step != "Insomniac":
-        raise ValueError("Insomniac role is not currently active")
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
+        if live.current_role_step != "Insomniac":
+            raise ValueError("Insomniac role is not currently active")
 
-    player_role = _get_player_role(db, game_id, player_id)
-    if player_role.initial_role != "Insomniac":
-        raise ValueError("Player is not the Insomniac (only original Insomniac acts)")
+        insomniac_seat = live.seat_of(player_id)
+        if live.initial_roles[insomniac_seat] != "Insomniac":
+            raise ValueError("Player is not the Insomniac (only original Insomniac acts)")
 
-    if not player_role.night_action_completed:
-        action = Action(
-            game_id=game_id,
-            player_id=player_id,
-            action_type=ActionType.VIEW_CARD,
-            source_id=player_id,
-            target_id=player_id,
-            source_role=player_role.current_role,
-            target_role=player_role.current_role
-        )
-        db.add(action)
-        player_role.night_action_completed = True
-        db.commit()
-
-    _complete_insomniac_role_if_ready(db, game_id)
+        if not live.completed[insomniac_seat]:
+            current_role = live.current_roles[insomniac_seat]
+            live.record_action(
+                insomniac_seat,
+                ActionType.VIEW_CARD,
+                source_id=player_id,
+                target_id=player_id,
+                source_role=current_role,
+                target_role=current_role
+            )
+            live.complete(insomniac_seat)
+            completed_step = night_service.commit_role_action(db, live, "Insomniac")
+            event_hub.publish(game_id, "night_action", {"role": "Insomniac"})
+            event_hub.publish(game_id, "night_result", {
+                "role": "Insomniac",
+                "current_role": current_role,
+            }, to_player_id=player_id)
+        else:
+            # A repeat acknowledgement still advances a step that was left waiting on it
+            completed_step = night_service.commit_role_action(db, live, "Insomniac")
+        night_service.announce_role_complete(db, game_id, "Insomniac", completed_step)
     return {"status": "ok"}
 
 
@@ -75,13 +79,4 @@ def _get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
     return pr
 
 
-def _complete_insomniac_role_if_ready(db: Session, game_id: str) -> None:
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game or game.current_role_step != "Insomniac":
-        return
-    roles = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.initial_role == "Insomniac"
-    ).all()
-    if roles and all(r.night_action_completed for r in roles):
-        night_service.mark_role_complete(db, game_id, "Insomniac")
+roles.register_night_handlers(Role.INSOMNIAC, night_info=get_night_info, acknowledge=acknowledge_insomniac)
@@ -0,0 +1,123 @@
+"""
+A minimal Redis-protocol publish/subscribe broker: a stand-in for Redis where none is
+available, e.g. uvicorn workers on one machine sharing services.event_bus.
+
+Understands PING, AUTH (accepts anything), SUBSCRIBE, UNSUBSCRIBE, PUBLISH and QUIT.
+Run with: python -m services.local_broker --port 6380
+"""
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+from services.event_bus import RedisError, read_reply
+
+logger = logging.getLogger(__name__)
+
+
+def _array(*items: bytes | int) -> bytes:
+    out = [b"*%d\r\n" % len(items)]
+    for item in items:
+        out.append(b":%d\r\n" % item if isinstance(item, int) else b"$%d\r\n%s\r\n" % (len(item), item))
+    return b"".join(out)
+
+
+class LocalBroker:
+    """Channel -> subscribed connections; PUBLISH writes the message to each of them."""
+
+    def __init__(self):
+        self._subscribers: dict[bytes, set[asyncio.StreamWriter]] = defaultdict(set)
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 6380) -> None:
+        """Listen on host:port (port 0 picks a free one, see .port)."""
+        self._server = await asyncio.start_server(self._serve, host, port)
+
+    async def stop(self) -> None:
+        self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        await self._server.wait_closed()
+
+    def subscriber_count(self, channel: bytes) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        channels: set[bytes] = set()
+        self._clients.add(writer)
+        try:
+            while True:
+                try:
+                    command = await read_reply(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                if not isinstance(command, list) or not command:
+                    writer.write(b"-ERR expected a command array\r\n")
+                    continue
+                name, args = command[0].upper(), command[1:]
+                if name == b"PING":
+                    writer.write(b"+PONG\r\n")
+                elif name == b"AUTH":
+                    writer.write(b"+OK\r\n")
+                elif name == b"SUBSCRIBE":
+                    for channel in args:
+                        channels.add(channel)
+                        self._subscribers[channel].add(writer)
+                        writer.write(_array(b"subscribe", channel, len(channels)))
+                elif name == b"UNSUBSCRIBE":
+                    for channel in args or list(channels):
+                        channels.discard(channel)
+                        self._unsubscribe(channel, writer)
+                        writer.write(_array(b"unsubscribe", channel, len(channels)))
+                elif name == b"PUBLISH" and len(args) == 2:
+                    writer.write(b":%d\r\n" % self._publish(*args))
+                elif name == b"QUIT":
+                    writer.write(b"+OK\r\n")
+                    return
+                else:
+                    writer.write(b"-ERR unknown command '%s'\r\n" % name)
+                await writer.drain()
+        except RedisError as exc:
+            logger.warning("Dropping client after bad input: %s", exc)
+        finally:
+            for channel in channels:
+                self._unsubscribe(channel, writer)
+            self._clients.discard(writer)
+            writer.close()
+
+    def _publish(self, channel: bytes, message: bytes) -> int:
+        subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.write(_array(b"message", channel, message))
+        return len(subscribers)
+
+    def _unsubscribe(self, channel: bytes, writer: asyncio.StreamWriter) -> None:
+        subscribers = self._subscribers.get(channel)
+        if subscribers is None:
+            return
+        subscribers.discard(writer)
+        if not subscribers:
+            del self._subscribers[channel]
+
+
+async def _main(host: str, port: int) -> None:
+    broker = LocalBroker()
+    await broker.start(host, port)
+    logger.info("Local broker listening on %s:%s", host, broker.port)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
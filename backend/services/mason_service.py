@@ -1,10 +1,13 @@
 """Service for Mason night actions: see the other Mason (or that they're in center), then acknowledge."""
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from models.game import Game, GameState
 from models.player_role import PlayerRole
 from models.center_card import CenterCard
-from models.action import Action, ActionType
-from services import night_service
+from models.action import ActionType
+from models import roles
+from models.roles import Role
+from services import night_service, event_hub, game_engine
+from services.game_locks import serialized
 
 
 def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
@@ -14,9 +17,6 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
         raise ValueError(f"Game {game_id} not found")
     if game.state != GameState.NIGHT:
         raise ValueError(f"Game {game_id} is not in NIGHT state")
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
 
     player_role = _get_player_role(db, game_id, player_id)
     if player_role.current_role != "Mason":
@@ -24,7 +24,7 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
     if game.current_role_step != "Mason":
         raise ValueError("Mason role is not currently active")
 
-    other_masons = db.query(PlayerRole).filter(
+    other_masons = db.query(PlayerRole).options(joinedload(PlayerRole.player)).filter(
         PlayerRole.game_id == game_id,
         PlayerRole.player_id != player_id,
         PlayerRole.current_role == "Mason"
@@ -52,63 +52,52 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
         }
 
 
+@serialized
 def acknowledge_mason(db: Session, game_id: str, player_id: str) -> dict:
     """Mason acknowledges; create action record and advance."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-    if game.current_role_step != "Mason":
-        raise ValueError("Mason role is not currently active")
-
-    player_role = _get_player_role(db, game_id, player_id)
-    if player_role.initial_role != "Mason":
-        raise ValueError("Player is not a Mason (only original Mason acts)")
-
-    if not player_role.night_action_completed:
-        other_masons = db.query(PlayerRole).filter(
-            PlayerRole.game_id == game_id,
-            PlayerRole.player_id != player_id,
-            PlayerRole.current_role == "Mason"
-        ).all()
-        mason_in_center = db.query(CenterCard).filter(
-            CenterCard.game_id == game_id,
-            CenterCard.role == "Mason"
-        ).first()
-
-        if other_masons:
-            other = other_masons[0]
-            action = Action(
-                game_id=game_id,
-                player_id=player_id,
-                action_type=ActionType.VIEW_CARD,
-                source_id=other.player_id,
-                target_id=other.player_id,
-                source_role="Mason",
-                target_role="Mason"
-            )
-            db.add(action)
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
+        if live.current_role_step != "Mason":
+            raise ValueError("Mason role is not currently active")
+
+        mason_seat = live.seat_of(player_id)
+        if live.initial_roles[mason_seat] != "Mason":
+            raise ValueError("Player is not a Mason (only original Mason acts)")
+
+        if not live.completed[mason_seat]:
+            other_masons = [seat for seat in live.seats_with_current_role("Mason") if seat != mason_seat]
+            if other_masons:
+                other_player_id = live.player_ids[other_masons[0]]
+                live.record_action(
+                    mason_seat,
+                    ActionType.VIEW_CARD,
+                    source_id=other_player_id,
+                    target_id=other_player_id,
+                    source_role="Mason",
+                    target_role="Mason"
+                )
+            else:
+                # Other Mason is in center: use a sentinel for "center"
+                live.record_action(
+                    mason_seat,
+                    ActionType.VIEW_CARD,
+                    source_id="center",
+                    target_id="center",
+                    source_role="Mason",
+                    target_role="Mason"
+                )
+
+            live.complete(mason_seat)
+            completed_step = night_service.commit_role_action(db, live, "Mason")
+            event_hub.publish(game_id, "night_action", {"role": "Mason"})
+            event_hub.publish(game_id, "night_result", {"role": "Mason"}, to_player_id=player_id)
         else:
-            # Other Mason is in center: use a sentinel for "center"
-            action = Action(
-                game_id=game_id,
-                player_id=player_id,
-                action_type=ActionType.VIEW_CARD,
-                source_id="center",
-                target_id="center",
-                source_role="Mason",
-                target_role="Mason"
-            )
-            db.add(action)
-
-        player_role.night_action_completed = True
-        db.commit()
-
-    _complete_mason_role_if_ready(db, game_id)
+            # A repeat acknowledgement still advances a step that was left waiting on it
+            completed_step = night_service.commit_role_action(db, live, "Mason")
+        night_service.announce_role_complete(db, game_id, "Mason", completed_step)
     return {"status": "ok"}
 
 
@@ -122,13 +111,4 @@ def _get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
     return pr
 
 
-def _complete_mason_role_if_ready(db: Session, game_id: str) -> None:
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game or game.current_role_step != "Mason":
-        return
-    roles = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.initial_role == "Mason"
-    ).all()
-    if roles and all(r.night_action_completed for r in roles):
-        night_service.mark_role_complete(db, game_id, "Mason")
+roles.register_night_handlers(Role.MASON, night_info=get_night_info, acknowledge=acknowledge_mason)
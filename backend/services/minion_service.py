@@ -1,9 +1,12 @@
 """Service for Minion night actions: see who the Werewolves are, then acknowledge."""
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from models.game import Game, GameState
 from models.player_role import PlayerRole
-from models.action import Action, ActionType
-from services import night_service
+from models.action import ActionType
+from models import roles
+from models.roles import Role
+from services import night_service, event_hub, game_engine
+from services.game_locks import serialized
 
 
 def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
@@ -13,9 +16,6 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
         raise ValueError(f"Game {game_id} not found")
     if game.state != GameState.NIGHT:
         raise ValueError(f"Game {game_id} is not in NIGHT state")
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
 
     player_role = _get_player_role(db, game_id, player_id)
     if player_role.current_role != "Minion":
@@ -23,7 +23,7 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
     if game.current_role_step != "Minion":
         raise ValueError("Minion role is not currently active")
 
-    werewolves = db.query(PlayerRole).filter(
+    werewolves = db.query(PlayerRole).options(joinedload(PlayerRole.player)).filter(
         PlayerRole.game_id == game_id,
         PlayerRole.current_role == "Werewolf"
     ).all()
@@ -40,43 +40,40 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
     }
 
 
+@serialized
 def acknowledge_minion(db: Session, game_id: str, player_id: str) -> dict:
     """Minion acknowledges they've seen the werewolves; create action record and advance."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-    if game.current_role_step != "Minion":
-        raise ValueError("Minion role is not currently active")
-
-    player_role = _get_player_role(db, game_id, player_id)
-    if player_role.initial_role != "Minion":
-        raise ValueError("Player is not the Minion (only original Minion acts)")
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
+        if live.current_role_step != "Minion":
+            raise ValueError("Minion role is not currently active")
 
-    if not player_role.night_action_completed:
-        werewolves = db.query(PlayerRole).filter(
-            PlayerRole.game_id == game_id,
-            PlayerRole.current_role == "Werewolf"
-        ).all()
-        for w in werewolves:
-            action = Action(
-                game_id=game_id,
-                player_id=player_id,
-                action_type=ActionType.VIEW_CARD,
-                source_id=w.player_id,
-                target_id=w.player_id,
-                source_role="Werewolf",
-                target_role="Werewolf"
-            )
-            db.add(action)
-        player_role.night_action_completed = True
-        db.commit()
+        minion_seat = live.seat_of(player_id)
+        if live.initial_roles[minion_seat] != "Minion":
+            raise ValueError("Player is not the Minion (only original Minion acts)")
 
-    _complete_minion_role_if_ready(db, game_id)
+        if not live.completed[minion_seat]:
+            for werewolf_seat in live.seats_with_current_role("Werewolf"):
+                werewolf_player_id = live.player_ids[werewolf_seat]
+                live.record_action(
+                    minion_seat,
+                    ActionType.VIEW_CARD,
+                    source_id=werewolf_player_id,
+                    target_id=werewolf_player_id,
+                    source_role="Werewolf",
+                    target_role="Werewolf"
+                )
+            live.complete(minion_seat)
+            completed_step = night_service.commit_role_action(db, live, "Minion")
+            event_hub.publish(game_id, "night_action", {"role": "Minion"})
+            event_hub.publish(game_id, "night_result", {"role": "Minion"}, to_player_id=player_id)
+        else:
+            # A repeat acknowledgement still advances a step that was left waiting on it
+            completed_step = night_service.commit_role_action(db, live, "Minion")
+        night_service.announce_role_complete(db, game_id, "Minion", completed_step)
     return {"status": "ok"}
 
 
@@ -90,13 +87,4 @@ def _get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
     return pr
 
 
-def _complete_minion_role_if_ready(db: Session, game_id: str) -> None:
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game or game.current_role_step != "Minion":
-        return
-    roles = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.initial_role == "Minion"
-    ).all()
-    if roles and all(r.night_action_completed for r in roles):
-        night_service.mark_role_complete(db, game_id, "Minion")
+roles.register_night_handlers(Role.MINION, night_info=get_night_info, acknowledge=acknowledge_minion)
@@ -2,26 +2,23 @@
 import random
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+from db.database import lock_for_write
 from models.game import Game, GameState
 from models.player_role import PlayerRole
 from models.center_card import CenterCard
+from models import roles
+from services import event_hub, discussion_service, phase_scheduler, game_engine, sharding, version_service, version_watch
+from services.game_locks import serialized
 
-# Official wake order from One Night Ultimate Werewolf
-NIGHT_WAKE_ORDER = [
-    "Doppelganger",
-    "Werewolf",
-    "Minion",
-    "Mason",
-    "Seer",
-    "Robber",
-    "Troublemaker",
-    "Drunk",
-    "Insomniac",
-]
+# Range (seconds, inclusive) of a simulated role's random duration
+SIMULATED_ROLE_SECONDS = (15, 40)
 
 
 def _is_role_assigned_to_player(db: Session, game_id: str, role: str) -> bool:
     """Check if a role is assigned to any player (vs being in center cards). Uses initial_role so e.g. Insomniac is still 'assigned' even if that player was swapped."""
+    live = game_engine.engine.peek(game_id)
+    if live is not None:
+        return bool(live.seats_with_initial_role(role))
     player_role = db.query(PlayerRole).filter(
         PlayerRole.game_id == game_id,
         PlayerRole.initial_role == role
@@ -29,6 +26,13 @@ def _is_role_assigned_to_player(db: Session, game_id: str, role: str) -> bool:
     return player_role is not None
 
 
+def get_simulated_role_deadline(game: Game) -> datetime | None:
+    """When the current simulated (center card) role auto-completes, or None if no simulation is running."""
+    if not game.simulated_role_started_at or game.simulated_role_duration_seconds is None:
+        return None
+    return game.simulated_role_started_at + timedelta(seconds=game.simulated_role_duration_seconds)
+
+
 def initialize_night_phase(db: Session, game_id: str) -> dict:
     """
     Initialize the night phase for a game.
@@ -58,25 +62,27 @@ def initialize_night_phase(db: Session, game_id: str) -> dict:
         # Fallback: calculate active roles if not set
         player_roles = db.query(PlayerRole).filter(PlayerRole.game_id == game_id).all()
         center_cards = db.query(CenterCard).filter(CenterCard.game_id == game_id).all()
-        all_roles = set([pr.current_role for pr in player_roles] + [cc.role for cc in center_cards])
-        active_roles = [role for role in NIGHT_WAKE_ORDER if role in all_roles]
-        game.active_roles = active_roles
+        game.active_roles = roles.wake_plan([pr.current_role for pr in player_roles] + [cc.role for cc in center_cards])
         db.commit()
         db.refresh(game)
 
     # Find the first role in active_roles
     current_role = game.active_roles[0] if game.active_roles else None
 
-    # Set the current role in the game
-    game.current_role_step = current_role
-    
-    # If this role is not assigned to a player (it's in center), start simulation
-    if current_role and not _is_role_assigned_to_player(db, game_id, current_role):
-        game.simulated_role_started_at = datetime.utcnow()
-        game.simulated_role_duration_seconds = random.randint(15, 40)
-    
+    # Set the current role in the game, simulated if it is not assigned to a player (it's in center)
+    _set_step(game, role_step_values(
+        current_role, simulated=bool(current_role) and not _is_role_assigned_to_player(db, game_id, current_role)
+    ))
+
+    version_service.bump_version(db, game_id)
     db.commit()
     db.refresh(game)
+    game_engine.engine.set_step(game_id, game.state, current_role)
+    announce_night_start(game_id, {
+        "current_role_step": current_role,
+        "simulated_role_started_at": game.simulated_role_started_at,
+        "simulated_role_duration_seconds": game.simulated_role_duration_seconds,
+    })
 
     return {
         "game_id": game_id,
@@ -86,6 +92,76 @@ def initialize_night_phase(db: Session, game_id: str) -> dict:
     }
 
 
+def start_stranded_nights(db: Session) -> list[str]:
+    """
+    Wake the first role of games left in NIGHT without a role step, and return their ids.
+
+    Games started before start_game set the first step were woken by the first
+    night-info read; reads no longer write, so startup does it once instead. When
+    sharded, only the games this shard owns.
+    """
+    stranded = db.query(Game.game_id, Game.game_set_id).filter(
+        Game.state == GameState.NIGHT,
+        Game.current_role_step.is_(None),
+    ).all()
+    game_ids = [game_id for game_id, game_set_id in stranded if sharding.owns(game_set_id)]
+    db.rollback()
+    for game_id in game_ids:
+        _start_stranded_night(db, game_id)
+    return game_ids
+
+
+@serialized
+def _start_stranded_night(db: Session, game_id: str) -> None:
+    game = lock_game(db, game_id)
+    if game.state != GameState.NIGHT or game.current_role_step is not None:
+        db.rollback()  # Another process got there first
+        return
+    initialize_night_phase(db, game_id)
+
+
+def first_step_values(active_roles: list[str], player_roles: list[str]) -> dict:
+    """
+    Games-row values that wake the first role of a new game (as initialize_night_phase does).
+
+    A first role that no player holds (it is in the center) is simulated for a random duration.
+    """
+    current_role = active_roles[0] if active_roles else None
+    return role_step_values(current_role, simulated=bool(current_role) and current_role not in player_roles)
+
+
+def role_step_values(role: str | None, simulated: bool) -> dict:
+    """
+    Games-row values that make role the current step.
+
+    A simulated role (one no player holds) starts its timer now, for a random
+    SIMULATED_ROLE_SECONDS duration; otherwise the simulation fields are cleared.
+    """
+    return {
+        "current_role_step": role,
+        "simulated_role_started_at": datetime.utcnow() if simulated else None,
+        "simulated_role_duration_seconds": random.randint(*SIMULATED_ROLE_SECONDS) if simulated else None,
+    }
+
+
+def _set_step(game: Game, step_values: dict) -> None:
+    for column, value in step_values.items():
+        setattr(game, column, value)
+
+
+def announce_night_start(game_id: str, step_values: dict) -> None:
+    """After the commit that woke the first role: schedule a simulated role's end and notify clients."""
+    started_at = step_values["simulated_role_started_at"]
+    if started_at:
+        phase_scheduler.schedule(game_id, started_at + timedelta(seconds=step_values["simulated_role_duration_seconds"]))
+    event_hub.publish(game_id, "night_step", {
+        "current_role": step_values["current_role_step"],
+        "state": GameState.NIGHT.value,
+    })
+    version_watch.notify(game_id)
+
+
+@serialized
 def check_and_advance_simulated_role(db: Session, game_id: str) -> bool:
     """
     Check if a simulated role (center card role) has completed its time and advance it.
@@ -105,8 +181,7 @@ def check_and_advance_simulated_role(db: Session, game_id: str) -> bool:
         return False
     
     # Check if simulation time has elapsed
-    elapsed = (datetime.utcnow() - game.simulated_role_started_at).total_seconds()
-    if elapsed >= game.simulated_role_duration_seconds:
+    if datetime.utcnow() >= get_simulated_role_deadline(game):
         # Auto-complete this simulated role
         mark_role_complete(db, game_id, game.current_role_step)
         return True
@@ -127,6 +202,7 @@ def get_night_status(db: Session, game_id: str) -> dict:
         - current_role: The role currently acting (or None if night is over)
         - roles_completed: List of roles that have completed their actions
         - roles_in_game: List of all active roles (from active_roles)
+        - version: The game's version (pass as wait_for_version to long-poll)
 
     Raises:
         ValueError: If game not found
@@ -135,10 +211,6 @@ def get_night_status(db: Session, game_id: str) -> dict:
     if not game:
         raise ValueError(f"Game {game_id} not found")
 
-    # Check and advance simulated roles if needed
-    check_and_advance_simulated_role(db, game_id)
-    db.refresh(game)
-
     # Use active_roles from game (includes all action roles)
     active_roles = game.active_roles or []
 
@@ -156,9 +228,11 @@ def get_night_status(db: Session, game_id: str) -> dict:
         "current_role": game.current_role_step,
         "roles_completed": roles_completed,
         "roles_in_game": active_roles,
+        "version": game.version,
     }
 
 
+@serialized
 def mark_role_complete(db: Session, game_id: str, role: str) -> dict:
     """
     Mark a role as complete and advance to the next role in active_roles.
@@ -177,10 +251,78 @@ def mark_role_complete(db: Session, game_id: str, role: str) -> dict:
     Raises:
         ValueError: If game not found, role is not current, or game not in NIGHT state
     """
-    game = db.query(Game).filter(Game.game_id == game_id).first()
+    game = lock_game(db, game_id)
+    result = _advance_past_role(db, game, role)
+    version_service.bump_version(db, game_id)
+    db.commit()
+    announce_role_complete(db, game_id, role, result)
+    return result
+
+
+def lock_game(db: Session, game_id: str) -> Game:
+    """
+    Load the game row locked for the rest of the transaction (SELECT ... FOR UPDATE).
+
+    SQLite ignores FOR UPDATE; the transaction takes the database's write lock
+    instead (db.database.lock_for_write).
+
+    Raises:
+        ValueError: If game not found
+    """
+    lock_for_write(db)
+    game = db.query(Game).filter(Game.game_id == game_id).with_for_update().first()
     if not game:
         raise ValueError(f"Game {game_id} not found")
+    return game
+
+
+def commit_role_action(db: Session, live: game_engine.LiveGame, role: str) -> dict | None:
+    """
+    Commit a night action recorded on the live game, in a single transaction.
+
+    If the action was the last one its role step was waiting for, the wake pointer
+    advances in the same transaction. The caller holds the game via
+    game_engine.engine.acquire (which locked the row) and passes the result to
+    announce_role_complete once its own events are published.
 
+    Returns:
+        The mark_role_complete result if the step advanced, else None
+    """
+    result = None
+    if live.current_role_step == role and live.role_complete(role):
+        game = db.get(Game, live.game_id)  # Loaded and locked by acquire
+        result = _advance_past_role(db, game, role)
+    if result is not None or live.has_pending_writes:
+        game_engine.engine.flush(db, live)
+    return result
+
+
+def announce_role_complete(db: Session, game_id: str, role: str, result: dict | None) -> None:
+    """After the commit that advanced past role: sync the engine, schedule the next deadline and notify clients."""
+    if result is None:
+        return
+    game = db.get(Game, game_id)
+    next_role = result["next_role"]
+    game_engine.engine.set_step(game_id, game.state, next_role)
+
+    if next_role:
+        deadline = get_simulated_role_deadline(game)
+    else:
+        deadline = discussion_service.get_discussion_deadline(db, game)
+    if deadline:
+        phase_scheduler.schedule(game_id, deadline)
+
+    event_hub.publish(game_id, "night_step", {
+        "completed_role": role,
+        "current_role": next_role,
+        "state": game.state.value,
+    })
+    version_watch.notify(game_id)
+
+
+def _advance_past_role(db: Session, game: Game, role: str) -> dict:
+    """Validate that role is the current step and move the game to the next one (not committed)."""
+    game_id = game.game_id
     if game.state != GameState.NIGHT:
         raise ValueError(f"Game {game_id} is not in NIGHT state")
 
@@ -201,34 +343,21 @@ def mark_role_complete(db: Session, game_id: str, role: str) -> dict:
         # Role not in active_roles (shouldn't happen, but handle gracefully)
         next_role = None
 
-    # Clear simulation fields
-    game.simulated_role_started_at = None
-    game.simulated_role_duration_seconds = None
+    # Move to the next role (simulated if it is not assigned to a player), or clear the step
+    _set_step(game, role_step_values(
+        next_role, simulated=bool(next_role) and not _is_role_assigned_to_player(db, game_id, next_role)
+    ))
 
     # Update game state
     if next_role:
-        # Move to next role
-        game.current_role_step = next_role
-        
-        # If next role is not assigned to a player (it's in center), start simulation
-        if not _is_role_assigned_to_player(db, game_id, next_role):
-            game.simulated_role_started_at = datetime.utcnow()
-            game.simulated_role_duration_seconds = random.randint(15, 40)
-        
-        db.commit()
-        db.refresh(game)
-
         return {
             "status": "ok",
             "next_role": next_role,
         }
     else:
         # Night phase is over, transition to day
-        game.current_role_step = None
         game.state = GameState.DAY_DISCUSSION
         game.discussion_started_at = datetime.utcnow()
-        db.commit()
-        db.refresh(game)
 
         return {
             "status": "ok",
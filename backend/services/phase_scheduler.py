@@ -0,0 +1,163 @@
+"""Timer wheel that fires timed phase transitions (simulated roles, discussion timer) at their deadlines."""
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from db.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Wheel resolution: transitions fire at most this many seconds after their deadline
+TICK_SECONDS = 0.5
+
+# How often deadlines are re-read from the database, picking up games another process
+# (a failed-over shard, scripts/make_demo_game.py) put on a timer
+RESYNC_SECONDS = 10.0
+
+
+def _to_timestamp(deadline: datetime) -> float:
+    # Game timestamps are naive UTC (datetime.utcnow())
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    return deadline.timestamp()
+
+
+class PhaseScheduler:
+    """
+    Hashed timer wheel keyed by tick number, holding at most one deadline per game.
+
+    schedule() may be called from any thread. While running, a task on the
+    event loop advances one tick at a time and hands each due game to on_due
+    (in the threadpool, with its own session). on_due returns the game's next
+    deadline, if any, which is scheduled in turn. Every RESYNC_SECONDS it also
+    schedules any deadline load_pending reports for a game it has none for.
+    """
+
+    def __init__(self):
+        self._slots: dict[int, set[str]] = defaultdict(set)
+        self._game_ticks: dict[str, int] = {}
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._on_due: Callable[[Session, str], datetime | None] | None = None
+        self._load_pending: Callable[[Session], dict[str, datetime]] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def schedule(self, game_id: str, deadline: datetime) -> None:
+        """Set (or replace) the game's next deadline. No-op when the scheduler is not running."""
+        if not self.running:
+            return
+        tick = math.ceil(_to_timestamp(deadline) / TICK_SECONDS)
+        with self._lock:
+            self._unschedule_locked(game_id)
+            tick = max(tick, self._cursor + 1)
+            self._slots[tick].add(game_id)
+            self._game_ticks[game_id] = tick
+
+    def cancel(self, game_id: str) -> None:
+        with self._lock:
+            self._unschedule_locked(game_id)
+
+    def pending(self) -> dict[str, float]:
+        """Pending deadlines as game_id -> unix timestamp (tick resolution)."""
+        with self._lock:
+            return {game_id: tick * TICK_SECONDS for game_id, tick in self._game_ticks.items()}
+
+    def _unschedule_locked(self, game_id: str) -> None:
+        tick = self._game_ticks.pop(game_id, None)
+        if tick is None:
+            return
+        slot = self._slots.get(tick)
+        if slot is not None:
+            slot.discard(game_id)
+            if not slot:
+                del self._slots[tick]
+
+    def _pop_due(self, now_tick: int) -> list[str]:
+        due = []
+        with self._lock:
+            while self._cursor < now_tick:
+                self._cursor += 1
+                for game_id in self._slots.pop(self._cursor, ()):
+                    self._game_ticks.pop(game_id, None)
+                    due.append(game_id)
+        return due
+
+    async def start(
+        self,
+        on_due: Callable[[Session, str], datetime | None],
+        load_pending: Callable[[Session], dict[str, datetime]],
+    ) -> None:
+        """Start ticking on the running loop, after rebuilding deadlines with load_pending."""
+        self._on_due = on_due
+        self._load_pending = load_pending
+        with self._lock:
+            self._cursor = math.floor(time.time() / TICK_SECONDS)
+        self._task = asyncio.create_task(self._run())
+        await self._resync()
+
+    async def _resync(self) -> None:
+        pending = await run_in_threadpool(self._with_session, self._load_pending)
+        for game_id, deadline in pending.items():
+            with self._lock:
+                known = game_id in self._game_ticks
+            # A known game keeps its deadline: this process set it, possibly after the read
+            if not known:
+                self.schedule(game_id, deadline)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        with self._lock:
+            self._slots.clear()
+            self._game_ticks.clear()
+
+    async def _run(self) -> None:
+        next_resync = time.monotonic() + RESYNC_SECONDS
+        while True:
+            await asyncio.sleep(TICK_SECONDS)
+            if time.monotonic() >= next_resync:
+                next_resync = time.monotonic() + RESYNC_SECONDS
+                try:
+                    await self._resync()
+                except Exception:
+                    logger.exception("Reloading timed transitions failed")
+            for game_id in self._pop_due(math.floor(time.time() / TICK_SECONDS)):
+                try:
+                    next_deadline = await run_in_threadpool(self._with_session, self._on_due, game_id)
+                except Exception:
+                    logger.exception("Timed transition failed for game %s", game_id)
+                    continue
+                if next_deadline is not None:
+                    self.schedule(game_id, next_deadline)
+
+    @staticmethod
+    def _with_session(fn, *args):
+        db = SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+
+scheduler = PhaseScheduler()
+
+
+def schedule(game_id: str, deadline: datetime) -> None:
+    """Schedule the game's next timed transition on the process-wide scheduler."""
+    scheduler.schedule(game_id, deadline)
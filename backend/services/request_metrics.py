@@ -0,0 +1,108 @@
+"""Per-route request metrics (wall time, SQL statements, SQL time, commits), served in Prometheus text format."""
+import threading
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from db.database import QueryStats
+
+# Upper bounds (seconds) of the request duration histogram buckets; long polls land in the top ones
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Route label for requests that matched no route, so unknown paths cannot grow the label set
+UNMATCHED_ROUTE = "unmatched"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass(slots=True)
+class RouteMetrics:
+    """Running totals for one (method, route template)."""
+    statuses: Counter = field(default_factory=Counter)
+    bucket_counts: list[int] = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+    seconds: float = 0.0
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+    commits: int = 0
+
+
+class RequestMetrics:
+    """Aggregates observed requests by method and route template; observe() may be called from any thread."""
+
+    def __init__(self):
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str | None, status: int, seconds: float, stats: QueryStats) -> None:
+        key = (method, route or UNMATCHED_ROUTE)
+        bucket = bisect_left(DURATION_BUCKETS, seconds)
+        with self._lock:
+            metrics = self._routes.get(key)
+            if metrics is None:
+                metrics = self._routes[key] = RouteMetrics()
+            metrics.statuses[status] += 1
+            if bucket < len(DURATION_BUCKETS):
+                metrics.bucket_counts[bucket] += 1
+            metrics.seconds += seconds
+            metrics.sql_statements += stats.statements
+            metrics.sql_seconds += stats.seconds
+            metrics.commits += stats.commits
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            routes = sorted(
+                (key, RouteMetrics(
+                    Counter(m.statuses), list(m.bucket_counts), m.seconds, m.sql_statements, m.sql_seconds, m.commits
+                ))
+                for key, m in self._routes.items()
+            )
+
+        lines = [
+            "# HELP onw_http_requests_total HTTP requests handled, by route template and status.",
+            "# TYPE onw_http_requests_total counter",
+        ]
+        for (method, route), m in routes:
+            for status, count in sorted(m.statuses.items()):
+                lines.append(f'onw_http_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+
+        lines += [
+            "# HELP onw_http_request_duration_seconds Time until the response started, by route template.",
+            "# TYPE onw_http_request_duration_seconds histogram",
+        ]
+        for (method, route), m in routes:
+            labels = _labels(method, route)
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS, m.bucket_counts):
+                cumulative += count
+                lines.append(f'onw_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            total = sum(m.statuses.values())
+            lines.append(f'onw_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}')
+            lines.append(f"onw_http_request_duration_seconds_sum{{{labels}}} {m.seconds:.6f}")
+            lines.append(f"onw_http_request_duration_seconds_count{{{labels}}} {total}")
+
+        for name, help_text, attribute, fmt in (
+            ("onw_http_request_sql_statements_total", "SQL statements executed by requests.", "sql_statements", "d"),
+            ("onw_http_request_sql_seconds_total", "Seconds spent executing SQL by requests.", "sql_seconds", ".6f"),
+            ("onw_http_request_commits_total", "Transactions committed by requests.", "commits", "d"),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), m in routes:
+                lines.append(f"{name}{{{_labels(method, route)}}} {getattr(m, attribute):{fmt}}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+def server_timing(seconds: float, stats: QueryStats) -> str:
+    """Server-Timing header value: total time, and SQL time with statement and commit counts."""
+    return (
+        f"total;dur={seconds * 1000:.1f}, "
+        f'sql;dur={stats.seconds * 1000:.1f};desc="{stats.statements} statements, {stats.commits} commits"'
+    )
+
+
+metrics = RequestMetrics()
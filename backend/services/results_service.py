@@ -1,100 +1,127 @@
 """Service for computing game results and win conditions."""
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
 from sqlalchemy.orm import Session
+from db.database import lock_for_write
 from models.game import Game, GameState
+from models.game_result import GameResult
 from models.player_role import PlayerRole
 from models.vote import Vote
-from models.player import Player
+from services import game_service, rules, standings_service
+from services.game_locks import serialized
+
+# Finished games whose results are kept in memory (results never change once recorded)
+RESULTS_CACHE_SIZE = 1024
+
+_results_cache: OrderedDict[str, dict] = OrderedDict()
+_results_cache_lock = threading.Lock()
 
 
 def get_results(db: Session, game_id: str) -> dict:
-    """Compute deaths, winning team, and per-player results. Sets was_killed on player_roles."""
+    """
+    Get a finished game's results, recorded when voting ended.
+
+    Served from an in-process LRU, then the game_results record; repeat reads
+    never recompute or write.
+
+    Raises:
+        ValueError: If game not found or not in RESULTS state
+    """
+    with _results_cache_lock:
+        cached = _results_cache.get(game_id)
+        if cached is not None:
+            _results_cache.move_to_end(game_id)
+            return cached
+
     game = db.query(Game).filter(Game.game_id == game_id).first()
     if not game:
         raise ValueError(f"Game {game_id} not found")
     if game.state != GameState.RESULTS:
         raise ValueError(f"Game is not in results phase (state={game.state})")
 
+    record = db.query(GameResult).filter(GameResult.game_id == game_id).first()
+    if record:
+        results = record.results
+    else:
+        # Games that finished before results were recorded at the transition
+        results = record_missing_results(db, game_id)
+
+    _cache_results(game_id, results)
+    return results
+
+
+def record_results(db: Session, game_id: str) -> dict:
+    """
+    Compute the game's results, set was_killed and won, and add its game_results record.
+
+    Called in the same transaction that moves the game to RESULTS, which also adds the
+    game to its set's standings; the caller commits.
+    """
+    results = compute_results(db, game_id)
+    db.add(GameResult(game_id=game_id, results=results))
+    # A set's first recorded game rebuilds its standings from the database, which must see this one
+    db.flush()
+    standings_service.record_game(db, db.get(Game, game_id).game_set_id, results)
+    return results
+
+
+@serialized
+def record_missing_results(db: Session, game_id: str) -> dict:
+    """
+    Record the results of a game that reached RESULTS before they were recorded, once.
+
+    Called on the game's first results read, and by standings_service for the set's
+    standings; commits.
+
+    Concurrent first reads queue on the game's lock and row lock; each re-checks
+    for the record, so only the first computes it and adds the game to standings.
+    """
+    lock_for_write(db)
+    db.query(Game).filter(Game.game_id == game_id).with_for_update().first()
+    record = db.query(GameResult).filter(GameResult.game_id == game_id).first()
+    if record:
+        db.rollback()
+        return record.results
+    results = record_results(db, game_id)
+    db.commit()
+    return results
+
+
+def _cache_results(game_id: str, results: dict) -> None:
+    with _results_cache_lock:
+        _results_cache[game_id] = results
+        while len(_results_cache) > RESULTS_CACHE_SIZE:
+            _results_cache.popitem(last=False)
+
+
+def compute_results(db: Session, game_id: str) -> dict:
+    """Compute deaths, winning team, and per-player results. Sets was_killed and won on player_roles (not committed)."""
     player_roles = db.query(PlayerRole).filter(PlayerRole.game_id == game_id).all()
     votes = db.query(Vote).filter(Vote.game_id == game_id).all()
-    player_id_to_role = {pr.player_id: pr for pr in player_roles}
 
-    # Vote counts per target
-    vote_counts = Counter(v.target_player_id for v in votes)
-    if not vote_counts:
-        deaths = []
-        vote_summary = {}
-    else:
-        max_votes = max(vote_counts.values())
-        # Official rule: "If no player receives more than one vote, no one dies."
-        # (e.g. everyone points right → each gets 1 vote → no one dies)
-        if max_votes <= 1:
-            deaths = []
-        else:
-            deaths = [pid for pid, count in vote_counts.items() if count == max_votes]
-        vote_summary = {pid: count for pid, count in vote_counts.items()}
-
-    # Hunter: if Hunter died, their vote target also dies
-    hunter_votes = {v.voter_player_id: v.target_player_id for v in votes}
-    for pr in player_roles:
-        if pr.current_role == "Hunter" and pr.player_id in deaths:
-            target_id = hunter_votes.get(pr.player_id)
-            if target_id and target_id not in deaths:
-                deaths.append(target_id)
+    votes_by_voter = {v.voter_player_id: v.target_player_id for v in votes}
+    current_roles = {pr.player_id: pr.current_role for pr in player_roles}
+    vote_summary = dict(Counter(votes_by_voter.values()))
+
+    deaths = rules.resolve_deaths(votes_by_voter, current_roles)
+    winning_team = rules.winning_team(deaths, current_roles)
 
-    # Persist was_killed
+    # Persist was_killed and won
     for pr in player_roles:
         pr.was_killed = pr.player_id in deaths
-    db.commit()
-
-    # Winning team
-    werewolf_player_ids = {pr.player_id for pr in player_roles if pr.current_role == "Werewolf"}
-    tanner_died = any(pr.player_id in deaths and pr.current_role == "Tanner" for pr in player_roles)
-    any_werewolf_died = bool(werewolf_player_ids & set(deaths))
-    minion_players = [pr for pr in player_roles if pr.current_role == "Minion"]
-    no_werewolves_in_game = len(werewolf_player_ids) == 0
-
-    if tanner_died:
-        winning_team = "tanner"
-    elif any_werewolf_died:
-        winning_team = "village"
-    elif no_werewolves_in_game and minion_players:
-        # Instructions: "If no players are Werewolves, the Minion wins if one other player dies."
-        # So: at least one non-Minion player must have died (Minion may or may not die, e.g. tie).
-        other_player_died = any(
-            pr.player_id in deaths and pr.current_role != "Minion" for pr in player_roles
-        )
-        if other_player_died:
-            winning_team = "minion"
-        else:
-            # Only Minion died or no deaths: werewolf team wins (no werewolves died)
-            winning_team = "werewolf"
-    else:
-        winning_team = "werewolf"
-
-    # Per-player results: who won
-    def player_won(pr: PlayerRole) -> bool:
-        if winning_team == "tanner":
-            return pr.current_role == "Tanner"
-        if winning_team == "village":
-            return pr.team == "village"
-        if winning_team == "werewolf":
-            return pr.team == "werewolf" or pr.current_role == "Minion"
-        if winning_team == "minion":
-            return pr.current_role == "Minion"
-        return False
+        pr.won = rules.player_won(winning_team, pr.team, pr.current_role)
 
+    player_names = game_service.get_player_names(db, game_id)
     players_out = []
     for pr in player_roles:
-        player = db.query(Player).filter(Player.player_id == pr.player_id).first()
         players_out.append({
             "player_id": pr.player_id,
-            "player_name": player.player_name if player else "Unknown",
+            "player_name": player_names.get(pr.player_id, "Unknown"),
             "initial_role": pr.initial_role,
             "current_role": pr.current_role,
             "team": pr.team or "village",
             "died": pr.player_id in deaths,
-            "won": player_won(pr),
+            "won": pr.won,
         })
 
     return {
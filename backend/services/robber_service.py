@@ -1,11 +1,12 @@
 """Service for Robber night actions."""
 from sqlalchemy.orm import Session
-from models.game import Game, GameState
-from models.player_role import PlayerRole
-from models.action import Action, ActionType
-from services import night_service
+from models.game import GameState
+from models.action import ActionType
+from services import night_service, event_hub, game_engine, rules
+from services.game_locks import serialized
 
 
+@serialized
 def perform_robber_action(
     db: Session,
     game_id: str,
@@ -27,75 +28,48 @@ def perform_robber_action(
     Raises:
         ValueError: If validation fails
     """
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
-
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
-
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-
-    if game.current_role_step != "Robber":
-        raise ValueError("Robber role is not currently active")
-
-    robber_role = _get_player_role(db, game_id, player_id)
-    if robber_role.initial_role != "Robber":
-        raise ValueError("Player is not a Robber (only original Robber acts)")
-
-    if robber_role.night_action_completed:
-        raise ValueError("Robber has already performed their action")
-
-    if target_player_id == player_id:
-        raise ValueError("Robber cannot exchange with themselves")
-
-    target_role = _get_player_role(db, game_id, target_player_id)
-    new_role = target_role.current_role
-
-    # Collect all original Robbers (by initial_role) before swap so we can check completion
-    robbers_in_game = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.initial_role == "Robber"
-    ).all()
-
-    # Swap current_role between Robber and target
-    robber_old_role = robber_role.current_role
-    target_old_role = target_role.current_role
-    robber_role.current_role = target_old_role
-    target_role.current_role = robber_old_role
-
-    # Create action record (for Robber: source=robber, target=victim; target_role = role robber received)
-    action = Action(
-        game_id=game_id,
-        player_id=player_id,
-        action_type=ActionType.SWAP_PLAYER_TO_PLAYER,
-        source_id=player_id,
-        target_id=target_player_id,
-        source_role="Robber",
-        target_role=new_role
-    )
-    db.add(action)
-
-    robber_role.night_action_completed = True
-    db.commit()
-
-    # All players who were Robbers at start of step must have completed (we just completed for this one)
-    if all(r.night_action_completed for r in robbers_in_game):
-        night_service.mark_role_complete(db, game_id, "Robber")
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
+
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
+
+        if live.current_role_step != "Robber":
+            raise ValueError("Robber role is not currently active")
+
+        robber_seat = live.seat_of(player_id)
+        if live.initial_roles[robber_seat] != "Robber":
+            raise ValueError("Player is not a Robber (only original Robber acts)")
+
+        if live.completed[robber_seat]:
+            raise ValueError("Robber has already performed their action")
+
+        # Swap current_role between Robber and target
+        new_role = rules.rob(live, robber_seat, live.seat_of(target_player_id))
+
+        # Action record (for Robber: source=robber, target=victim; target_role = role robber received)
+        live.record_action(
+            robber_seat,
+            ActionType.SWAP_PLAYER_TO_PLAYER,
+            source_id=player_id,
+            target_id=target_player_id,
+            source_role="Robber",
+            target_role=new_role
+        )
+
+        live.complete(robber_seat)
+        # One commit for the swap, the action and (once every Robber has acted) the step advance
+        completed_step = night_service.commit_role_action(db, live, "Robber")
+        event_hub.publish(game_id, "night_action", {"role": "Robber"})
+        event_hub.publish(game_id, "night_result", {
+            "role": "Robber",
+            "target_player_id": target_player_id,
+            "new_role": new_role,
+        }, to_player_id=player_id)
+        night_service.announce_role_complete(db, game_id, "Robber", completed_step)
 
     return {
         "new_role": new_role,
         "message": f"You are now the {new_role}."
     }
-
-
-def _get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
-    player_role = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.player_id == player_id
-    ).first()
-    if not player_role:
-        raise ValueError(f"Player {player_id} not found in game {game_id}")
-    return player_role
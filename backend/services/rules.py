@@ -0,0 +1,148 @@
+"""
+Game rules without the database: night moves on a table of cards, deaths from the
+votes (with the Hunter) and the winning team.
+
+The role services apply these to a live game and results_service to the final
+votes; the simulator re-implements them over arrays and is tested against them.
+Invalid choices raise ValueError, which the API turns into a 400.
+"""
+from collections import Counter
+from models.roles import Role
+
+CENTER_CARDS = 3
+
+# Winning teams, in the order the win conditions are checked
+TANNER = "tanner"
+VILLAGE = "village"
+MINION = "minion"
+WEREWOLF = "werewolf"
+
+
+class Table:
+    """The cards in play: current_roles[seat] for each player and center[index] for the three center cards."""
+
+    __slots__ = ("current_roles", "center")
+
+    def __init__(self, current_roles: list[str], center: list[str | None]):
+        self.current_roles = current_roles
+        self.center = center
+
+    def swap_seats(self, seat_a: int, seat_b: int) -> None:
+        self.current_roles[seat_a], self.current_roles[seat_b] = self.current_roles[seat_b], self.current_roles[seat_a]
+
+    def swap_with_center(self, seat: int, card_index: int) -> None:
+        self.current_roles[seat], self.center[card_index] = self.center[card_index], self.current_roles[seat]
+
+
+def _check_center_index(table: Table, card_index: int) -> None:
+    if card_index not in range(CENTER_CARDS):
+        raise ValueError("card_index must be 0, 1, or 2")
+    if table.center[card_index] is None:
+        raise ValueError(f"Center card at index {card_index} not found")
+
+
+def seer_view_player(table: Table, seer_seat: int, target_seat: int) -> str:
+    """The Seer looks at another player's card; returns its role."""
+    if target_seat == seer_seat:
+        raise ValueError("Seer cannot view their own card")
+    return table.current_roles[target_seat]
+
+
+def seer_view_center(table: Table, card_indices: list[int]) -> list[tuple[int, str]]:
+    """The Seer looks at two center cards; returns (index, role) pairs in index order."""
+    if len(card_indices) != 2:
+        raise ValueError("Seer must view exactly two center cards")
+    if len(set(card_indices)) != 2:
+        raise ValueError("Seer must view two different center cards")
+    for card_index in card_indices:
+        if card_index not in range(CENTER_CARDS):
+            raise ValueError("card_indices must be 0, 1, or 2")
+    for card_index in sorted(card_indices):
+        _check_center_index(table, card_index)
+    return [(card_index, table.center[card_index]) for card_index in sorted(card_indices)]
+
+
+def rob(table: Table, robber_seat: int, target_seat: int) -> str:
+    """The Robber swaps cards with another player and looks at the new card; returns its role."""
+    if target_seat == robber_seat:
+        raise ValueError("Robber cannot exchange with themselves")
+    new_role = table.current_roles[target_seat]
+    table.swap_seats(robber_seat, target_seat)
+    return new_role
+
+
+def troublemake(table: Table, troublemaker_seat: int, seat_a: int, seat_b: int) -> None:
+    """The Troublemaker swaps two other players' cards without looking."""
+    if seat_a == seat_b:
+        raise ValueError("Must choose two different players")
+    if troublemaker_seat in (seat_a, seat_b):
+        raise ValueError("Troublemaker cannot swap their own card; choose two other players")
+    table.swap_seats(seat_a, seat_b)
+
+
+def drink(table: Table, drunk_seat: int, card_index: int) -> None:
+    """The Drunk swaps their card with a center card without looking."""
+    _check_center_index(table, card_index)
+    table.swap_with_center(drunk_seat, card_index)
+
+
+def resolve_deaths(votes: dict, current_roles: dict) -> list:
+    """
+    Players who die, in order: the most-voted (ties all die, nobody if no one has more
+    than one vote), then whoever a dead Hunter voted for, repeated while that kills
+    another Hunter.
+
+    Args:
+        votes: voter -> target (any hashable player key)
+        current_roles: player -> role card at the end of the night
+    """
+    vote_counts = Counter(votes.values())
+    max_votes = max(vote_counts.values(), default=0)
+    deaths = [player for player, count in vote_counts.items() if count == max_votes] if max_votes > 1 else []
+
+    # Hunter: if the Hunter dies, the player they voted for dies too
+    hunters_done = set()
+    pending = [player for player in deaths if current_roles.get(player) == Role.HUNTER]
+    while pending:
+        hunter = pending.pop(0)
+        hunters_done.add(hunter)
+        target = votes.get(hunter)
+        if target is not None and target not in deaths:
+            deaths.append(target)
+            if current_roles.get(target) == Role.HUNTER and target not in hunters_done:
+                pending.append(target)
+    return deaths
+
+
+def winning_team(deaths: list, current_roles: dict) -> str:
+    """
+    The winning team given who died and the final role cards.
+
+    Tanner wins if the Tanner died, then the village if any Werewolf died. With no
+    Werewolves among the players, the Minion wins if someone else died. Otherwise
+    the werewolf team wins.
+    """
+    dead = set(deaths)
+    if any(current_roles[player] == Role.TANNER for player in dead):
+        return TANNER
+    werewolves = {player for player, role in current_roles.items() if role == Role.WEREWOLF}
+    if werewolves & dead:
+        return VILLAGE
+    if not werewolves and Role.MINION in current_roles.values():
+        # "If no players are Werewolves, the Minion wins if one other player dies."
+        if any(current_roles[player] != Role.MINION for player in dead):
+            return MINION
+    return WEREWOLF
+
+
+def player_won(team_won: str, team: str, current_role: str) -> bool:
+    """Whether a player won: Tanner and Minion wins go by the final card, the others by the player's team."""
+    if team_won == TANNER:
+        return current_role == Role.TANNER
+    if team_won == VILLAGE:
+        return team == VILLAGE
+    if team_won == WEREWOLF:
+        return team == WEREWOLF or current_role == Role.MINION
+    if team_won == MINION:
+        return current_role == Role.MINION
+    return False
@@ -1,14 +1,12 @@
 """Service for Seer night actions."""
 from sqlalchemy.orm import Session
-from models.game import Game, GameState
-from models.player_role import PlayerRole
-from models.center_card import CenterCard
-from models.action import Action, ActionType
-from services import night_service
-
-CENTER_POSITIONS = ["left", "center", "right"]
+from models.game import GameState
+from models.action import ActionType
+from services import night_service, event_hub, game_engine, rules
+from services.game_locks import serialized
 
 
+@serialized
 def perform_seer_action(
     db: Session,
     game_id: str,
@@ -35,129 +33,81 @@ def perform_seer_action(
     Raises:
         ValueError: If validation fails
     """
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
-
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
-
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-
-    if game.current_role_step != "Seer":
-        raise ValueError("Seer role is not currently active")
-
-    player_role = _get_player_role(db, game_id, player_id)
-    if player_role.initial_role != "Seer":
-        raise ValueError("Player is not a Seer (only original Seer acts)")
-
-    if player_role.night_action_completed:
-        raise ValueError("Seer has already performed their action")
-
-    if action_type == "view_player":
-        if not target_player_id:
-            raise ValueError("target_player_id is required for view_player action")
-        
-        if target_player_id == player_id:
-            raise ValueError("Seer cannot view their own card")
-
-        # Get target player's role
-        target_role = _get_player_role(db, game_id, target_player_id)
-        
-        # Create action record
-        action = Action(
-            game_id=game_id,
-            player_id=player_id,
-            action_type=ActionType.VIEW_CARD,
-            source_id=target_player_id,
-            target_id=target_player_id,
-            source_role=target_role.current_role,
-            target_role=target_role.current_role
-        )
-        db.add(action)
-        
-        player_role.night_action_completed = True
-        db.commit()
-        
-        _complete_seer_role_if_ready(db, game_id)
-        
-        return {"role": target_role.current_role}
-    
-    elif action_type == "view_center":
-        if not card_indices:
-            raise ValueError("card_indices is required for view_center action")
-        
-        if len(card_indices) != 2:
-            raise ValueError("Seer must view exactly two center cards")
-        
-        if len(set(card_indices)) != 2:
-            raise ValueError("Seer must view two different center cards")
-        
-        for idx in card_indices:
-            if idx not in [0, 1, 2]:
-                raise ValueError("card_indices must be 0, 1, or 2")
-
-        # Get center cards
-        viewed_roles = []
-        for card_index in sorted(card_indices):
-            position = CENTER_POSITIONS[card_index]
-            center_card = db.query(CenterCard).filter(
-                CenterCard.game_id == game_id,
-                CenterCard.position == position
-            ).first()
-            
-            if not center_card:
-                raise ValueError(f"Center card at index {card_index} not found")
-            
-            # Create separate action record for each center card viewed
-            action = Action(
-                game_id=game_id,
-                player_id=player_id,
-                action_type=ActionType.VIEW_CARD,
-                source_id=str(card_index),
-                target_id=str(card_index),
-                source_role=center_card.role,
-                target_role=center_card.role
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
+
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
+
+        if live.current_role_step != "Seer":
+            raise ValueError("Seer role is not currently active")
+
+        seer_seat = live.seat_of(player_id)
+        if live.initial_roles[seer_seat] != "Seer":
+            raise ValueError("Player is not a Seer (only original Seer acts)")
+
+        if live.completed[seer_seat]:
+            raise ValueError("Seer has already performed their action")
+
+        if action_type == "view_player":
+            if not target_player_id:
+                raise ValueError("target_player_id is required for view_player action")
+
+            viewed_role = rules.seer_view_player(live, seer_seat, live.seat_of(target_player_id))
+
+            live.record_action(
+                seer_seat,
+                ActionType.VIEW_CARD,
+                source_id=target_player_id,
+                target_id=target_player_id,
+                source_role=viewed_role,
+                target_role=viewed_role
             )
-            db.add(action)
-            viewed_roles.append(center_card.role)
-        
-        player_role.night_action_completed = True
-        db.commit()
-        
-        _complete_seer_role_if_ready(db, game_id)
-        
-        return {"roles": viewed_roles}
-    
-    else:
-        raise ValueError(f"Invalid action_type: {action_type}. Must be 'view_player' or 'view_center'")
-
-
-def _get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
-    player_role = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.player_id == player_id
-    ).first()
-    if not player_role:
-        raise ValueError(f"Player {player_id} not found in game {game_id}")
-    return player_role
-
-
-def _complete_seer_role_if_ready(db: Session, game_id: str) -> None:
-    """Mark Seer role as complete if all Seers have acted."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game or game.current_role_step != "Seer":
-        return
-
-    seer_roles = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.initial_role == "Seer"
-    ).all()
-    
-    if not seer_roles:
-        return
 
-    if all(role.night_action_completed for role in seer_roles):
-        night_service.mark_role_complete(db, game_id, "Seer")
+            live.complete(seer_seat)
+            completed_step = night_service.commit_role_action(db, live, "Seer")
+            event_hub.publish(game_id, "night_action", {"role": "Seer"})
+            event_hub.publish(game_id, "night_result", {
+                "role": "Seer",
+                "target_player_id": target_player_id,
+                "viewed_role": viewed_role,
+            }, to_player_id=player_id)
+
+            night_service.announce_role_complete(db, game_id, "Seer", completed_step)
+
+            return {"role": viewed_role}
+
+        elif action_type == "view_center":
+            if not card_indices:
+                raise ValueError("card_indices is required for view_center action")
+
+            viewed = rules.seer_view_center(live, card_indices)
+            viewed_roles = [role for _, role in viewed]
+
+            # Separate action record for each center card viewed
+            for card_index, role in viewed:
+                live.record_action(
+                    seer_seat,
+                    ActionType.VIEW_CARD,
+                    source_id=str(card_index),
+                    target_id=str(card_index),
+                    source_role=role,
+                    target_role=role
+                )
+
+            live.complete(seer_seat)
+            completed_step = night_service.commit_role_action(db, live, "Seer")
+            event_hub.publish(game_id, "night_action", {"role": "Seer"})
+            event_hub.publish(game_id, "night_result", {
+                "role": "Seer",
+                "card_indices": sorted(card_indices),
+                "viewed_roles": viewed_roles,
+            }, to_player_id=player_id)
+
+            night_service.announce_role_complete(db, game_id, "Seer", completed_step)
+
+            return {"roles": viewed_roles}
+
+        else:
+            raise ValueError(f"Invalid action_type: {action_type}. Must be 'view_player' or 'view_center'")
@@ -0,0 +1,64 @@
+"""
+Consistent hashing of game sets to backend shards, so every request for a game lands on one process.
+
+A game set and all its games share a shard, keyed by game_set_id. In router mode
+(shard_router.py) the router proxies each request to the owning shard, and each shard,
+started with SHARD_INDEX and SHARD_COUNT, runs the timed transitions of its own games only.
+"""
+import bisect
+import hashlib
+import os
+
+# Points per shard on the ring; more points spread game sets more evenly
+VIRTUAL_NODES = 64
+
+# This process's shard; the defaults (one shard) own every game
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "1"))
+SHARD_INDEX = int(os.getenv("SHARD_INDEX", "0"))
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Shards 0..count-1, each placed VIRTUAL_NODES times on a 64-bit ring; a key belongs
+    to the first point at or after its hash. Going from N to N+1 shards moves about
+    1/(N+1) of the keys, all of them to the new shard.
+    """
+
+    def __init__(self, count: int, virtual_nodes: int = VIRTUAL_NODES):
+        if count < 1:
+            raise ValueError("Need at least one shard")
+        points = sorted(
+            (_hash(f"shard-{shard}#{point}"), shard)
+            for shard in range(count)
+            for point in range(virtual_nodes)
+        )
+        self.count = count
+        self._hashes = [h for h, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> int:
+        return self._shards[bisect.bisect(self._hashes, _hash(key)) % len(self._shards)]
+
+    def preference(self, key: str) -> list[int]:
+        """Every shard, in the order the key's requests try them: the owner, then the ones it fails over to."""
+        start = bisect.bisect(self._hashes, _hash(key))
+        order: list[int] = []
+        for offset in range(len(self._shards)):
+            shard = self._shards[(start + offset) % len(self._shards)]
+            if shard not in order:
+                order.append(shard)
+                if len(order) == self.count:
+                    break
+        return order
+
+
+ring = HashRing(SHARD_COUNT)
+
+
+def owns(game_set_id: str) -> bool:
+    """Whether this process's shard owns the game set (always, when not sharded)."""
+    return SHARD_COUNT == 1 or ring.shard_for(game_set_id) == SHARD_INDEX
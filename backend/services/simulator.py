@@ -0,0 +1,252 @@
+"""
+Monte Carlo simulation of whole games (deal, night, vote, result) over NumPy arrays, to
+compare role setups by win rate without the database.
+
+Each batch holds one row per game: the role card (as a small integer) in every seat,
+players first and then the three center cards. The night's card moves and the day's
+deaths and winner follow services.rules, which the tests check game by game.
+
+Needs NumPy (the "simulation" extra); the app itself never imports this module.
+"""
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+from models import roles
+from models.roles import Role
+from services import rules
+
+# Games played per batch of arrays; bounds memory (a few hundred bytes per game)
+BATCH_SIZE = 100_000
+
+# Role cards as integers: the card's index in ROLE_CODES
+ROLE_CODES = tuple(Role)
+_CODE = {role: code for code, role in enumerate(ROLE_CODES)}
+WEREWOLF, MINION, TANNER, HUNTER = (_CODE[r] for r in (Role.WEREWOLF, Role.MINION, Role.TANNER, Role.HUNTER))
+
+# Winning teams as integers: the team's index in TEAMS
+TEAMS = (rules.VILLAGE, rules.WEREWOLF, rules.TANNER, rules.MINION)
+VILLAGE_WINS, WEREWOLF_WINS, TANNER_WINS, MINION_WINS = range(len(TEAMS))
+# Team of each role card (by code), as a TEAMS index
+_TEAM_OF = np.array([TEAMS.index(roles.team_for(role)) for role in ROLE_CODES], dtype=np.int8)
+
+
+@dataclass(slots=True)
+class Night:
+    """A batch of played nights; card arrays are (games, players + 3) role codes."""
+    num_players: int
+    initial: np.ndarray  # As dealt
+    final: np.ndarray  # After the night's swaps
+
+
+# A voting policy: (rng, night) -> (games, players) array of the seat each player votes for
+Policy = Callable[[np.random.Generator, Night], np.ndarray]
+
+
+def random_votes(rng: np.random.Generator, night: Night) -> np.ndarray:
+    """Every player votes for one of the other players, uniformly at random."""
+    num_players = night.num_players
+    votes = rng.integers(0, num_players - 1, size=(night.initial.shape[0], num_players))
+    return votes + (votes >= np.arange(num_players))  # Skip over the voter's own seat
+
+
+POLICIES: dict[str, Policy] = {"random": random_votes}
+
+
+@dataclass(slots=True)
+class Games:
+    """A batch of played games: the night, the votes, who died, who won."""
+    night: Night
+    votes: np.ndarray  # (games, players) seat voted for
+    died: np.ndarray  # (games, players) bool
+    winning_team: np.ndarray  # (games,) TEAMS index
+    won: np.ndarray  # (games, players) bool
+
+
+@dataclass(slots=True)
+class SimulationResult:
+    """Totals over all simulated games of one setup."""
+    selected_roles: list[str]
+    games: int
+    team_wins: dict[str, int]  # Games won, by team
+    role_games: dict[str, int]  # Player seats dealt each role
+    role_wins: dict[str, int]  # Of those seats, how many won
+
+    @property
+    def win_rates(self) -> dict[str, float]:
+        return {team: wins / self.games for team, wins in self.team_wins.items()}
+
+    @property
+    def role_win_rates(self) -> dict[str, float]:
+        return {role: self.role_wins[role] / dealt for role, dealt in self.role_games.items() if dealt}
+
+
+def simulate(
+    selected_roles: list[str],
+    n_games: int,
+    policy: str | Policy = "random",
+    seed: int | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> SimulationResult:
+    """
+    Play n_games random games of a role setup and count wins by team and by dealt role.
+
+    Night actions are random: the Robber robs, and the Troublemaker swaps, random other
+    players; the Drunk takes a random center card. Votes come from the policy.
+
+    Args:
+        selected_roles: The game set's roles (players + 3)
+        n_games: Games to play
+        policy: A name from POLICIES, or a Policy callable
+        seed: Seed for reproducible runs
+        batch_size: Games played per batch of arrays
+
+    Returns:
+        SimulationResult with win counts (and win_rates) by team and by role
+
+    Raises:
+        ValueError: If the setup, game count or policy is invalid
+    """
+    if isinstance(policy, str):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; choose from {sorted(POLICIES)}")
+        policy = POLICIES[policy]
+    if n_games < 1:
+        raise ValueError("n_games must be at least 1")
+
+    rng = np.random.default_rng(seed)
+    team_wins = np.zeros(len(TEAMS), dtype=np.int64)
+    role_games = np.zeros(len(ROLE_CODES), dtype=np.int64)
+    role_wins = np.zeros(len(ROLE_CODES), dtype=np.int64)
+    for start in range(0, n_games, batch_size):
+        games = play(rng, selected_roles, min(batch_size, n_games - start), policy)
+        dealt = games.night.initial[:, :games.night.num_players]
+        team_wins += np.bincount(games.winning_team, minlength=len(TEAMS))
+        role_games += np.bincount(dealt.ravel(), minlength=len(ROLE_CODES))
+        role_wins += np.bincount(dealt[games.won], minlength=len(ROLE_CODES))
+
+    in_setup = {Role(role) for role in selected_roles}
+    return SimulationResult(
+        selected_roles=list(selected_roles),
+        games=n_games,
+        team_wins={team: int(wins) for team, wins in zip(TEAMS, team_wins)},
+        role_games={role.value: int(role_games[_CODE[role]]) for role in ROLE_CODES if role in in_setup},
+        role_wins={role.value: int(role_wins[_CODE[role]]) for role in ROLE_CODES if role in in_setup},
+    )
+
+
+def play(rng: np.random.Generator, selected_roles: list[str], n_games: int, policy: Policy = random_votes) -> Games:
+    """Deal, play the night, vote and score one batch of n_games games."""
+    num_players = len(selected_roles) - rules.CENTER_CARDS
+    if not 3 <= num_players <= 10:
+        raise ValueError(f"Need 6 to 13 roles (3 to 10 players plus 3 center cards), got {len(selected_roles)}")
+    invalid = [role for role in selected_roles if role not in roles.VALID_ROLES]
+    if invalid:
+        raise ValueError(f"Invalid roles: {invalid}")
+
+    deck = np.array([_CODE[Role(role)] for role in selected_roles], dtype=np.int8)
+    initial = rng.permuted(np.tile(deck, (n_games, 1)), axis=1)
+    night = Night(num_players, initial, _play_night(rng, deck, initial, num_players))
+
+    votes = policy(rng, night)
+    died = _deaths(night.final[:, :num_players], votes)
+    winning_team = _winning_team(night.final[:, :num_players], died)
+    won = _won(initial[:, :num_players], night.final[:, :num_players], winning_team)
+    return Games(night, votes, died, winning_team, won)
+
+
+def _holders(initial: np.ndarray, num_players: int, role: Role, copies: int):
+    """(games, seats) of the players dealt `role`: first copy in every game, then the second, ..."""
+    dealt = initial[:, :num_players] == _CODE[role]
+    if copies == 1:
+        yield np.nonzero(dealt)
+        return
+    copy_number = np.cumsum(dealt, axis=1, dtype=np.int8) * dealt
+    for copy in range(1, copies + 1):
+        yield np.nonzero(copy_number == copy)
+
+
+def _other_player(rng: np.random.Generator, seats: np.ndarray, num_players: int) -> np.ndarray:
+    picks = rng.integers(0, num_players - 1, size=len(seats))
+    return picks + (picks >= seats)
+
+
+def _swap(cards: np.ndarray, games: np.ndarray, seats_a: np.ndarray, seats_b: np.ndarray) -> None:
+    cards[games, seats_a], cards[games, seats_b] = cards[games, seats_b], cards[games, seats_a]
+
+
+def _rob(rng, cards, games, seats, num_players):
+    _swap(cards, games, seats, _other_player(rng, seats, num_players))
+
+
+def _troublemake(rng, cards, games, seats, num_players):
+    first = _other_player(rng, seats, num_players)
+    # Second pick skips over both the Troublemaker and the first pick
+    second = rng.integers(0, num_players - 2, size=len(seats))
+    low, high = np.minimum(seats, first), np.maximum(seats, first)
+    second += second >= low
+    second += second >= high
+    _swap(cards, games, first, second)
+
+
+def _drink(rng, cards, games, seats, num_players):
+    _swap(cards, games, seats, num_players + rng.integers(0, rules.CENTER_CARDS, size=len(seats)))
+
+
+# Night actions that move cards (the others only look), as in rules.rob / troublemake / drink
+_CARD_MOVES = {Role.ROBBER: _rob, Role.TROUBLEMAKER: _troublemake, Role.DRUNK: _drink}
+
+
+def _play_night(rng: np.random.Generator, deck: np.ndarray, initial: np.ndarray, num_players: int) -> np.ndarray:
+    cards = initial.copy()
+    for role in map(Role, roles.WAKE_ORDER):
+        move = _CARD_MOVES.get(role)
+        copies = int(np.count_nonzero(deck == _CODE[role]))
+        if move is None or not copies:
+            continue
+        for games, seats in _holders(initial, num_players, role, copies):
+            move(rng, cards, games, seats, num_players)
+    return cards
+
+
+def _deaths(final: np.ndarray, votes: np.ndarray) -> np.ndarray:
+    """rules.resolve_deaths over a batch: most votes (more than one) die, then the Hunter's chain."""
+    n_games, num_players = votes.shape
+    flat = (votes + np.arange(n_games)[:, None] * num_players).ravel()
+    counts = np.bincount(flat, minlength=n_games * num_players).reshape(n_games, num_players)
+    top = counts.max(axis=1, keepdims=True)
+    died = (counts == top) & (top > 1)
+
+    is_hunter = final == HUNTER
+    for _ in range(num_players):
+        games, hunters = np.nonzero(died & is_hunter)
+        grown = died.copy()
+        grown[games, votes[games, hunters]] = True
+        if np.array_equal(grown, died):
+            break
+        died = grown
+    return died
+
+
+def _winning_team(final: np.ndarray, died: np.ndarray) -> np.ndarray:
+    """rules.winning_team over a batch."""
+    werewolf = final == WEREWOLF
+    minion = final == MINION
+    tanner_died = (died & (final == TANNER)).any(axis=1)
+    werewolf_died = (died & werewolf).any(axis=1)
+    minion_wins = ~werewolf.any(axis=1) & minion.any(axis=1) & (died & ~minion).any(axis=1)
+    return np.select(
+        [tanner_died, werewolf_died, minion_wins],
+        [TANNER_WINS, VILLAGE_WINS, MINION_WINS],
+        default=WEREWOLF_WINS,
+    ).astype(np.int8)
+
+
+def _won(initial: np.ndarray, final: np.ndarray, winning_team: np.ndarray) -> np.ndarray:
+    """rules.player_won over a batch (team is the dealt card's team, as on PlayerRole.team)."""
+    team = _TEAM_OF[initial]
+    winner = winning_team[:, None]
+    return np.select(
+        [winner == TANNER_WINS, winner == VILLAGE_WINS, winner == WEREWOLF_WINS, winner == MINION_WINS],
+        [final == TANNER, team == VILLAGE_WINS, (team == WEREWOLF_WINS) | (final == MINION), final == MINION],
+        default=False,
+    )
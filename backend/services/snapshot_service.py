@@ -0,0 +1,120 @@
+"""Service for building a player's complete game view in a single request."""
+from sqlalchemy.orm import Session, joinedload
+from models.game import Game, GameState
+from models.game_set import GameSet
+from models.player_role import PlayerRole
+from models import roles
+from services import (
+    night_service,
+    action_service,
+    discussion_service,
+    voting_service,
+    # Role services register their night handlers with the role registry on import
+    werewolf_service,  # noqa: F401
+    minion_service,  # noqa: F401
+    mason_service,  # noqa: F401
+    insomniac_service,  # noqa: F401
+)
+
+
+def get_player_snapshot(db: Session, game_id: str, player_id: str) -> dict:
+    """
+    Build everything the game screen polls for, from one player's perspective.
+
+    Combines GET game, night-status, available-actions, actions, night-info,
+    discussion-status, votes and the game set's player list so clients can make
+    one request per tick instead of eight.
+
+    Args:
+        db: Database session
+        game_id: ID of the game
+        player_id: ID of the player whose view is built
+
+    Returns:
+        Dictionary with keys game, player_role, players, night_status,
+        available_actions, actions, night_info, discussion_status and votes.
+        night_info is None unless it is this player's info step;
+        discussion_status is None during NIGHT.
+
+    Raises:
+        ValueError: If game not found or player not in game
+    """
+    game = db.query(Game).filter(Game.game_id == game_id).first()
+    if not game:
+        raise ValueError(f"Game {game_id} not found")
+
+    player_roles = db.query(PlayerRole).options(joinedload(PlayerRole.player)).filter(
+        PlayerRole.game_id == game_id
+    ).all()
+    player_role = next((pr for pr in player_roles if pr.player_id == player_id), None)
+    if not player_role:
+        raise ValueError(f"Player {player_id} not found in game {game_id}")
+
+    game_out = game.to_dict()
+    game_out["all_players_acknowledged_roles"] = (
+        len(player_roles) > 0 and all(getattr(pr, "role_revealed", False) for pr in player_roles)
+    )
+
+    game_set = db.query(GameSet).options(joinedload(GameSet.players)).filter(
+        GameSet.game_set_id == game.game_set_id
+    ).first()
+    players = game_set.players if game_set else []
+
+    discussion_status = None
+    if game.state != GameState.NIGHT:
+        discussion_status = discussion_service.get_discussion_status(db, game_id, player_id)
+
+    return {
+        "game": game_out,
+        "player_role": player_role.to_dict(),
+        "players": {
+            "players": [player.to_dict() for player in players],
+            "current_count": len(players),
+            "required_count": game_set.num_players if game_set else 0,
+        },
+        "night_status": night_service.get_night_status(db, game_id),
+        "available_actions": action_service.get_available_actions(db, game_id, player_id),
+        "actions": action_service.get_player_actions(db, game_id, player_id)["actions"],
+        "night_info": get_night_info_or_none(db, game, player_role),
+        "discussion_status": discussion_status,
+        "votes": voting_service.get_votes(db, game_id),
+    }
+
+
+def get_night_info_or_none(db: Session, game: Game, player_role: PlayerRole) -> dict | None:
+    """Night info when it is this player's (initial) role step, else None."""
+    step = game.current_role_step
+    if game.state != GameState.NIGHT or not step or step != player_role.initial_role:
+        return None
+    descriptor = roles.get(step)
+    if descriptor is None or descriptor.night_info is None:
+        return None
+    try:
+        return descriptor.night_info(db, game.game_id, player_role.player_id)
+    except ValueError:
+        return None
+
+
+def get_turn_view(db: Session, game_id: str, player_id: str) -> dict:
+    """
+    The role-specific part of a player's view: available actions and night info.
+
+    Pushed over the player's WebSocket when their role step starts, in place of
+    polling GET available-actions and night-info.
+
+    Raises:
+        ValueError: If game not found or player not in game
+    """
+    game = db.query(Game).filter(Game.game_id == game_id).first()
+    if not game:
+        raise ValueError(f"Game {game_id} not found")
+    player_role = db.query(PlayerRole).filter(
+        PlayerRole.game_id == game_id,
+        PlayerRole.player_id == player_id
+    ).first()
+    if not player_role:
+        raise ValueError(f"Player {player_id} not found in game {game_id}")
+    return {
+        "available_actions": action_service.get_available_actions(db, game_id, player_id),
+        "night_info": get_night_info_or_none(db, game, player_role),
+    }
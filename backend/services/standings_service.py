@@ -0,0 +1,213 @@
+"""Service for game set standings: each player's cumulative results over the set's finished games."""
+from sqlalchemy import and_, case, exists, func, select
+from sqlalchemy.orm import Session
+from db.database import lock_for_write
+from models.game import Game, GameState
+from models.game_result import GameResult
+from models.game_set import GameSet
+from models.game_set_standing import GameSetStanding
+from models.player import Player, game_set_players
+from models.player_role import PlayerRole
+from models.vote import Vote
+from services import results_service
+from services.game_locks import locks
+
+
+def get_standings(db: Session, game_set_id: str) -> dict:
+    """
+    Get the game set's standings, ranked by wins (ties share a rank).
+
+    Reads the game_set_standings rows kept up to date by record_game, so the cost does
+    not grow with the number of games. A set whose games all finished before standings
+    were kept is built (and committed) on first read. Games count once their results
+    are recorded (when the last vote is cast).
+
+    Raises:
+        ValueError: If game set not found
+    """
+    if db.get(GameSet, game_set_id) is None:
+        raise ValueError(f"Game set {game_set_id} not found")
+
+    rows = _read_standings(db, game_set_id)
+    if all(row.games_played is None for row in rows) and _has_finished_games(db, game_set_id):
+        _build_legacy_standings(db, game_set_id)
+        rows = _read_standings(db, game_set_id)
+
+    standings = sorted(
+        (
+            {
+                "player_id": row.player_id,
+                "player_name": row.player_name,
+                "games_played": row.games_played or 0,
+                "wins": row.wins or 0,
+                "deaths": row.deaths or 0,
+                "votes_received": row.votes_received or 0,
+            }
+            for row in rows
+        ),
+        key=lambda s: (-s["wins"], s["deaths"], s["player_name"]),
+    )
+    for position, standing in enumerate(standings):
+        tied = position and standing["wins"] == standings[position - 1]["wins"]
+        standing["rank"] = standings[position - 1]["rank"] if tied else position + 1
+
+    return {
+        "game_set_id": game_set_id,
+        "games_played": max((s["games_played"] for s in standings), default=0),
+        "standings": standings,
+    }
+
+
+def record_game(db: Session, game_set_id: str, results: dict) -> None:
+    """
+    Add a finished game's results to its set's standings.
+
+    Called by results_service.record_results in the transaction that moves the game to
+    RESULTS; the caller commits. The set's first recorded game builds the standings with
+    rebuild_standings, which also counts any games finished before standings were kept.
+    The set's row stays locked until the commit, so a first standings read cannot
+    build them at the same time.
+    """
+    db.query(GameSet).filter(GameSet.game_set_id == game_set_id).with_for_update().first()
+    standings = {
+        standing.player_id: standing
+        for standing in db.query(GameSetStanding).filter(GameSetStanding.game_set_id == game_set_id)
+    }
+    if not standings:
+        rebuild_standings(db, game_set_id)
+        return
+
+    for player in results["players"]:
+        standing = standings.get(player["player_id"])
+        if standing is None:
+            standing = GameSetStanding(
+                game_set_id=game_set_id, player_id=player["player_id"],
+                games_played=0, wins=0, deaths=0, votes_received=0,
+            )
+            db.add(standing)
+        standing.games_played += 1
+        standing.wins += int(player["won"])
+        standing.deaths += int(player["died"])
+        standing.votes_received += results["vote_summary"].get(player["player_id"], 0)
+
+
+def rebuild_standings(db: Session, game_set_id: str) -> None:
+    """Recompute a set's standings from its recorded games with one aggregate query (not committed)."""
+    _backfill_won(db, game_set_id)
+    totals = db.execute(_aggregate_standings(game_set_id)).all()
+    db.query(GameSetStanding).filter(GameSetStanding.game_set_id == game_set_id).delete(synchronize_session=False)
+    db.add_all(
+        GameSetStanding(
+            game_set_id=game_set_id,
+            player_id=row.player_id,
+            games_played=row.games_played,
+            wins=row.wins,
+            deaths=row.deaths,
+            votes_received=row.votes_received,
+        )
+        for row in totals
+    )
+
+
+def _aggregate_standings(game_set_id: str):
+    """Per-player totals over the set's games with recorded results, from player_roles and votes."""
+    recorded_games = (
+        select(GameResult.game_id)
+        .join(Game, Game.game_id == GameResult.game_id)
+        .where(Game.game_set_id == game_set_id)
+    )
+    votes_received = (
+        select(Vote.game_id, Vote.target_player_id.label("player_id"), func.count().label("votes"))
+        .where(Vote.game_id.in_(recorded_games))
+        .group_by(Vote.game_id, Vote.target_player_id)
+        .subquery()
+    )
+    return (
+        select(
+            PlayerRole.player_id,
+            func.count().label("games_played"),
+            func.sum(case((PlayerRole.won.is_(True), 1), else_=0)).label("wins"),
+            func.sum(case((PlayerRole.was_killed.is_(True), 1), else_=0)).label("deaths"),
+            func.coalesce(func.sum(votes_received.c.votes), 0).label("votes_received"),
+        )
+        .outerjoin(votes_received, and_(
+            votes_received.c.game_id == PlayerRole.game_id,
+            votes_received.c.player_id == PlayerRole.player_id,
+        ))
+        .where(PlayerRole.game_id.in_(recorded_games))
+        .group_by(PlayerRole.player_id)
+    )
+
+
+def _build_legacy_standings(db: Session, game_set_id: str) -> None:
+    """
+    Build the standings of a set whose games finished before standings were kept, once.
+
+    Games that reached RESULTS before their results were recorded are recorded first;
+    the first of them builds the standings and the rest add to them. If the set still
+    has none, they are rebuilt from its recorded games under the set's lock and row
+    lock, re-checked so concurrent first reads build them once. Commits.
+    """
+    unrecorded = db.scalars(select(Game.game_id).where(
+        Game.game_set_id == game_set_id,
+        Game.state == GameState.RESULTS,
+        ~exists().where(GameResult.game_id == Game.game_id),
+    )).all()
+    for game_id in unrecorded:
+        results_service.record_missing_results(db, game_id)
+
+    with locks.hold(game_set_id, "standings_service.build_legacy_standings"):
+        lock_for_write(db)
+        db.query(GameSet).filter(GameSet.game_set_id == game_set_id).with_for_update().first()
+        built = db.scalar(select(exists().where(GameSetStanding.game_set_id == game_set_id)))
+        if built or not _has_recorded_games(db, game_set_id):
+            db.rollback()
+            return
+        rebuild_standings(db, game_set_id)
+        db.commit()
+
+
+def _backfill_won(db: Session, game_set_id: str) -> None:
+    """Set player_roles.won from the recorded results of games finished before it was kept."""
+    legacy = (
+        db.query(PlayerRole, GameResult.results)
+        .join(Game, Game.game_id == PlayerRole.game_id)
+        .join(GameResult, GameResult.game_id == PlayerRole.game_id)
+        .filter(Game.game_set_id == game_set_id, PlayerRole.won.is_(None))
+    )
+    for player_role, results in legacy:
+        player_role.won = any(p["player_id"] == player_role.player_id and p["won"] for p in results["players"])
+
+
+def _read_standings(db: Session, game_set_id: str) -> list:
+    """Every player in the set with their standing (standing columns None if they have none yet)."""
+    return db.execute(
+        select(
+            Player.player_id,
+            Player.player_name,
+            GameSetStanding.games_played,
+            GameSetStanding.wins,
+            GameSetStanding.deaths,
+            GameSetStanding.votes_received,
+        )
+        .select_from(game_set_players)
+        .join(Player, Player.player_id == game_set_players.c.player_id)
+        .outerjoin(GameSetStanding, and_(
+            GameSetStanding.game_set_id == game_set_players.c.game_set_id,
+            GameSetStanding.player_id == game_set_players.c.player_id,
+        ))
+        .where(game_set_players.c.game_set_id == game_set_id)
+    ).all()
+
+
+def _has_recorded_games(db: Session, game_set_id: str) -> bool:
+    return db.scalar(select(exists().where(
+        GameResult.game_id == Game.game_id, Game.game_set_id == game_set_id,
+    )))
+
+
+def _has_finished_games(db: Session, game_set_id: str) -> bool:
+    """Whether any of the set's games reached RESULTS, recorded or not."""
+    return db.scalar(select(exists().where(
+        Game.game_set_id == game_set_id, Game.state == GameState.RESULTS,
+    )))
@@ -0,0 +1,61 @@
+"""Service for timed phase transitions (simulated center-card roles, discussion timer)."""
+from datetime import datetime
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from models.game import Game, GameState
+from services import night_service, discussion_service, sharding
+from services.game_locks import serialized
+
+
+def get_next_deadline(db: Session, game: Game) -> datetime | None:
+    """When the game's next timed transition is due, or None if nothing is pending."""
+    if game.state == GameState.NIGHT:
+        return night_service.get_simulated_role_deadline(game)
+    if game.state == GameState.DAY_DISCUSSION:
+        return discussion_service.get_discussion_deadline(db, game)
+    return None
+
+
+@serialized
+def run_due_transition(db: Session, game_id: str) -> datetime | None:
+    """
+    Fire whatever timed transition is due for the game. Called by the phase scheduler.
+
+    Returns:
+        The game's next deadline after the transition (e.g. the next simulated
+        role, or the discussion timer once night ends), or None
+    """
+    game = db.query(Game).filter(Game.game_id == game_id).first()
+    if not game:
+        return None
+    if game.state == GameState.NIGHT:
+        night_service.check_and_advance_simulated_role(db, game_id)
+    elif game.state == GameState.DAY_DISCUSSION:
+        discussion_service.check_discussion_timer_and_maybe_transition(db, game_id)
+    db.refresh(game)
+    return get_next_deadline(db, game)
+
+
+def load_pending_deadlines(db: Session) -> dict[str, datetime]:
+    """
+    Deadlines of every game waiting on a timed transition, for rebuilding the scheduler on startup.
+
+    When sharded, only the games this shard owns: a restarted shard takes its games'
+    timers back from the games table, and no two shards fire the same transition.
+    """
+    games = db.query(Game).filter(or_(
+        Game.simulated_role_started_at.isnot(None),
+        Game.state == GameState.DAY_DISCUSSION,
+    )).filter(Game.state.in_([GameState.NIGHT, GameState.DAY_DISCUSSION])).all()
+
+    pending = {}
+    for game in games:
+        if not sharding.owns(game.game_set_id):
+            continue
+        deadline = get_next_deadline(db, game)
+        if deadline is None and game.state == GameState.DAY_DISCUSSION:
+            # Discussion clock never started (older games): fire now so it starts
+            deadline = datetime.utcnow()
+        if deadline is not None:
+            pending[game.game_id] = deadline
+    return pending
@@ -1,11 +1,12 @@
 """Service for Troublemaker night actions: swap two other players' cards (no looking)."""
 from sqlalchemy.orm import Session
-from models.game import Game, GameState
-from models.player_role import PlayerRole
-from models.action import Action, ActionType
-from services import night_service
+from models.game import GameState
+from models.action import ActionType
+from services import night_service, event_hub, game_engine, rules
+from services.game_locks import serialized
 
 
+@serialized
 def perform_troublemaker_action(
     db: Session,
     game_id: str,
@@ -26,76 +27,48 @@ def perform_troublemaker_action(
     Returns:
         {"message": "You swapped [name1] and [name2]."}
     """
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
-
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
-
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-
-    if game.current_role_step != "Troublemaker":
-        raise ValueError("Troublemaker role is not currently active")
-
-    troublemaker_role = _get_player_role(db, game_id, player_id)
-    if troublemaker_role.initial_role != "Troublemaker":
-        raise ValueError("Player is not the Troublemaker (only original Troublemaker acts)")
-
-    if troublemaker_role.night_action_completed:
-        raise ValueError("Troublemaker has already performed their action")
-
-    if player1_id == player2_id:
-        raise ValueError("Must choose two different players")
-    if player1_id == player_id or player2_id == player_id:
-        raise ValueError("Troublemaker cannot swap their own card; choose two other players")
-
-    p1_role = _get_player_role(db, game_id, player1_id)
-    p2_role = _get_player_role(db, game_id, player2_id)
-
-    # Swap only current_role (cards). Completion stays with the player so only original role-holders act later.
-    r1, r2 = p1_role.current_role, p2_role.current_role
-    p1_role.current_role = r2
-    p2_role.current_role = r1
-
-    action = Action(
-        game_id=game_id,
-        player_id=player_id,
-        action_type=ActionType.SWAP_TWO_PLAYERS,
-        source_id=player1_id,
-        target_id=player2_id,
-        source_role=r1,
-        target_role=r2
-    )
-    db.add(action)
-
-    troublemaker_role.night_action_completed = True
-    db.commit()
-
-    _complete_troublemaker_role_if_ready(db, game_id)
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
+
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
+
+        if live.current_role_step != "Troublemaker":
+            raise ValueError("Troublemaker role is not currently active")
+
+        troublemaker_seat = live.seat_of(player_id)
+        if live.initial_roles[troublemaker_seat] != "Troublemaker":
+            raise ValueError("Player is not the Troublemaker (only original Troublemaker acts)")
+
+        if live.completed[troublemaker_seat]:
+            raise ValueError("Troublemaker has already performed their action")
+
+        seat1 = live.seat_of(player1_id)
+        seat2 = live.seat_of(player2_id)
+
+        # Swap only current_role (cards). Completion stays with the player so only original role-holders act later.
+        r1, r2 = live.current_roles[seat1], live.current_roles[seat2]
+        rules.troublemake(live, troublemaker_seat, seat1, seat2)
+
+        live.record_action(
+            troublemaker_seat,
+            ActionType.SWAP_TWO_PLAYERS,
+            source_id=player1_id,
+            target_id=player2_id,
+            source_role=r1,
+            target_role=r2
+        )
+
+        live.complete(troublemaker_seat)
+        completed_step = night_service.commit_role_action(db, live, "Troublemaker")
+        event_hub.publish(game_id, "night_action", {"role": "Troublemaker"})
+        event_hub.publish(game_id, "night_result", {
+            "role": "Troublemaker",
+            "player1_id": player1_id,
+            "player2_id": player2_id,
+        }, to_player_id=player_id)
+
+        night_service.announce_role_complete(db, game_id, "Troublemaker", completed_step)
 
     return {"message": f"You swapped the cards of the two players."}
-
-
-def _get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
-    pr = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.player_id == player_id
-    ).first()
-    if not pr:
-        raise ValueError(f"Player {player_id} not found in game {game_id}")
-    return pr
-
-
-def _complete_troublemaker_role_if_ready(db: Session, game_id: str) -> None:
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game or game.current_role_step != "Troublemaker":
-        return
-    roles = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.initial_role == "Troublemaker"
-    ).all()
-    if roles and all(r.night_action_completed for r in roles):
-        night_service.mark_role_complete(db, game_id, "Troublemaker")
@@ -0,0 +1,29 @@
+"""Per-game version counter: bumped by every state change, served as the ETag of game reads."""
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from models.game import Game
+
+
+def bump_version(db: Session, game_id: str) -> None:
+    """Increment the game's version in the current transaction (the caller commits)."""
+    db.execute(update(Game).where(Game.game_id == game_id).values(version=Game.version + 1))
+
+
+def get_version(db: Session, game_id: str) -> int | None:
+    """The game's current version, or None if the game does not exist."""
+    row = db.query(Game.version).filter(Game.game_id == game_id).first()
+    if row is None:
+        return None
+    return row.version or 0
+
+
+def make_etag(version: int) -> str:
+    return f'"v{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if an If-None-Match header value matches the ETag (weak comparison, lists and *)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,97 @@
+"""Long-poll support: wait on a per-game asyncio.Condition until the game's version changes."""
+import asyncio
+import threading
+from typing import Awaitable, Callable
+from services import event_bus
+
+# Upper bound for ?timeout= on long-poll requests
+LONG_POLL_MAX_SECONDS = 60
+
+
+class VersionWatcher:
+    """
+    Per-game asyncio conditions, created while someone is waiting on the game.
+
+    notify() may be called from any thread (services commit in the
+    threadpool); waiters are woken on their own event loop.
+    """
+
+    def __init__(self):
+        # game_id -> {loop: [condition, waiter count]}
+        self._conditions: dict[str, dict[asyncio.AbstractEventLoop, list]] = {}
+        self._lock = threading.Lock()
+
+    def waiter_count(self, game_id: str) -> int:
+        with self._lock:
+            return sum(count for _, count in self._conditions.get(game_id, {}).values())
+
+    async def wait(self, game_id: str, changed: Callable[[], Awaitable[bool]], timeout: float) -> bool:
+        """
+        Wait until changed() is true, re-checking each time the game is notified.
+
+        Returns:
+            True if changed() became true, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        condition = self._acquire(game_id, loop)
+        deadline = loop.time() + timeout
+        try:
+            # changed() runs under the condition's lock, so a notify between the
+            # check and wait() is not lost
+            async with condition:
+                while not await changed():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        return False
+                    try:
+                        await asyncio.wait_for(condition.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        return await changed()
+                return True
+        finally:
+            self._release(game_id, loop)
+
+    def notify(self, game_id: str) -> None:
+        """Wake everyone waiting on the game (call after the change is committed)."""
+        with self._lock:
+            entries = [(loop, entry[0]) for loop, entry in self._conditions.get(game_id, {}).items()]
+        for loop, condition in entries:
+            try:
+                loop.call_soon_threadsafe(asyncio.ensure_future, _notify_all(condition))
+            except RuntimeError:
+                pass  # Loop closed; its waiters are gone
+
+    def _acquire(self, game_id: str, loop: asyncio.AbstractEventLoop) -> asyncio.Condition:
+        with self._lock:
+            entry = self._conditions.setdefault(game_id, {}).setdefault(loop, [asyncio.Condition(), 0])
+            entry[1] += 1
+            return entry[0]
+
+    def _release(self, game_id: str, loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            per_loop = self._conditions.get(game_id, {})
+            entry = per_loop.get(loop)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del per_loop[loop]
+                if not per_loop:
+                    del self._conditions[game_id]
+
+
+async def _notify_all(condition: asyncio.Condition) -> None:
+    async with condition:
+        condition.notify_all()
+
+
+watcher = VersionWatcher()
+
+
+def notify(game_id: str) -> None:
+    """Wake long-poll requests waiting on the game, in this process and (through the event bus) every other."""
+    watcher.notify(game_id)
+    event_bus.forward("version", game_id=game_id)
+
+
+event_bus.on("version", lambda message: watcher.notify(message["game_id"]))
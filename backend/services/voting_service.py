@@ -1,13 +1,23 @@
 """Service for day voting phase."""
 from sqlalchemy.orm import Session
+from db.database import lock_for_write
 from models.game import Game, GameState
 from models.player_role import PlayerRole
 from models.vote import Vote
+from services import event_hub, results_service, version_service, version_watch
+from services.game_locks import serialized
 
 
+@serialized
 def cast_vote(db: Session, game_id: str, voter_player_id: str, target_player_id: str) -> dict:
-    """Record a vote. Transition game to RESULTS when all players have voted."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
+    """
+    Record a vote. Transition game to RESULTS when all players have voted.
+
+    The vote and the transition commit together, with the game row locked, so
+    of two last votes cast at once (from any process) exactly one ends the game.
+    """
+    lock_for_write(db)
+    game = db.query(Game).filter(Game.game_id == game_id).with_for_update().first()
     if not game:
         raise ValueError(f"Game {game_id} not found")
     if game.state != GameState.DAY_VOTING:
@@ -35,15 +45,24 @@ def cast_vote(db: Session, game_id: str, voter_player_id: str, target_player_id:
         target_player_id=target_player_id,
     )
     db.add(vote)
-    db.commit()
-    db.refresh(vote)
+    db.flush()
 
     # Check if all players have voted
     vote_count = db.query(Vote).filter(Vote.game_id == game_id).count()
     if vote_count >= len(player_roles):
         game.state = GameState.RESULTS
-        db.commit()
-        db.refresh(game)
+        # Results are final once everyone has voted: compute them once, with the transition
+        results_service.record_results(db, game_id)
+    version_service.bump_version(db, game_id)
+    db.commit()
+    db.refresh(game)
+
+    event_hub.publish(game_id, "vote_cast", {
+        "votes_cast": vote_count,
+        "total_players": len(player_roles),
+        "state": game.state.value,
+    })
+    version_watch.notify(game_id)
 
     return {"status": "vote_recorded"}
 
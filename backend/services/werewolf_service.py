@@ -1,12 +1,12 @@
 """Service for Werewolf night actions."""
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from models.game import Game, GameState
 from models.player_role import PlayerRole
-from models.center_card import CenterCard
-from models.action import Action, ActionType
-from services import night_service
-
-CENTER_POSITIONS = ["left", "center", "right"]
+from models.action import ActionType
+from models import roles
+from models.roles import Role
+from services import night_service, event_hub, game_engine
+from services.game_locks import serialized
 
 
 def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
@@ -18,10 +18,6 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
     if game.state != GameState.NIGHT:
         raise ValueError(f"Game {game_id} is not in NIGHT state")
 
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-
     player_role = _get_player_role(db, game_id, player_id)
     info = {"role": player_role.current_role}
 
@@ -48,106 +44,98 @@ def get_night_info(db: Session, game_id: str, player_id: str) -> dict:
     return info
 
 
+@serialized
 def view_center_card(db: Session, game_id: str, player_id: str, card_index: int) -> dict:
     """Allow a lone werewolf to view a center card."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
 
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
 
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
+        if live.current_role_step != "Werewolf":
+            raise ValueError("Werewolf role is not currently active")
 
-    if game.current_role_step != "Werewolf":
-        raise ValueError("Werewolf role is not currently active")
+        werewolf_seat = live.seat_of(player_id)
+        if live.initial_roles[werewolf_seat] != "Werewolf":
+            raise ValueError("Player is not a Werewolf (only original Werewolf acts)")
 
-    player_role = _get_player_role(db, game_id, player_id)
-    if player_role.initial_role != "Werewolf":
-        raise ValueError("Player is not a Werewolf (only original Werewolf acts)")
-
-    werewolf_roles = _get_werewolf_roles(db, game_id)
-    if len(werewolf_roles) != 1:
-        raise ValueError("Center card viewing is only available to a lone Werewolf")
+        if len(live.seats_with_current_role("Werewolf")) != 1:
+            raise ValueError("Center card viewing is only available to a lone Werewolf")
 
-    if player_role.night_action_completed:
-        raise ValueError("Werewolf has already viewed a center card")
+        if live.completed[werewolf_seat]:
+            raise ValueError("Werewolf has already viewed a center card")
 
-    if card_index not in [0, 1, 2]:
-        raise ValueError("card_index must be 0, 1, or 2")
+        if card_index not in [0, 1, 2]:
+            raise ValueError("card_index must be 0, 1, or 2")
 
-    position = CENTER_POSITIONS[card_index]
-    center_card = db.query(CenterCard).filter(
-        CenterCard.game_id == game_id,
-        CenterCard.position == position
-    ).first()
+        if live.center_card_ids[card_index] is None:
+            raise ValueError("Center card not found")
 
-    if not center_card:
-        raise ValueError("Center card not found")
+        viewed_role = live.center[card_index]
+        live.record_action(
+            werewolf_seat,
+            ActionType.VIEW_CARD,
+            source_id=str(card_index),  # Center card index
+            target_id=str(card_index),
+            source_role=viewed_role,
+            target_role=viewed_role
+        )
 
-    # Create action record
-    action = Action(
-        game_id=game_id,
-        player_id=player_id,
-        action_type=ActionType.VIEW_CARD,
-        source_id=str(card_index),  # Center card index
-        target_id=str(card_index),
-        source_role=center_card.role,
-        target_role=center_card.role
-    )
-    db.add(action)
+        live.complete(werewolf_seat)
+        completed_step = night_service.commit_role_action(db, live, "Werewolf")
+        event_hub.publish(game_id, "night_action", {"role": "Werewolf"})
+        event_hub.publish(game_id, "night_result", {
+            "role": "Werewolf",
+            "card_index": card_index,
+            "viewed_role": viewed_role,
+        }, to_player_id=player_id)
 
-    player_role.night_action_completed = True
-    db.commit()
+        night_service.announce_role_complete(db, game_id, "Werewolf", completed_step)
 
-    _complete_werewolf_role_if_ready(db, game_id)
-
-    return {"role": center_card.role}
+    return {"role": viewed_role}
 
 
+@serialized
 def acknowledge_werewolf(db: Session, game_id: str, player_id: str) -> dict:
     """Acknowledge werewolf info for multi-werewolf games."""
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game:
-        raise ValueError(f"Game {game_id} not found")
-
-    if game.state != GameState.NIGHT:
-        raise ValueError(f"Game {game_id} is not in NIGHT state")
-
-    if game.current_role_step is None:
-        night_service.initialize_night_phase(db, game_id)
-        db.refresh(game)
-
-    if game.current_role_step != "Werewolf":
-        raise ValueError("Werewolf role is not currently active")
-
-    player_role = _get_player_role(db, game_id, player_id)
-    if player_role.initial_role != "Werewolf":
-        raise ValueError("Player is not a Werewolf (only original Werewolf acts)")
-
-    if not player_role.night_action_completed:
-        # Create action records for each other werewolf this player sees
-        werewolf_roles = _get_werewolf_roles(db, game_id)
-        for other_role in werewolf_roles:
-            if other_role.player_id != player_id:
-                # Create VIEW_CARD action for each other werewolf
-                action = Action(
-                    game_id=game_id,
-                    player_id=player_id,
-                    action_type=ActionType.VIEW_CARD,
-                    source_id=other_role.player_id,
-                    target_id=other_role.player_id,
-                    source_role="Werewolf",
-                    target_role="Werewolf"
-                )
-                db.add(action)
-        
-        player_role.night_action_completed = True
-        db.commit()
-
-    _complete_werewolf_role_if_ready(db, game_id)
+    with game_engine.engine.acquire(db, game_id) as live:
+        if live.state != GameState.NIGHT:
+            raise ValueError(f"Game {game_id} is not in NIGHT state")
+
+        if live.current_role_step is None:
+            raise ValueError("Night phase not started")
+
+        if live.current_role_step != "Werewolf":
+            raise ValueError("Werewolf role is not currently active")
+
+        werewolf_seat = live.seat_of(player_id)
+        if live.initial_roles[werewolf_seat] != "Werewolf":
+            raise ValueError("Player is not a Werewolf (only original Werewolf acts)")
+
+        if not live.completed[werewolf_seat]:
+            # VIEW_CARD action for each other werewolf this player sees
+            for other_seat in live.seats_with_current_role("Werewolf"):
+                if other_seat != werewolf_seat:
+                    other_player_id = live.player_ids[other_seat]
+                    live.record_action(
+                        werewolf_seat,
+                        ActionType.VIEW_CARD,
+                        source_id=other_player_id,
+                        target_id=other_player_id,
+                        source_role="Werewolf",
+                        target_role="Werewolf"
+                    )
+
+            live.complete(werewolf_seat)
+            completed_step = night_service.commit_role_action(db, live, "Werewolf")
+            event_hub.publish(game_id, "night_action", {"role": "Werewolf"})
+            event_hub.publish(game_id, "night_result", {"role": "Werewolf"}, to_player_id=player_id)
+        else:
+            # A repeat acknowledgement still advances a step that was left waiting on it
+            completed_step = night_service.commit_role_action(db, live, "Werewolf")
+        night_service.announce_role_complete(db, game_id, "Werewolf", completed_step)
 
     return {"status": "ok"}
 
@@ -163,23 +151,10 @@ def _get_player_role(db: Session, game_id: str, player_id: str) -> PlayerRole:
 
 
 def _get_werewolf_roles(db: Session, game_id: str) -> list[PlayerRole]:
-    return db.query(PlayerRole).filter(
+    return db.query(PlayerRole).options(joinedload(PlayerRole.player)).filter(
         PlayerRole.game_id == game_id,
         PlayerRole.current_role == "Werewolf"
     ).all()
 
 
-def _complete_werewolf_role_if_ready(db: Session, game_id: str) -> None:
-    game = db.query(Game).filter(Game.game_id == game_id).first()
-    if not game or game.current_role_step != "Werewolf":
-        return
-
-    werewolf_roles = db.query(PlayerRole).filter(
-        PlayerRole.game_id == game_id,
-        PlayerRole.initial_role == "Werewolf"
-    ).all()
-    if not werewolf_roles:
-        return
-
-    if all(role.night_action_completed for role in werewolf_roles):
-        night_service.mark_role_complete(db, game_id, "Werewolf")
+roles.register_night_handlers(Role.WEREWOLF, night_info=get_night_info, acknowledge=acknowledge_werewolf)
@@ -0,0 +1,295 @@
+"""
+Router mode: one front process proxying HTTP, SSE and WebSocket requests to N backend shards,
+sending every request for a game set and its games to the same shard.
+
+    SHARD_URLS=http://127.0.0.1:8001,http://127.0.0.1:8002 uvicorn shard_router:app --port 8000
+
+Shard i runs `uvicorn main:app` with SHARD_INDEX=i and SHARD_COUNT=len(SHARD_URLS), on the
+same DATABASE_URL and EVENT_BUS_URL (scripts/start_prod.sh starts the lot). Requests under
+/api/game-sets/{id} are keyed by the set; those under /api/games/{id} and /ws/games/{id} by
+the game's set, looked up once in the games table. Anything else goes to any shard.
+
+Each shard keeps its own /metrics. The router's /metrics merges every shard's, with a
+shard label on each sample (and onw_shard_up per shard); /metrics?shard=N is shard N's own.
+
+If a game's shard is unreachable, its requests go to the next shard on the ring, which
+serves the game from the database until the owner is back.
+"""
+import asyncio
+import itertools
+import logging
+import os
+import re
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from urllib.parse import parse_qs
+import httpx
+import websockets
+from sqlalchemy import select
+from db.database import AsyncReadSessionLocal
+from models.game import Game
+from services.request_metrics import CONTENT_TYPE
+from services.sharding import HashRing
+
+logger = logging.getLogger(__name__)
+
+SHARD_URLS = [url.strip().rstrip("/") for url in os.getenv("SHARD_URLS", "http://127.0.0.1:8001").split(",") if url.strip()]
+
+# Response header naming the shard that served the request
+SHARD_HEADER = b"x-onw-shard"
+
+# game_id -> game_set_id lookups kept in memory (a game never changes set)
+GAME_SET_CACHE_SIZE = 100_000
+
+# Connection-level headers, never forwarded in either direction
+HOP_BY_HOP_HEADERS = {
+    b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization",
+    b"te", b"trailer", b"transfer-encoding", b"upgrade", b"host",
+}
+
+# Set by the router's own server, so not copied from the shard's response
+SERVER_HEADERS = {b"date", b"server"}
+
+METRICS_PATH = "/metrics"
+
+_GAME_SET_PATH = re.compile(r"^/api/game-sets/([^/]+)")
+_GAME_PATH = re.compile(r"^/(?:api|ws)/games/([^/]+)")
+# A Prometheus sample line: name, optional {labels}, value
+_SAMPLE = re.compile(r"^([^{\s]+)(?:\{(.*)\})?\s+(.*)$")
+
+
+async def game_set_of(game_id: str) -> str | None:
+    """The game's set, from the games table (None if there is no such game)."""
+    # The bare table: the router doesn't load the rest of the models the mapper would need
+    games = Game.__table__
+    async with AsyncReadSessionLocal() as db:
+        return await db.scalar(select(games.c.game_set_id).where(games.c.game_id == game_id))
+
+
+class ShardRouter:
+    """ASGI app proxying each request to the shard that owns its game set (see module docstring)."""
+
+    def __init__(
+        self,
+        shard_urls: list[str],
+        resolve_game_set: Callable[[str], Awaitable[str | None]] = game_set_of,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.shard_urls = shard_urls
+        self.ring = HashRing(len(shard_urls))
+        self._resolve_game_set = resolve_game_set
+        self._game_sets: OrderedDict[str, str] = OrderedDict()
+        self._unkeyed = itertools.count()
+        # No read timeout: SSE streams and long polls stay open as long as the shard keeps them
+        self._client = httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(30.0, read=None))
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http":
+            await self._proxy_http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._proxy_websocket(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+
+    async def shard_key(self, path: str) -> str | None:
+        """The game set a request path belongs to (a game's own id if the game is unknown), or None."""
+        match = _GAME_SET_PATH.match(path)
+        if match:
+            return match.group(1)
+        match = _GAME_PATH.match(path)
+        if not match:
+            return None
+        game_id = match.group(1)
+        game_set_id = self._game_sets.get(game_id)
+        if game_set_id is None:
+            game_set_id = await self._resolve_game_set(game_id)
+            if game_set_id is None:
+                return game_id  # The shard answers 404
+            self._game_sets[game_id] = game_set_id
+            while len(self._game_sets) > GAME_SET_CACHE_SIZE:
+                self._game_sets.popitem(last=False)
+        return game_set_id
+
+    async def shards_for(self, path: str) -> list[int]:
+        """Shards to try for a request, in order: the owner first, then failover."""
+        key = await self.shard_key(path)
+        if key is not None:
+            return self.ring.preference(key)
+        # Not tied to a game: spread over the shards
+        start = next(self._unkeyed) % self.ring.count
+        return [(start + offset) % self.ring.count for offset in range(self.ring.count)]
+
+    async def _proxy_http(self, scope, receive, send) -> None:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = [(name, value) for name, value in scope["headers"] if name.lower() not in HOP_BY_HOP_HEADERS]
+        target = _target(scope)
+
+        if scope["path"] == METRICS_PATH:
+            requested = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("shard")
+            if not requested:
+                await self._send_merged_metrics(send)
+                return
+            if requested[0] not in {str(shard) for shard in range(self.ring.count)}:
+                await _send_json(send, 404, b'{"detail":"No such shard"}')
+                return
+            shards = [int(requested[0])]
+        else:
+            shards = await self.shards_for(scope["path"])
+
+        for shard in shards:
+            request = self._client.build_request(
+                scope["method"], self.shard_urls[shard] + target, headers=headers, content=body,
+            )
+            try:
+                response = await self._client.send(request, stream=True)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as exc:
+                # Nothing reached the shard, so even a POST is safe to send to the next one
+                logger.warning("Shard %s unreachable (%s); trying the next", shard, exc)
+                continue
+            try:
+                await send({
+                    "type": "http.response.start",
+                    "status": response.status_code,
+                    "headers": [
+                        (name, value) for name, value in response.headers.raw
+                        if name.lower() not in HOP_BY_HOP_HEADERS | SERVER_HEADERS
+                    ] + [(SHARD_HEADER, str(shard).encode())],
+                })
+                async for chunk in response.aiter_raw():
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b""})
+            finally:
+                await response.aclose()
+            return
+
+        await _send_json(send, 502, b'{"detail":"No backend shard reachable"}')
+
+    async def _send_merged_metrics(self, send) -> None:
+        async def scrape(shard: int) -> str | None:
+            try:
+                response = await self._client.get(self.shard_urls[shard] + METRICS_PATH, timeout=10.0)
+            except httpx.HTTPError as exc:
+                logger.warning("Shard %s metrics unavailable (%s)", shard, exc)
+                return None
+            return response.text if response.status_code == 200 else None
+
+        scrapes = await asyncio.gather(*(scrape(shard) for shard in range(self.ring.count)))
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", CONTENT_TYPE.encode())]})
+        await send({"type": "http.response.body", "body": merge_metrics(scrapes).encode()})
+
+    async def _proxy_websocket(self, scope, receive, send) -> None:
+        if (await receive())["type"] != "websocket.connect":
+            return
+        target = _target(scope)
+        upstream = None
+        for shard in await self.shards_for(scope["path"]):
+            url = re.sub(r"^http", "ws", self.shard_urls[shard]) + target
+            try:
+                upstream = await websockets.connect(url)
+                break
+            except websockets.exceptions.InvalidHandshake:
+                # The shard refused the connection (e.g. unknown player): refuse it too
+                await send({"type": "websocket.close", "code": 1008})
+                return
+            except OSError as exc:
+                logger.warning("Shard %s unreachable (%s); trying the next", shard, exc)
+        if upstream is None:
+            await send({"type": "websocket.close", "code": 1011})
+            return
+
+        await send({"type": "websocket.accept"})
+        to_client = asyncio.create_task(_pump_to_client(upstream, send))
+        to_shard = asyncio.create_task(_pump_to_shard(receive, upstream))
+        try:
+            await asyncio.wait({to_client, to_shard}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            to_client.cancel()
+            to_shard.cancel()
+            await upstream.close()
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self._client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def merge_metrics(scrapes: list[str | None]) -> str:
+    """
+    Merge shards' Prometheus text into one exposition, each sample labelled with its shard.
+
+    scrapes[i] is shard i's /metrics body, or None if it could not be scraped; each
+    metric family is written once, with every shard's samples.
+    """
+    families: dict[str, tuple[list[str], list[str]]] = {}
+    for shard, text in enumerate(scrapes):
+        if text is None:
+            continue
+        family = None
+        for line in text.splitlines():
+            if line.startswith("# HELP ") or line.startswith("# TYPE "):
+                family = line.split(" ", 3)[2]
+                comments, _ = families.setdefault(family, ([], []))
+                if line not in comments:
+                    comments.append(line)
+            elif line and not line.startswith("#"):
+                name, labels, value = _SAMPLE.match(line).groups()
+                labels = f'shard="{shard}",{labels}' if labels else f'shard="{shard}"'
+                families.setdefault(family or name, ([], []))[1].append(f"{name}{{{labels}}} {value}")
+
+    lines = []
+    for comments, samples in families.values():
+        lines += comments + samples
+    lines += [
+        "# HELP onw_shard_up Whether the shard's metrics could be scraped.",
+        "# TYPE onw_shard_up gauge",
+    ] + [f'onw_shard_up{{shard="{shard}"}} {int(text is not None)}' for shard, text in enumerate(scrapes)]
+    return "\n".join(lines) + "\n"
+
+
+async def _send_json(send, status: int, body: bytes) -> None:
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
+
+
+def _target(scope) -> str:
+    """Path and query string of the request, as sent by the client."""
+    # Some servers include the query string in raw_path, which the ASGI spec leaves out
+    path = (scope.get("raw_path") or scope["path"].encode()).split(b"?", 1)[0]
+    query = scope.get("query_string", b"")
+    return (path + b"?" + query if query else path).decode("latin-1")
+
+
+async def _pump_to_client(upstream, send) -> None:
+    try:
+        async for message in upstream:
+            if isinstance(message, bytes):
+                await send({"type": "websocket.send", "bytes": message})
+            else:
+                await send({"type": "websocket.send", "text": message})
+    except websockets.exceptions.ConnectionClosed:
+        pass
+    await send({"type": "websocket.close", "code": upstream.close_code or 1000})
+
+
+async def _pump_to_shard(receive, upstream) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        if message.get("text") is not None:
+            await upstream.send(message["text"])
+        elif message.get("bytes") is not None:
+            await upstream.send(message["bytes"])
+
+
+app = ShardRouter(SHARD_URLS)
@@ -1,14 +1,32 @@
 """Pytest fixtures for testing."""
+import atexit
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
 # Add parent directory to path so we can import modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# The app's engines (used by API tests) get a throwaway database, never the working copy's onw.db.
+# Set before db.database is first imported, which reads it.
+_test_db_dir = tempfile.mkdtemp(prefix="onw-tests-")
+atexit.register(shutil.rmtree, _test_db_dir, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_test_db_dir) / 'onw.db'}"
+os.environ.pop("DATABASE_READ_URL", None)
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from db.database import Base
+from db.database import Base, init_db
+
+
+@pytest.fixture(autouse=True, scope="session")
+def migrated_app_db():
+    """Bring the app's database (used by API tests) up to the current models, as startup does."""
+    import main  # noqa: F401  (registers every model)
+    init_db()
 
 
 @pytest.fixture
@@ -0,0 +1,157 @@
+"""Tests for database setup and migrations."""
+import sqlite3
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from db import database
+from db.database import Base
+from db.ids import new_id
+from models.game import Game
+# Import models to ensure they're registered with SQLAlchemy
+import main  # noqa: F401
+
+
+def test_init_db_adds_missing_indexes(tmp_path, monkeypatch):
+    """Existing databases created before the indexes existed pick them up."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX ix_player_roles_game_player"))
+        conn.execute(text("DROP INDEX ix_actions_game_player_timestamp"))
+        conn.commit()
+
+    monkeypatch.setattr(database, "engine", engine)
+    database.init_db()
+    # Idempotent on an up-to-date database
+    database.init_db()
+
+    inspector = inspect(engine)
+    player_role_indexes = {ix["name"]: ix["column_names"] for ix in inspector.get_indexes("player_roles")}
+    assert player_role_indexes["ix_player_roles_game_player"] == ["game_id", "player_id"]
+    assert "ix_player_roles_game_initial_role" in player_role_indexes
+    action_indexes = {ix["name"] for ix in inspector.get_indexes("actions")}
+    assert "ix_actions_game_player_timestamp" in action_indexes
+
+
+def test_player_role_lookup_uses_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plan.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM player_roles WHERE game_id = 'g' AND player_id = 'p'"
+        )).fetchall()
+    assert any("ix_player_roles_game_player" in row[-1] for row in plan)
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = database.create_db_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == database.SQLITE_PRAGMAS["busy_timeout"]
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+
+
+def test_read_only_engine_rejects_writes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'ro.db'}"
+    Base.metadata.create_all(bind=database.create_db_engine(url))
+    read_engine = database.create_db_engine(url, read_only=True)
+    with read_engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM games")).scalar() == 0
+        with pytest.raises(OperationalError):
+            conn.execute(text("DELETE FROM games"))
+
+
+def test_init_db_adds_missing_columns(tmp_path, monkeypatch):
+    """Columns added to the models after a database was created are migrated in, with defaults."""
+    engine = database.create_db_engine(f"sqlite:///{tmp_path / 'columns.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        conn.execute(text("ALTER TABLE player_roles DROP COLUMN role_revealed"))
+        conn.execute(text("ALTER TABLE games DROP COLUMN discussion_started_at"))
+        conn.execute(text(
+            "INSERT INTO player_roles (player_role_id, game_id, player_id, initial_role, current_role) "
+            "VALUES ('pr', 'g', 'p', 'Villager', 'Villager')"
+        ))
+        conn.commit()
+
+    monkeypatch.setattr(database, "engine", engine)
+    database.init_db()
+
+    inspector = inspect(engine)
+    assert "role_revealed" in {c["name"] for c in inspector.get_columns("player_roles")}
+    assert "discussion_started_at" in {c["name"] for c in inspector.get_columns("games")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT role_revealed FROM player_roles")).scalar() == 0
+
+
+def test_engine_pooling_per_backend(tmp_path):
+    file_engine = database.create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=3)
+    assert file_engine.pool.size() == 3
+    memory_engine = database.create_db_engine("sqlite://")
+    with memory_engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+async def test_async_engine_runs_sync_services_read_only(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    Base.metadata.create_all(bind=database.create_db_engine(url))
+    async_engine = database.create_async_db_engine(url, read_only=True)
+    try:
+        async with async_engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            count = await conn.run_sync(lambda sync_conn: sync_conn.execute(text("SELECT count(*) FROM games")).scalar())
+            assert count == 0
+            with pytest.raises(OperationalError):
+                await conn.execute(text("DELETE FROM games"))
+    finally:
+        await async_engine.dispose()
+
+
+async def test_threaded_read_session_stands_in_without_async_driver(monkeypatch):
+    monkeypatch.setitem(database.ASYNC_DRIVERS, "sqlite", "no_such_async_driver")
+    assert not database.async_driver_installed("sqlite:///./onw.db")
+    assert not database.async_driver_installed("mysql://host/onw")
+
+    async with database.ThreadedReadSession() as db:
+        assert await db.get(Game, "fake-game-id") is None
+        assert await db.scalar(select(Game.game_id).where(Game.game_id == "fake-game-id")) is None
+        count = await db.run_sync(lambda sync_db: sync_db.query(Game).filter(Game.game_id == "fake-game-id").count())
+        assert count == 0
+
+
+def test_lock_for_write_takes_sqlite_write_lock(tmp_path):
+    """A locked session keeps other writers out until it commits or rolls back."""
+    path = tmp_path / "lock.db"
+    engine = database.create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    other = sqlite3.connect(path, timeout=0)
+    try:
+        # A transaction that has only read is restarted with the lock
+        session.execute(text("SELECT count(*) FROM games")).scalar()
+        database.lock_for_write(session)
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            other.execute("BEGIN IMMEDIATE")
+        session.rollback()
+        other.execute("BEGIN IMMEDIATE")
+        other.rollback()
+    finally:
+        other.close()
+        session.close()
+
+
+def test_new_ids_are_time_ordered_uuids():
+    ids = [new_id() for _ in range(5000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    parsed = uuid.UUID(ids[0])
+    assert str(parsed) == ids[0]
+    assert parsed.version == 7
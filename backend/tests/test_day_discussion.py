@@ -8,11 +8,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import pytest
 from fastapi.testclient import TestClient
 from main import app
-from services import game_service
+from services import discussion_service, game_service
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True, scope="module")
+def phase_scheduler_running():
+    """Run the app lifespan so the phase scheduler fires the discussion timer."""
+    with client:
+        yield
+
+
 def _start_game_to_day_discussion(discussion_timer_seconds=300):
     """Start a game and advance to DAY_DISCUSSION (Werewolf + Insomniac only for speed)."""
     game_set_response = client.post("/api/game-sets", json={
@@ -115,6 +122,22 @@ def test_vote_now_majority_transitions_to_voting(monkeypatch):
     assert game["state"] == "DAY_VOTING"
 
 
+def test_repeated_vote_now_changes_nothing(monkeypatch):
+    """A player's second vote-now is not counted again and wakes no pollers."""
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_id, player_ids = _start_game_to_day_discussion()
+    first = client.post(f"/api/games/{game_id}/players/{player_ids[0]}/vote-now").json()
+    etag = client.get(f"/api/games/{game_id}").headers["etag"]
+
+    notified = []
+    monkeypatch.setattr(discussion_service.version_watch, "notify", notified.append)
+    monkeypatch.setattr(discussion_service.event_hub, "publish", lambda *args: notified.append(args))
+    repeat = client.post(f"/api/games/{game_id}/players/{player_ids[0]}/vote-now").json()
+    assert repeat == first
+    assert notified == []
+    assert client.get(f"/api/games/{game_id}").headers["etag"] == etag
+
+
 def test_discussion_status_includes_vote_now_when_player_id_given(monkeypatch):
     """discussion-status with player_id returns vote_now fields."""
     def no_shuffle(items):
@@ -0,0 +1,135 @@
+"""Tests for the cross-process event bus (in-memory and Redis protocol) and the local broker."""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from services import event_bus, event_hub, game_engine
+from services.event_bus import InMemoryEventBus, RedisEventBus, encode_command, read_reply
+from services.local_broker import LocalBroker
+
+
+@pytest.fixture
+async def broker():
+    broker = LocalBroker()
+    await broker.start(port=0)
+    yield broker
+    await broker.stop()
+
+
+class Inbox:
+    """Collects messages handed to a bus handler; next() waits for the next one."""
+
+    def __init__(self):
+        self.messages = asyncio.Queue()
+
+    def __call__(self, message: dict) -> None:
+        self.messages.put_nowait(message)
+
+    async def next(self) -> dict:
+        return await asyncio.wait_for(self.messages.get(), 2)
+
+
+async def test_redis_bus_fans_out_through_local_broker(broker):
+    buses = [RedisEventBus(f"redis://127.0.0.1:{broker.port}") for _ in range(2)]
+    inboxes = [Inbox(), Inbox()]
+    for bus, inbox in zip(buses, inboxes):
+        await bus.start(inbox)
+    try:
+        assert broker.subscriber_count(event_bus.EVENT_BUS_CHANNEL.encode()) == 2
+        buses[0].publish({"kind": "version", "game_id": "g1"})
+        # From a threadpool thread, as sync services publish
+        await asyncio.to_thread(buses[1].publish, {"kind": "version", "game_id": "g2"})
+
+        for inbox in inboxes:
+            received = {(await inbox.next())["game_id"], (await inbox.next())["game_id"]}
+            assert received == {"g1", "g2"}
+    finally:
+        for bus in buses:
+            await bus.stop()
+
+
+async def test_redis_bus_reconnects_after_broker_restart(broker, monkeypatch):
+    monkeypatch.setattr(event_bus, "RECONNECT_SECONDS", 0.05)
+    port = broker.port
+    bus, inbox = RedisEventBus(f"redis://127.0.0.1:{port}"), Inbox()
+    await bus.start(inbox)
+    try:
+        await broker.stop()
+        restarted = LocalBroker()
+        await restarted.start(port=port)
+        try:
+            for _ in range(100):
+                if restarted.subscriber_count(event_bus.EVENT_BUS_CHANNEL.encode()):
+                    break
+                await asyncio.sleep(0.02)
+            bus.publish({"kind": "version", "game_id": "g1"})
+            assert (await inbox.next())["game_id"] == "g1"
+        finally:
+            await restarted.stop()
+    finally:
+        await bus.stop()
+
+
+async def test_remote_events_reach_local_subscribers(monkeypatch):
+    monkeypatch.setattr(event_bus, "bus", InMemoryEventBus())
+    await event_bus.start()
+    subscription = event_hub.hub.subscribe("bus-game", player_id="p1")
+    try:
+        # This process's own events were delivered locally already and are skipped
+        event_bus.bus.publish({
+            "kind": "event", "origin": event_bus.PROCESS_ID, "game_id": "bus-game",
+            "event_type": "night_step", "data": {}, "to_player_id": None,
+        })
+        event_bus.bus.publish({
+            "kind": "event", "origin": "other-worker", "game_id": "bus-game",
+            "event_type": "night_result", "data": {"role": "Seer"}, "to_player_id": "p1",
+        })
+        assert await subscription.get(timeout=1) == {
+            "type": "night_result", "game_id": "bus-game", "role": "Seer",
+        }
+        assert await subscription.get(timeout=0.1) is None
+    finally:
+        event_hub.hub.unsubscribe(subscription)
+        await event_bus.stop()
+
+
+async def test_publish_forwards_to_the_bus(monkeypatch):
+    bus, inbox = InMemoryEventBus(), Inbox()
+    monkeypatch.setattr(event_bus, "bus", bus)
+    await bus.start(inbox)
+
+    event_hub.publish("bus-game", "vote_cast", {"votes_cast": 1})
+    assert await inbox.next() == {
+        "kind": "event", "origin": event_bus.PROCESS_ID, "game_id": "bus-game",
+        "event_type": "vote_cast", "data": {"votes_cast": 1}, "to_player_id": None,
+    }
+    await bus.stop()
+
+
+def test_remote_version_change_drops_cached_game(monkeypatch):
+    monkeypatch.setitem(game_engine.engine._games, "bus-game", object())
+    event_bus.dispatch({"kind": "version", "origin": "other-worker", "game_id": "bus-game"})
+    assert game_engine.engine.peek("bus-game") is None
+
+
+async def test_local_broker_speaks_resp(broker):
+    reader, writer = await asyncio.open_connection("127.0.0.1", broker.port)
+    try:
+        writer.write(encode_command("PING") + encode_command("PUBLISH", "nobody", "hi") + encode_command("FLUSHALL"))
+        await writer.drain()
+        assert await read_reply(reader) == "PONG"
+        assert await read_reply(reader) == 0
+        with pytest.raises(event_bus.RedisError, match="unknown command"):
+            await read_reply(reader)
+    finally:
+        writer.close()
+
+
+def test_create_bus_rejects_unknown_scheme():
+    assert isinstance(event_bus.create_bus("memory://"), InMemoryEventBus)
+    assert RedisEventBus("redis://:secret@cache:6390").port == 6390
+    with pytest.raises(ValueError, match="Unsupported EVENT_BUS_URL"):
+        event_bus.create_bus("kafka://broker:9092")
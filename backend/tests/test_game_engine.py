@@ -0,0 +1,206 @@
+"""Tests for the in-memory game engine used by night actions."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models.game import GameState
+from models.game_set import GameSet
+from models.player import Player
+from models.player_role import PlayerRole
+from models.center_card import CenterCard
+from models.action import Action, ActionType
+from services import game_service, game_engine, robber_service, drunk_service, werewolf_service
+from services.game_engine import GameEngine
+
+
+def _no_shuffle(items):
+    return None
+
+
+def _start_game(db: Session, roles, num_players=3):
+    game_set = GameSet(num_players=num_players, selected_roles=roles, discussion_timer_seconds=300)
+    db.add(game_set)
+    db.flush()
+    for i in range(num_players):
+        player = Player(player_name=f"Player{i}")
+        db.add(player)
+        db.flush()
+        game_set.players.append(player)
+    db.commit()
+    return game_service.start_game(db, game_set.game_set_id)
+
+
+def _player_with_role(db: Session, game_id: str, role: str) -> PlayerRole:
+    return db.query(PlayerRole).filter(
+        PlayerRole.game_id == game_id,
+        PlayerRole.initial_role == role
+    ).first()
+
+
+def test_load_mirrors_db(db: Session, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Robber", "Villager", "Seer", "Drunk", "Villager"])
+    live = GameEngine().get(db, game.game_id)
+
+    assert live.state == GameState.NIGHT
+    assert live.current_role_step == "Werewolf"
+    assert sorted(live.current_roles) == ["Robber", "Villager", "Werewolf"]
+    assert live.center == ["Seer", "Drunk", "Villager"]
+    assert live.seats_with_initial_role("Robber") == [live.seat_of(_player_with_role(db, game.game_id, "Robber").player_id)]
+    with pytest.raises(ValueError, match="not found"):
+        live.seat_of("nobody")
+
+
+def test_unknown_game_raises(db: Session):
+    with pytest.raises(ValueError, match="not found"):
+        GameEngine().get(db, "fake-game-id")
+
+
+def test_flush_writes_swaps_and_actions_in_one_batch(db: Session, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Robber", "Villager", "Seer", "Drunk", "Villager"])
+    engine = GameEngine()
+    live = engine.get(db, game.game_id)
+    robber_seat = live.seats_with_initial_role("Robber")[0]
+    werewolf_seat = live.seats_with_initial_role("Werewolf")[0]
+
+    live.swap_seats(robber_seat, werewolf_seat)
+    live.swap_with_center(werewolf_seat, 0)
+    live.complete(robber_seat)
+    live.record_action(
+        robber_seat, ActionType.SWAP_PLAYER_TO_PLAYER,
+        source_id=live.player_ids[robber_seat], target_id=live.player_ids[werewolf_seat],
+        source_role="Robber", target_role="Werewolf"
+    )
+    assert live.has_pending_writes
+    engine.flush(db, live)
+    assert not live.has_pending_writes
+
+    robber = db.query(PlayerRole).filter(PlayerRole.player_id == live.player_ids[robber_seat]).first()
+    werewolf = db.query(PlayerRole).filter(PlayerRole.player_id == live.player_ids[werewolf_seat]).first()
+    left = db.query(CenterCard).filter(CenterCard.game_id == game.game_id, CenterCard.position == "left").first()
+    assert robber.current_role == "Werewolf"
+    assert robber.night_action_completed
+    assert werewolf.current_role == "Seer"
+    assert left.role == "Robber"
+    assert db.query(Action).filter(Action.game_id == game.game_id).count() == 1
+
+
+def test_role_services_share_cached_state(db: Session, monkeypatch):
+    """Actions read each other's card changes from memory and the DB stays in step."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Robber", "Drunk", "Villager", "Villager", "Villager"])
+    werewolf = _player_with_role(db, game.game_id, "Werewolf")
+    robber = _player_with_role(db, game.game_id, "Robber")
+    drunk = _player_with_role(db, game.game_id, "Drunk")
+
+    werewolf_service.view_center_card(db, game.game_id, werewolf.player_id, 0)
+    live = game_engine.engine.peek(game.game_id)
+    assert live is not None
+    assert live.current_role_step == "Robber"
+
+    assert robber_service.perform_robber_action(db, game.game_id, robber.player_id, drunk.player_id)["new_role"] == "Drunk"
+    assert live.current_role_step == "Drunk"
+    # Drunk now holds the Robber card but is still the one who acts
+    drunk_service.perform_drunk_action(db, game.game_id, drunk.player_id, 1)
+
+    db.refresh(game)
+    assert game.state == GameState.DAY_DISCUSSION
+    # Night is over: the game is no longer held in memory
+    assert game_engine.engine.peek(game.game_id) is None
+
+    db.refresh(robber)
+    db.refresh(drunk)
+    center = db.query(CenterCard).filter(CenterCard.game_id == game.game_id, CenterCard.position == "center").first()
+    assert robber.current_role == "Drunk"
+    assert drunk.current_role == "Villager"
+    assert center.role == "Robber"
+
+
+def test_action_that_completes_a_step_commits_once(db: Session, monkeypatch):
+    """The card change, the action record and the wake-pointer advance share one transaction."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Robber", "Villager", "Seer", "Drunk", "Villager"])
+    werewolf = _player_with_role(db, game.game_id, "Werewolf")
+    version = game.version
+
+    commits = []
+
+    def count_commit(session):
+        commits.append(session)
+
+    event.listen(db, "after_commit", count_commit)
+    werewolf_service.view_center_card(db, game.game_id, werewolf.player_id, 0)
+    event.remove(db, "after_commit", count_commit)
+
+    assert len(commits) == 1
+    db.refresh(game)
+    assert game.current_role_step == "Seer"
+    assert game.version == version + 1
+    assert db.query(Action).filter(Action.game_id == game.game_id).count() == 1
+
+
+def test_failed_action_leaves_state_untouched(db: Session, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Robber", "Villager", "Villager", "Villager", "Villager"])
+    robber = _player_with_role(db, game.game_id, "Robber")
+    with pytest.raises(ValueError, match="not currently active"):
+        robber_service.perform_robber_action(db, game.game_id, robber.player_id, "anyone")
+    live = game_engine.engine.get(db, game.game_id)
+    assert not live.has_pending_writes
+    assert live.current_roles[live.seat_of(robber.player_id)] == "Robber"
+
+
+def test_action_before_first_role_woken_is_refused(db: Session, monkeypatch):
+    """A night without a role step (woken at startup) is not started from inside an action."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Robber", "Villager", "Villager", "Villager", "Villager"])
+    werewolf = _player_with_role(db, game.game_id, "Werewolf")
+    game.current_role_step = None
+    db.commit()
+    game_engine.engine.evict(game.game_id)
+
+    with pytest.raises(ValueError, match="Night phase not started"):
+        werewolf_service.acknowledge_werewolf(db, game.game_id, werewolf.player_id)
+    db.refresh(game)
+    assert game.current_role_step is None
+
+
+def test_failed_commit_drops_cached_game(db: Session, monkeypatch):
+    """If the action's commit fails, the cached copy is dropped with the rollback and the action can be retried."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Robber", "Villager", "Villager", "Villager", "Villager"])
+    werewolf = _player_with_role(db, game.game_id, "Werewolf")
+    robber = _player_with_role(db, game.game_id, "Robber")
+    werewolf_service.view_center_card(db, game.game_id, werewolf.player_id, 0)
+
+    real_commit = db.commit
+
+    def fail_once():
+        monkeypatch.setattr(db, "commit", real_commit)
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(db, "commit", fail_once)
+    with pytest.raises(RuntimeError, match="commit failed"):
+        robber_service.perform_robber_action(db, game.game_id, robber.player_id, werewolf.player_id)
+    assert game_engine.engine.peek(game.game_id) is None
+
+    result = robber_service.perform_robber_action(db, game.game_id, robber.player_id, werewolf.player_id)
+    assert result["new_role"] == "Werewolf"
+    db.refresh(robber)
+    assert robber.current_role == "Werewolf"
+    assert db.query(Action).filter(Action.game_id == game.game_id, Action.player_id == robber.player_id).count() == 1
+
+
+def test_least_recently_used_games_are_dropped(db: Session, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    games = [_start_game(db, ["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"]) for _ in range(3)]
+    engine = GameEngine(max_games=2)
+    for game in games:
+        engine.get(db, game.game_id)
+    assert engine.peek(games[0].game_id) is None
+    assert engine.peek(games[2].game_id) is not None
@@ -0,0 +1,128 @@
+"""Tests for the game event hub and SSE endpoint."""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from main import app
+from models.game_set import GameSet
+from models.player import Player
+from models.player_role import PlayerRole
+from services import event_hub, game_service, night_service, werewolf_service
+from services.event_hub import EventHub
+
+client = TestClient(app)
+
+
+def _no_shuffle(items):
+    return None
+
+
+def _start_game(db: Session, roles, num_players=3):
+    game_set = GameSet(num_players=num_players, selected_roles=roles, discussion_timer_seconds=300)
+    db.add(game_set)
+    db.flush()
+    for i in range(num_players):
+        player = Player(player_name=f"Player{i}")
+        db.add(player)
+        db.flush()
+        game_set.players.append(player)
+    db.commit()
+    return game_service.start_game(db, game_set.game_set_id)
+
+
+async def _drain(subscription, timeout=0.2):
+    events = []
+    while True:
+        event = await subscription.get(timeout=timeout)
+        if event is None:
+            return events
+        events.append(event)
+
+
+async def test_publish_from_worker_thread_reaches_subscriber():
+    hub = EventHub()
+    subscription = hub.subscribe("game-1")
+    await asyncio.to_thread(hub.publish, "game-1", "night_step", {"current_role": "Seer"})
+    event = await subscription.get(timeout=1)
+    assert event == {"type": "night_step", "game_id": "game-1", "current_role": "Seer"}
+
+
+async def test_events_are_scoped_to_game():
+    hub = EventHub()
+    sub_a = hub.subscribe("game-a")
+    sub_b = hub.subscribe("game-b")
+    hub.publish("game-a", "vote_cast", {"votes_cast": 1})
+    assert (await sub_a.get(timeout=1))["votes_cast"] == 1
+    assert await sub_b.get(timeout=0.1) is None
+
+
+async def test_unsubscribe_stops_delivery():
+    hub = EventHub()
+    subscription = hub.subscribe("game-1")
+    assert hub.subscriber_count("game-1") == 1
+    hub.unsubscribe(subscription)
+    assert hub.subscriber_count("game-1") == 0
+    hub.publish("game-1", "night_step")
+    assert await subscription.get(timeout=0.1) is None
+
+
+async def test_private_events_only_reach_addressed_player():
+    hub = EventHub()
+    anonymous = hub.subscribe("game-1")
+    robber = hub.subscribe("game-1", player_id="robber")
+    seer = hub.subscribe("game-1", player_id="seer")
+    hub.publish("game-1", "night_result", {"new_role": "Werewolf"}, to_player_id="robber")
+    assert (await robber.get(timeout=1))["new_role"] == "Werewolf"
+    assert await seer.get(timeout=0.1) is None
+    assert await anonymous.get(timeout=0.1) is None
+
+
+async def test_slow_subscriber_drops_oldest_events():
+    hub = EventHub()
+    subscription = hub.subscribe("game-1")
+    for i in range(event_hub.SUBSCRIBER_QUEUE_SIZE + 5):
+        hub.publish("game-1", "vote_now", {"n": i})
+    events = await _drain(subscription)
+    assert len(events) == event_hub.SUBSCRIBER_QUEUE_SIZE
+    assert events[-1]["n"] == event_hub.SUBSCRIBER_QUEUE_SIZE + 4
+
+
+async def test_night_services_publish_state_changes(db: Session, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Werewolf", "Villager", "Villager", "Villager", "Villager"])
+    subscription = event_hub.hub.subscribe(game.game_id)
+    try:
+        night_service.initialize_night_phase(db, game.game_id)
+        werewolves = db.query(PlayerRole).filter(
+            PlayerRole.game_id == game.game_id,
+            PlayerRole.initial_role == "Werewolf"
+        ).all()
+        for pr in werewolves:
+            werewolf_service.acknowledge_werewolf(db, game.game_id, pr.player_id)
+        events = await _drain(subscription)
+    finally:
+        event_hub.hub.unsubscribe(subscription)
+
+    assert [e["type"] for e in events] == ["night_step", "night_action", "night_action", "night_step"]
+    assert events[0]["current_role"] == "Werewolf"
+    # Broadcast events never say which player acted
+    assert all("player_id" not in e for e in events[1:3])
+    assert events[-1]["completed_role"] == "Werewolf"
+    assert events[-1]["current_role"] is None
+    assert events[-1]["state"] == "DAY_DISCUSSION"
+
+
+def test_format_sse():
+    message = event_hub.format_sse({"type": "vote_cast", "game_id": "g", "votes_cast": 2})
+    assert message.startswith("event: vote_cast\ndata: {")
+    assert message.endswith("\n\n")
+
+
+def test_events_endpoint_404_for_unknown_game():
+    response = client.get("/api/games/fake-game-id/events")
+    assert response.status_code == 404
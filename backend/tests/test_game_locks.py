@@ -0,0 +1,180 @@
+"""Tests for per-game locks around mutating services (serialized actions, lock wait metrics)."""
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from db.database import Base, create_db_engine
+from models.game import Game, GameState
+from models.game_result import GameResult
+from models.game_set import GameSet
+from models.game_set_standing import GameSetStanding
+from models.player import Player
+from services import game_service, results_service, standings_service, voting_service, werewolf_service
+from services.game_locks import GameLocks
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    """Sessions on a file database, so threads can write concurrently as requests do."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'locks.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _start_game(Session, roles) -> tuple[str, dict[str, list[str]]]:
+    """Start a 3-player game dealt in order; returns the game id and player ids by initial role."""
+    with Session() as db:
+        game_set = GameSet(num_players=3, selected_roles=roles)
+        db.add(game_set)
+        db.flush()
+        for i in range(3):
+            player = Player(player_name=f"Player{i}")
+            db.add(player)
+            db.flush()
+            game_set.players.append(player)
+        db.commit()
+        game = game_service.start_game(db, game_set.game_set_id)
+        by_role: dict[str, list[str]] = {}
+        for pr in game.player_roles:
+            by_role.setdefault(pr.initial_role, []).append(pr.player_id)
+        return game.game_id, by_role
+
+
+def _run_together(Session, calls) -> list:
+    """Run each call(db) on its own thread and session, all released at once; returns results or exceptions."""
+    barrier = threading.Barrier(len(calls))
+
+    def run(call):
+        with Session() as db:
+            barrier.wait()
+            try:
+                return call(db)
+            except Exception as exc:
+                return exc
+
+    with ThreadPoolExecutor(len(calls)) as pool:
+        return list(pool.map(run, calls))
+
+
+def test_simultaneous_last_votes_end_the_game_once(sessions, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_id, by_role = _start_game(sessions, ["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"])
+    werewolf, (villager_a, villager_b) = by_role["Werewolf"][0], by_role["Villager"]
+    with sessions() as db:
+        db.get(Game, game_id).state = GameState.DAY_VOTING
+        db.commit()
+        voting_service.cast_vote(db, game_id, villager_a, werewolf)
+
+    results = _run_together(sessions, [
+        lambda db: voting_service.cast_vote(db, game_id, villager_b, werewolf),
+        lambda db: voting_service.cast_vote(db, game_id, werewolf, villager_a),
+    ])
+    assert results == [{"status": "vote_recorded"}] * 2
+
+    with sessions() as db:
+        assert db.get(Game, game_id).state == GameState.RESULTS
+        assert db.query(GameResult).filter(GameResult.game_id == game_id).count() == 1
+
+
+def test_first_reads_of_legacy_results_record_them_once(sessions, monkeypatch):
+    """A game that reached RESULTS before results were recorded gets one record, and counts once in standings."""
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_id, by_role = _start_game(sessions, ["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"])
+    with sessions() as db:
+        game = db.get(Game, game_id)
+        game.state = GameState.RESULTS
+        game_set_id = game.game_set_id
+        db.commit()
+
+    results = _run_together(sessions, [lambda db: results_service.get_results(db, game_id)] * 3)
+    assert not [r for r in results if isinstance(r, Exception)]
+    assert results[0] == results[1] == results[2]
+
+    with sessions() as db:
+        assert db.query(GameResult).filter(GameResult.game_id == game_id).count() == 1
+        standings = db.query(GameSetStanding).filter(GameSetStanding.game_set_id == game_set_id).all()
+        assert len(standings) == 3
+        assert {standing.games_played for standing in standings} == {1}
+
+
+def test_first_standings_reads_build_them_once(sessions, monkeypatch):
+    """Concurrent first reads of a set whose games finished before standings were kept build them once."""
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_id, _ = _start_game(sessions, ["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"])
+    with sessions() as db:
+        game = db.get(Game, game_id)
+        game.state = GameState.RESULTS
+        game_set_id = game.game_set_id
+        db.commit()
+        results_service.get_results(db, game_id)
+        # As recorded before standings existed
+        db.query(GameSetStanding).delete()
+        db.commit()
+
+    results = _run_together(sessions, [lambda db: standings_service.get_standings(db, game_set_id)] * 3)
+    assert not [r for r in results if isinstance(r, Exception)]
+    assert [r["games_played"] for r in results] == [1, 1, 1]
+
+    with sessions() as db:
+        standings = db.query(GameSetStanding).filter(GameSetStanding.game_set_id == game_set_id).all()
+        assert len(standings) == 3
+        assert {standing.games_played for standing in standings} == {1}
+
+
+def test_werewolves_acknowledging_together_complete_the_step_once(sessions, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_id, by_role = _start_game(sessions, ["Werewolf", "Werewolf", "Villager", "Villager", "Villager", "Villager"])
+    with sessions() as db:
+        version = db.get(Game, game_id).version
+
+    results = _run_together(sessions, [
+        lambda db, player_id=player_id: werewolf_service.acknowledge_werewolf(db, game_id, player_id)
+        for player_id in by_role["Werewolf"]
+    ])
+    assert not [r for r in results if isinstance(r, Exception)]
+
+    with sessions() as db:
+        game = db.get(Game, game_id)
+        assert game.state == GameState.DAY_DISCUSSION
+        # One bump per acknowledgement; the step advanced with the second
+        assert game.version == version + 2
+
+
+def test_locks_serialize_one_game_only():
+    locks = GameLocks()
+    inside = threading.Event()
+    release = threading.Event()
+
+    def hold_game_a():
+        with locks.hold("game-a", "test.first"):
+            inside.set()
+            release.wait(2)
+
+    holder = threading.Thread(target=hold_game_a)
+    holder.start()
+    inside.wait(2)
+
+    # Another game goes straight through, and a nested call on a held game doesn't wait on itself
+    with locks.hold("game-b", "test.other"):
+        with locks.hold("game-b", "test.nested"):
+            pass
+
+    threading.Timer(0.05, release.set).start()
+    with locks.hold("game-a", "test.second"):
+        assert release.is_set()
+    holder.join()
+    assert locks.locked_games() == 0
+
+    metrics = locks.render()
+    assert 'onw_game_lock_wait_seconds_count{service="test.second"} 1' in metrics
+    assert 'onw_game_lock_wait_seconds_count{service="test.other"} 1' in metrics
+    # Re-entered locks are not waited for, so not counted
+    assert 'service="test.nested"' not in metrics
+    assert 'onw_game_lock_wait_seconds_bucket{service="test.second",le="0.01"} 0' in metrics
+    assert "onw_game_locks_active 0" in metrics
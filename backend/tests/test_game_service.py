@@ -6,13 +6,15 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from models.game import Game, GameState
 from models.game_set import GameSet
 from models.player import Player
 from models.player_role import PlayerRole
 from models.center_card import CenterCard
-from services.game_service import start_game, get_player_role, _get_team_for_role
+from services.game_service import start_game, start_game_bulk, get_player_role
+from models.roles import team_for
 
 
 def test_start_game_creates_game(db: Session):
@@ -183,9 +185,11 @@ def test_start_game_randomizes_roles(db: Session):
         # Start the game
         game = start_game(db, game_set.game_set_id)
 
-        # Get first player's role
-        player_roles = db.query(PlayerRole).filter(PlayerRole.game_id == game.game_id).all()
-        first_role = player_roles[0].initial_role
+        # Get first player's role (by player: the rows' order is up to the index SQLite picks)
+        first_role = db.query(PlayerRole).filter(
+            PlayerRole.game_id == game.game_id,
+            PlayerRole.player_id == game_set.players[0].player_id
+        ).one().initial_role
         role_assignments.append(first_role)
 
     # With 6 different roles and 5 runs, we should see at least 2 different assignments
@@ -319,12 +323,60 @@ def test_get_player_role_raises_error_if_not_found(db: Session):
 
 
 def test_get_team_for_role():
-    """Test _get_team_for_role helper function."""
-    assert _get_team_for_role("Werewolf") == "werewolf"
-    assert _get_team_for_role("Minion") == "werewolf"
-    assert _get_team_for_role("Tanner") == "tanner"
-    assert _get_team_for_role("Villager") == "village"
-    assert _get_team_for_role("Seer") == "village"
-    assert _get_team_for_role("Robber") == "village"
-    assert _get_team_for_role("Hunter") == "village"
-    assert _get_team_for_role("Mason") == "village"
+    """Test the role registry's team lookup."""
+    assert team_for("Werewolf") == "werewolf"
+    assert team_for("Minion") == "werewolf"
+    assert team_for("Tanner") == "tanner"
+    assert team_for("Villager") == "village"
+    assert team_for("Seer") == "village"
+    assert team_for("Robber") == "village"
+    assert team_for("Hunter") == "village"
+    assert team_for("Mason") == "village"
+
+
+def _game_set_with_players(db: Session, roles) -> GameSet:
+    game_set = GameSet(num_players=len(roles) - 3, selected_roles=roles, discussion_timer_seconds=300)
+    db.add(game_set)
+    db.flush()
+    for i in range(game_set.num_players):
+        player = Player(player_name=f"Player{i+1}")
+        db.add(player)
+        db.flush()
+        game_set.players.append(player)
+    db.commit()
+    return game_set
+
+
+def test_start_game_bulk_statement_count_does_not_grow_with_players(db: Session):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    counts = []
+    for roles in (
+        ["Werewolf", "Villager", "Seer", "Robber", "Minion", "Tanner"],
+        ["Werewolf", "Werewolf", "Villager", "Villager", "Seer", "Robber", "Troublemaker", "Drunk", "Insomniac", "Mason", "Mason"],
+    ):
+        game_set = _game_set_with_players(db, roles)
+        statements.clear()
+        event.listen(db.get_bind(), "before_cursor_execute", count)
+        game = start_game_bulk(db, game_set.game_set_id)
+        event.remove(db.get_bind(), "before_cursor_execute", count)
+        counts.append(len(statements))
+
+        assert game["state"] == "NIGHT"
+        assert game["version"] == 1
+        assert game["current_role_step"] == game["active_roles"][0]
+        assert db.query(PlayerRole).filter(PlayerRole.game_id == game["game_id"]).count() == len(roles) - 3
+        assert db.query(CenterCard).filter(CenterCard.game_id == game["game_id"]).count() == 3
+
+    assert counts[0] == counts[1]
+
+
+def test_start_game_bulk_returns_existing_active_game(db: Session):
+    game_set = _game_set_with_players(db, ["Werewolf", "Villager", "Seer", "Robber", "Minion", "Tanner"])
+    first = start_game_bulk(db, game_set.game_set_id)
+    again = start_game_bulk(db, game_set.game_set_id)
+    assert again["game_id"] == first["game_id"]
+    assert again["game_number"] == 1
@@ -0,0 +1,107 @@
+"""Tests for the per-player game snapshot endpoint."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from services import game_service
+
+client = TestClient(app)
+
+
+def _no_shuffle(items):
+    return None
+
+
+def _start_game(roles):
+    game_set_response = client.post("/api/game-sets", json={
+        "num_players": 3,
+        "selected_roles": roles,
+        "discussion_timer_seconds": 300
+    })
+    game_set_id = game_set_response.json()["game_set_id"]
+    player_ids = []
+    for i in range(3):
+        player = client.post("/api/players", json={"player_name": f"Player{i}"}).json()
+        client.post(f"/api/game-sets/{game_set_id}/players/{player['player_id']}/join")
+        player_ids.append(player["player_id"])
+    start_response = client.post(f"/api/game-sets/{game_set_id}/start")
+    game_id = start_response.json()["game_id"]
+    role_map = {
+        pid: client.get(f"/api/games/{game_id}/players/{pid}/role").json()["current_role"]
+        for pid in player_ids
+    }
+    return game_id, player_ids, role_map
+
+
+def test_snapshot_combines_polled_views(monkeypatch):
+    """Snapshot returns the same data as the individual polled endpoints."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game_id, player_ids, role_map = _start_game(
+        ["Werewolf", "Werewolf", "Seer", "Villager", "Villager", "Villager"]
+    )
+    werewolf_id = next(pid for pid, r in role_map.items() if r == "Werewolf")
+
+    response = client.get(f"/api/games/{game_id}/players/{werewolf_id}/snapshot")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["game"]["game_id"] == game_id
+    assert data["game"]["state"] == "NIGHT"
+    assert data["game"]["all_players_acknowledged_roles"] is False
+    assert data["player_role"]["player_id"] == werewolf_id
+    assert data["player_role"]["initial_role"] == "Werewolf"
+    assert data["players"]["current_count"] == 3
+    assert {p["player_id"] for p in data["players"]["players"]} == set(player_ids)
+    assert data["night_status"] == client.get(f"/api/games/{game_id}/night-status").json()
+    assert data["night_status"]["current_role"] == "Werewolf"
+    assert data["available_actions"] == client.get(
+        f"/api/games/{game_id}/players/{werewolf_id}/available-actions"
+    ).json()
+    assert data["night_info"]["is_lone_wolf"] is False
+    assert data["discussion_status"] is None
+    assert data["votes"]["votes_cast"] == 0
+    assert data["votes"]["total_players"] == 3
+
+
+def test_snapshot_night_info_only_on_own_step(monkeypatch):
+    """Players whose role is not acting get no night info."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game_id, player_ids, role_map = _start_game(
+        ["Werewolf", "Werewolf", "Seer", "Villager", "Villager", "Villager"]
+    )
+    seer_id = next(pid for pid, r in role_map.items() if r == "Seer")
+
+    data = client.get(f"/api/games/{game_id}/players/{seer_id}/snapshot").json()
+    assert data["night_info"] is None
+    assert data["available_actions"]["actionable_players"] == []
+    assert data["actions"] == []
+
+
+def test_snapshot_includes_discussion_status_after_night(monkeypatch):
+    """After the night ends, snapshot includes discussion status with vote-now counts."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game_id, player_ids, role_map = _start_game(
+        ["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"]
+    )
+    werewolf_id = next(pid for pid, r in role_map.items() if r == "Werewolf")
+    client.get(f"/api/games/{game_id}/night-status")
+    client.post(f"/api/games/{game_id}/players/{werewolf_id}/view-center", json={"card_index": 0})
+
+    data = client.get(f"/api/games/{game_id}/players/{player_ids[0]}/snapshot").json()
+    assert data["game"]["state"] == "DAY_DISCUSSION"
+    assert data["discussion_status"]["state"] == "DAY_DISCUSSION"
+    assert data["discussion_status"]["current_player_voted_now"] is False
+    assert data["night_info"] is None
+
+
+def test_snapshot_404_for_unknown_game_or_player(monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game_id, _, _ = _start_game(
+        ["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"]
+    )
+    assert client.get("/api/games/fake-game-id/players/fake-player/snapshot").status_code == 404
+    assert client.get(f"/api/games/{game_id}/players/fake-player/snapshot").status_code == 404
@@ -1,4 +1,7 @@
+import inspect
 import sys
+import threading
+import time
 from pathlib import Path
 
 # Add parent directory to path so we can import main
@@ -6,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fastapi.testclient import TestClient
 from main import app
+from services import game_service, version_watch
 
 client = TestClient(app)
 
@@ -97,3 +101,160 @@ def test_each_player_gets_different_role():
 
     # All 3 roles should be assigned (from the 6 available, 3 go to players, 3 to center)
     assert len(roles) == 3
+
+
+def test_polling_endpoints_do_not_use_threadpool():
+    """Read endpoints polled by clients are async so they never hold a threadpool worker."""
+    polled = {
+        "/api/games/{game_id}",
+        "/api/games/{game_id}/night-status",
+        "/api/games/{game_id}/discussion-status",
+        "/api/games/{game_id}/votes",
+        "/api/games/{game_id}/players/{player_id}/snapshot",
+        "/api/games/{game_id}/players/{player_id}/available-actions",
+        "/api/games/{game_id}/players/{player_id}/actions",
+        "/api/game-sets/{game_set_id}/players",
+    }
+    endpoints = {route.path: route.endpoint for route in app.routes if "GET" in getattr(route, "methods", ())}
+    for path in polled:
+        assert inspect.iscoroutinefunction(endpoints[path]), path
+
+
+def _start_three_player_game(roles):
+    game_set_id = client.post("/api/game-sets", json={
+        "num_players": 3,
+        "selected_roles": roles,
+        "discussion_timer_seconds": 300
+    }).json()["game_set_id"]
+    player_ids = []
+    for i in range(3):
+        player = client.post("/api/players", json={"player_name": f"Player{i}"}).json()
+        client.post(f"/api/game-sets/{game_set_id}/players/{player['player_id']}/join")
+        player_ids.append(player["player_id"])
+    game_id = client.post(f"/api/game-sets/{game_set_id}/start").json()["game_id"]
+    return game_id, player_ids
+
+
+def test_unchanged_game_returns_304():
+    game_id, player_ids = _start_three_player_game(["Werewolf", "Werewolf", "Villager", "Villager", "Villager", "Villager"])
+    for path in (f"/api/games/{game_id}", f"/api/games/{game_id}/night-status",
+                 f"/api/games/{game_id}/votes", f"/api/games/{game_id}/players/{player_ids[0]}/actions"):
+        first = client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        again = client.get(path, headers={"If-None-Match": etag})
+        assert again.status_code == 304, path
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+
+def test_state_change_bumps_etag(monkeypatch):
+    # Deal in order, so players hold the Werewolves
+    monkeypatch.setattr("services.game_service.random.shuffle", lambda items: None)
+    game_id, player_ids = _start_three_player_game(["Werewolf", "Werewolf", "Villager", "Villager", "Villager", "Villager"])
+    first = client.get(f"/api/games/{game_id}/night-status")
+    etag = first.headers["etag"]
+
+    werewolf_id = next(
+        pid for pid in player_ids
+        if client.get(f"/api/games/{game_id}/players/{pid}/role").json()["initial_role"] == "Werewolf"
+    )
+    assert client.post(f"/api/games/{game_id}/players/{werewolf_id}/acknowledge").status_code == 200
+
+    after = client.get(f"/api/games/{game_id}/night-status", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+
+
+def test_etag_for_unknown_game_is_404():
+    assert client.get("/api/games/fake-game-id/night-status", headers={"If-None-Match": '"v0"'}).status_code == 404
+
+
+def _werewolf_id(game_id, player_ids):
+    return next(
+        pid for pid in player_ids
+        if client.get(f"/api/games/{game_id}/players/{pid}/role").json()["initial_role"] == "Werewolf"
+    )
+
+
+def test_long_poll_returns_when_night_advances(monkeypatch):
+    monkeypatch.setattr("services.game_service.random.shuffle", lambda items: None)
+    game_id, player_ids = _start_three_player_game(["Werewolf", "Werewolf", "Villager", "Villager", "Villager", "Villager"])
+    status = client.get(f"/api/games/{game_id}/night-status").json()
+    werewolf_id = _werewolf_id(game_id, player_ids)
+
+    result = {}
+
+    def long_poll():
+        started = time.monotonic()
+        result["response"] = client.get(
+            f"/api/games/{game_id}/night-status",
+            params={"wait_for_version": status["version"], "timeout": 10},
+        )
+        result["elapsed"] = time.monotonic() - started
+
+    poller = threading.Thread(target=long_poll)
+    poller.start()
+    deadline = time.monotonic() + 5
+    while version_watch.watcher.waiter_count(game_id) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.post(f"/api/games/{game_id}/players/{werewolf_id}/acknowledge").status_code == 200
+    poller.join(10)
+
+    response = result["response"]
+    assert response.status_code == 200
+    assert response.json()["version"] > status["version"]
+    assert result["elapsed"] < 5
+    assert version_watch.watcher.waiter_count(game_id) == 0
+
+
+def test_long_poll_returns_immediately_when_already_changed():
+    game_id, _ = _start_three_player_game(["Werewolf", "Werewolf", "Villager", "Villager", "Villager", "Villager"])
+    started = time.monotonic()
+    response = client.get(f"/api/games/{game_id}/night-status", params={"wait_for_version": -1, "timeout": 10})
+    assert response.status_code == 200
+    assert time.monotonic() - started < 5
+
+
+def test_long_poll_times_out_with_unchanged_status():
+    game_id, _ = _start_three_player_game(["Werewolf", "Werewolf", "Villager", "Villager", "Villager", "Villager"])
+    status = client.get(f"/api/games/{game_id}/night-status").json()
+    started = time.monotonic()
+    response = client.get(
+        f"/api/games/{game_id}/night-status",
+        params={"wait_for_version": status["version"], "timeout": 0.3},
+    )
+    assert time.monotonic() - started >= 0.3
+    assert response.status_code == 200
+    assert response.json() == status
+    assert client.get("/api/games/fake-game-id/discussion-status", params={"wait_for_version": 0, "timeout": 1}).status_code == 404
+
+
+def test_simultaneous_werewolf_acknowledgements_advance_once(monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    # Unshuffled: both Werewolves go to players, the Seer to the third player
+    game_id, player_ids = _start_three_player_game(["Werewolf", "Werewolf", "Seer", "Villager", "Villager", "Villager"])
+    werewolf_ids = [
+        pid for pid in player_ids
+        if client.get(f"/api/games/{game_id}/players/{pid}/role").json()["initial_role"] == "Werewolf"
+    ]
+    barrier = threading.Barrier(2)
+    responses = []
+
+    def acknowledge(player_id):
+        barrier.wait()
+        responses.append(client.post(f"/api/games/{game_id}/players/{player_id}/acknowledge"))
+
+    threads = [threading.Thread(target=acknowledge, args=(pid,)) for pid in werewolf_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert [r.status_code for r in responses] == [200, 200]
+    status = client.get(f"/api/games/{game_id}/night-status").json()
+    assert status["current_role"] == "Seer"
+    assert status["roles_completed"] == ["Werewolf"]
+    for player_id in werewolf_ids:
+        actions = client.get(f"/api/games/{game_id}/players/{player_id}/actions").json()["actions"]
+        assert len(actions) == 1
@@ -11,13 +11,14 @@ from models.game import Game, GameState
 from models.game_set import GameSet
 from models.player import Player
 from models.player_role import PlayerRole
+from services import night_service, werewolf_service
 from services.game_service import start_game
 from services.night_service import (
     initialize_night_phase,
     get_night_status,
     mark_role_complete,
-    NIGHT_WAKE_ORDER
 )
+from models.roles import WAKE_ORDER
 
 
 @pytest.fixture
@@ -82,7 +83,7 @@ def test_night_phase_wake_order(db: Session, sample_game: Game):
     # The first role should be from the wake order
     # Find the first role in wake order that's actually in the game
     expected_first_role = None
-    for role in NIGHT_WAKE_ORDER:
+    for role in WAKE_ORDER:
         if role in status["roles_in_game"]:
             expected_first_role = role
             break
@@ -199,3 +200,21 @@ def test_roles_not_in_game_are_skipped(db: Session):
     # (They might be in center, but we still call them in wake order)
     # Actually, let's check that we only include roles that players have
     # For now, the service should track which roles are actually assigned
+
+
+def test_stranded_night_is_woken_at_startup_not_by_reads(db: Session, sample_game: Game):
+    """A NIGHT game without a role step (started by older code) is left alone by night-info and woken by the startup pass."""
+    sample_game.current_role_step = None
+    sample_game.simulated_role_started_at = None
+    db.commit()
+    version = sample_game.version
+    player_role = db.query(PlayerRole).filter(PlayerRole.game_id == sample_game.game_id).first()
+    werewolf_service.get_night_info(db, sample_game.game_id, player_role.player_id)
+    db.refresh(sample_game)
+    assert sample_game.current_role_step is None
+    assert sample_game.version == version
+
+    assert night_service.start_stranded_nights(db) == [sample_game.game_id]
+    db.refresh(sample_game)
+    assert sample_game.current_role_step == sample_game.active_roles[0]
+    assert night_service.start_stranded_nights(db) == []
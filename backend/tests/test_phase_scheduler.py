@@ -0,0 +1,146 @@
+"""Tests for the phase scheduler (timed simulated roles and discussion timer)."""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.orm import Session
+from models.game import GameState
+from models.game_set import GameSet
+from models.player import Player
+from services import game_service, night_service, phase_scheduler, timer_service
+from services.phase_scheduler import PhaseScheduler, TICK_SECONDS
+
+
+def _no_shuffle(items):
+    return None
+
+
+def _start_game(db: Session, roles, discussion_timer_seconds=300):
+    game_set = GameSet(
+        num_players=3,
+        selected_roles=roles,
+        discussion_timer_seconds=discussion_timer_seconds
+    )
+    db.add(game_set)
+    db.flush()
+    for i in range(3):
+        player = Player(player_name=f"Player{i}")
+        db.add(player)
+        db.flush()
+        game_set.players.append(player)
+    db.commit()
+    return game_service.start_game(db, game_set.game_set_id)
+
+
+async def test_scheduler_fires_due_games_and_reschedules():
+    fired = []
+
+    def on_due(db, game_id):
+        fired.append(game_id)
+        # First firing of game-a chains another deadline
+        if fired.count("game-a") == 1:
+            return datetime.utcnow()
+        return None
+
+    scheduler = PhaseScheduler()
+    await scheduler.start(on_due, lambda db: {"game-a": datetime.utcnow()})
+    try:
+        scheduler.schedule("game-b", datetime.utcnow() + timedelta(hours=1))
+        await asyncio.sleep(TICK_SECONDS * 5)
+        assert fired.count("game-a") == 2
+        assert "game-b" not in fired
+        assert set(scheduler.pending()) == {"game-b"}
+    finally:
+        await scheduler.stop()
+
+
+async def test_schedule_replaces_previous_deadline():
+    scheduler = PhaseScheduler()
+    await scheduler.start(lambda db, game_id: None, lambda db: {})
+    try:
+        scheduler.schedule("game-a", datetime.utcnow() + timedelta(hours=1))
+        scheduler.schedule("game-a", datetime.utcnow() + timedelta(hours=2))
+        assert len(scheduler.pending()) == 1
+        scheduler.cancel("game-a")
+        assert scheduler.pending() == {}
+    finally:
+        await scheduler.stop()
+
+
+async def test_scheduler_picks_up_deadlines_set_by_other_processes(monkeypatch):
+    monkeypatch.setattr(phase_scheduler, "RESYNC_SECONDS", TICK_SECONDS)
+    in_db = {}
+    scheduler = PhaseScheduler()
+    await scheduler.start(lambda db, game_id: None, lambda db: dict(in_db))
+    try:
+        scheduler.schedule("game-a", datetime.utcnow() + timedelta(hours=1))
+        # Another process puts game-b on a timer; game-a's row still shows an older deadline
+        in_db.update({"game-a": datetime.utcnow(), "game-b": datetime.utcnow() + timedelta(hours=2)})
+        await asyncio.sleep(TICK_SECONDS * 4)
+        assert set(scheduler.pending()) == {"game-a", "game-b"}
+        # game-a keeps the deadline this process set
+        assert scheduler.pending()["game-a"] > time.time() + 1800
+    finally:
+        await scheduler.stop()
+
+
+def test_schedule_is_noop_when_not_running():
+    scheduler = PhaseScheduler()
+    scheduler.schedule("game-a", datetime.utcnow())
+    assert scheduler.pending() == {}
+
+
+def test_simulated_role_advances_when_due(db: Session, monkeypatch):
+    """A center-card role auto-completes once its deadline has passed."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    # Seer is in the center, so it is simulated after the Werewolf step
+    game = _start_game(db, ["Werewolf", "Villager", "Villager", "Seer", "Villager", "Villager"])
+    werewolf_pr = next(pr for pr in game.player_roles if pr.initial_role == "Werewolf")
+    night_service.mark_role_complete(db, game.game_id, werewolf_pr.initial_role)
+    db.refresh(game)
+    assert game.current_role_step == "Seer"
+
+    deadline = timer_service.get_next_deadline(db, game)
+    assert deadline is not None
+    assert timer_service.load_pending_deadlines(db)[game.game_id] == deadline
+
+    # Not yet due: nothing happens
+    assert timer_service.run_due_transition(db, game.game_id) == deadline
+    db.refresh(game)
+    assert game.current_role_step == "Seer"
+
+    game.simulated_role_started_at = datetime.utcnow() - timedelta(seconds=60)
+    db.commit()
+    next_deadline = timer_service.run_due_transition(db, game.game_id)
+    db.refresh(game)
+    assert game.state == GameState.DAY_DISCUSSION
+    # Next deadline is the discussion timer
+    assert next_deadline == game.discussion_started_at + timedelta(seconds=300)
+
+
+def test_discussion_timer_transitions_when_due(db: Session, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"])
+    werewolf_pr = next(pr for pr in game.player_roles if pr.initial_role == "Werewolf")
+    night_service.mark_role_complete(db, game.game_id, werewolf_pr.initial_role)
+    db.refresh(game)
+    assert game.state == GameState.DAY_DISCUSSION
+
+    game.discussion_started_at = datetime.utcnow() - timedelta(seconds=301)
+    db.commit()
+    assert timer_service.run_due_transition(db, game.game_id) is None
+    db.refresh(game)
+    assert game.state == GameState.DAY_VOTING
+    assert game.game_id not in timer_service.load_pending_deadlines(db)
+
+
+def test_start_game_wakes_first_role(db: Session, monkeypatch):
+    """Night is initialized at start so GET night-status never has to write."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game = _start_game(db, ["Werewolf", "Seer", "Villager", "Villager", "Villager", "Villager"])
+    assert game.current_role_step == "Werewolf"
+    assert game.simulated_role_started_at is None
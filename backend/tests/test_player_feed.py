@@ -0,0 +1,116 @@
+"""Tests for the per-player WebSocket feed."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from main import app
+from services import game_service
+
+client = TestClient(app)
+
+
+def _no_shuffle(items):
+    return None
+
+
+def _start_game(roles):
+    game_set_response = client.post("/api/game-sets", json={
+        "num_players": 3,
+        "selected_roles": roles,
+        "discussion_timer_seconds": 300
+    })
+    game_set_id = game_set_response.json()["game_set_id"]
+    player_ids = []
+    for i in range(3):
+        player = client.post("/api/players", json={"player_name": f"Player{i}"}).json()
+        client.post(f"/api/game-sets/{game_set_id}/players/{player['player_id']}/join")
+        player_ids.append(player["player_id"])
+    start_response = client.post(f"/api/game-sets/{game_set_id}/start")
+    game_id = start_response.json()["game_id"]
+    role_map = {
+        pid: client.get(f"/api/games/{game_id}/players/{pid}/role").json()["current_role"]
+        for pid in player_ids
+    }
+    return game_id, player_ids, role_map
+
+
+def _receive_until(ws, message_type):
+    """Collect messages up to and including the first one of message_type."""
+    messages = []
+    while True:
+        message = ws.receive_json()
+        messages.append(message)
+        if message["type"] == message_type:
+            return messages
+
+
+def test_feed_sends_snapshot_on_connect(monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game_id, player_ids, _ = _start_game(
+        ["Werewolf", "Seer", "Robber", "Villager", "Villager", "Villager"]
+    )
+    with client.websocket_connect(f"/ws/games/{game_id}/players/{player_ids[0]}") as ws:
+        snapshot = ws.receive_json()
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["game"]["game_id"] == game_id
+    assert snapshot["player_role"]["player_id"] == player_ids[0]
+
+
+def test_feed_rejects_player_not_in_game(monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game_id, _, _ = _start_game(
+        ["Werewolf", "Seer", "Robber", "Villager", "Villager", "Villager"]
+    )
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/ws/games/{game_id}/players/fake-player") as ws:
+            ws.receive_json()
+
+
+def test_robber_result_only_sent_to_robber(monkeypatch):
+    """Robber gets a turn-start delta and their new role; other players only see broadcasts."""
+    monkeypatch.setattr(game_service.random, "shuffle", _no_shuffle)
+    game_id, player_ids, role_map = _start_game(
+        ["Werewolf", "Seer", "Robber", "Villager", "Villager", "Villager"]
+    )
+    werewolf_id = next(pid for pid, r in role_map.items() if r == "Werewolf")
+    seer_id = next(pid for pid, r in role_map.items() if r == "Seer")
+    robber_id = next(pid for pid, r in role_map.items() if r == "Robber")
+
+    with client.websocket_connect(f"/ws/games/{game_id}/players/{robber_id}") as robber_ws, \
+            client.websocket_connect(f"/ws/games/{game_id}/players/{seer_id}") as seer_ws:
+        # Snapshot initializes the night (Werewolf step)
+        assert robber_ws.receive_json()["type"] == "snapshot"
+        assert seer_ws.receive_json()["type"] == "snapshot"
+
+        client.post(f"/api/games/{game_id}/players/{werewolf_id}/acknowledge")
+        client.post(
+            f"/api/games/{game_id}/players/{seer_id}/seer-action",
+            json={"action_type": "view_center", "card_indices": [0, 1]}
+        )
+        robber_turn = _receive_until(robber_ws, "your_turn")[-1]
+        assert robber_turn["role"] == "Robber"
+        assert {p["player_id"] for p in robber_turn["available_actions"]["actionable_players"]} == {
+            werewolf_id, seer_id
+        }
+
+        client.post(
+            f"/api/games/{game_id}/players/{robber_id}/robber-action",
+            json={"target_player_id": werewolf_id}
+        )
+        robber_messages = _receive_until(robber_ws, "actions")
+        result = next(m for m in robber_messages if m["type"] == "night_result")
+        assert result["new_role"] == "Werewolf"
+        assert any("You are now: Werewolf" in a["description"] for a in robber_messages[-1]["actions"])
+
+        # Drain the Seer's feed through the end of the night
+        seer_messages = _receive_until(seer_ws, "night_step")
+        while seer_messages[-1].get("state") != "DAY_DISCUSSION":
+            seer_messages += _receive_until(seer_ws, "night_step")
+
+    seer_results = [m for m in seer_messages if m["type"] == "night_result"]
+    assert all(m["role"] == "Seer" for m in seer_results)
+    assert not any("new_role" in m for m in seer_messages)
@@ -0,0 +1,75 @@
+"""Tests for request timing / SQL instrumentation (Server-Timing headers and /metrics)."""
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+from main import app
+from db.database import QueryStats
+from services.request_metrics import RequestMetrics
+
+client = TestClient(app)
+
+SERVER_TIMING = re.compile(r'total;dur=[\d.]+, sql;dur=[\d.]+;desc="(\d+) statements, (\d+) commits"')
+
+
+def _server_timing(response):
+    match = SERVER_TIMING.fullmatch(response.headers["server-timing"])
+    assert match, response.headers["server-timing"]
+    return int(match.group(1)), int(match.group(2))
+
+
+def test_server_timing_header_without_sql():
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert _server_timing(response) == (0, 0)
+
+
+def test_server_timing_counts_statements_and_commits():
+    response = client.post("/api/game-sets", json={
+        "num_players": 3,
+        "selected_roles": ["Werewolf", "Werewolf", "Seer", "Robber", "Villager", "Villager"],
+        "discussion_timer_seconds": 300,
+    })
+    assert response.status_code == 201
+    statements, commits = _server_timing(response)
+    assert statements >= 1
+    assert commits == 1
+
+    # Reads on the async read engine are counted too
+    game_set_id = response.json()["game_set_id"]
+    players = client.get(f"/api/game-sets/{game_set_id}/players")
+    assert _server_timing(players)[0] >= 1
+
+
+def test_metrics_endpoint_reports_route_templates():
+    created = client.post("/api/players", json={"player_name": "Metrics"})
+    client.get(f"/api/players/{created.json()['player_id']}")
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'onw_http_requests_total{method="GET",route="/api/players/{player_id}",status="200"}' in body
+    assert 'onw_http_requests_total{method="GET",route="unmatched",status="404"}' in body
+    assert re.search(r'onw_http_request_commits_total\{method="POST",route="/api/players"\} [1-9]', body)
+    assert re.search(r'onw_http_request_sql_statements_total\{method="GET",route="/api/players/\{player_id\}"\} [1-9]', body)
+    # Player IDs never become labels
+    assert created.json()["player_id"] not in body
+
+
+def test_render_histogram_is_cumulative():
+    metrics = RequestMetrics()
+    for seconds in (0.004, 0.02, 0.02, 120.0):
+        metrics.observe("GET", "/api/games/{game_id}", 200, seconds, QueryStats(statements=2, seconds=0.001, commits=0))
+    body = metrics.render()
+    labels = 'method="GET",route="/api/games/{game_id}"'
+    assert f'onw_http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in body
+    assert f'onw_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 3' in body
+    assert f'onw_http_request_duration_seconds_bucket{{{labels},le="60.0"}} 3' in body
+    assert f'onw_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in body
+    assert f"onw_http_request_duration_seconds_count{{{labels}}} 4" in body
+    assert f"onw_http_request_sql_statements_total{{{labels}}} 8" in body
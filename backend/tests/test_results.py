@@ -6,12 +6,24 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from main import app
-from services import game_service
+from models.game import GameState
+from models.game_result import GameResult
+from models.game_set import GameSet
+from models.player import Player
+from services import game_service, results_service, voting_service
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True, scope="module")
+def phase_scheduler_running():
+    """Run the app lifespan so the phase scheduler fires the discussion timer."""
+    with client:
+        yield
+
+
 def _play_game_to_results(player_names, votes):
     """votes: list of (voter_index, target_index) into player_ids. Returns (game_id, player_ids)."""
     game_set_response = client.post("/api/game-sets", json={
@@ -92,3 +104,43 @@ def test_results_404_when_not_results():
     game_id = start_response.json()["game_id"]
     response = client.get(f"/api/games/{game_id}/results")
     assert response.status_code == 404
+
+
+def test_results_recorded_once_at_transition(db, monkeypatch):
+    """Results are computed when the last vote lands; later reads never recompute or write."""
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_set = GameSet(num_players=3, selected_roles=["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"])
+    db.add(game_set)
+    db.flush()
+    for i in range(3):
+        player = Player(player_name=f"Player{i}")
+        db.add(player)
+        db.flush()
+        game_set.players.append(player)
+    db.commit()
+    game = game_service.start_game(db, game_set.game_set_id)
+    game.state = GameState.DAY_VOTING
+    db.commit()
+    werewolf_id = next(pr.player_id for pr in game.player_roles if pr.initial_role == "Werewolf")
+    villager_ids = [pr.player_id for pr in game.player_roles if pr.player_id != werewolf_id]
+
+    voting_service.cast_vote(db, game.game_id, villager_ids[0], werewolf_id)
+    voting_service.cast_vote(db, game.game_id, villager_ids[1], werewolf_id)
+    assert db.query(GameResult).filter(GameResult.game_id == game.game_id).first() is None
+    voting_service.cast_vote(db, game.game_id, werewolf_id, villager_ids[0])
+
+    record = db.query(GameResult).filter(GameResult.game_id == game.game_id).first()
+    assert record.results["winning_team"] == "village"
+    assert record.results["deaths"] == [werewolf_id]
+
+    monkeypatch.setattr(results_service, "compute_results", None)  # would raise if called
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        first = results_service.get_results(db, game.game_id)
+        second = results_service.get_results(db, game.game_id)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    assert first == second == record.results
+    assert not any(s.lstrip().upper().startswith(("UPDATE", "INSERT")) for s in statements)
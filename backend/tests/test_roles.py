@@ -0,0 +1,45 @@
+"""Tests for the role registry."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from pydantic import ValidationError
+from models import roles
+from models.roles import Role
+from models.schemas import GameSetCreate
+# Role services register their night handlers on import
+import main  # noqa: F401
+
+
+def test_wake_order_matches_official_order():
+    assert roles.WAKE_ORDER == (
+        "Doppelganger", "Werewolf", "Minion", "Mason", "Seer",
+        "Robber", "Troublemaker", "Drunk", "Insomniac",
+    )
+
+
+def test_wake_plan_orders_waking_roles_once():
+    plan = roles.wake_plan(["Villager", "Insomniac", "Werewolf", "Seer", "Werewolf", "Tanner", "Hunter"])
+    assert plan == ["Werewolf", "Seer", "Insomniac"]
+    assert roles.wake_plan(["Villager", "Tanner"]) == []
+
+
+def test_get_unknown_role():
+    assert roles.get("Werewolf").role is Role.WEREWOLF
+    assert roles.get("Vampire") is None
+    assert roles.get(None) is None
+    assert roles.team_for("Vampire") == "village"
+
+
+def test_night_handlers_registered():
+    with_info = {d.role.value for d in roles.ROLES.values() if d.night_info is not None}
+    with_acknowledge = {d.role.value for d in roles.ROLES.values() if d.acknowledge is not None}
+    assert with_info == with_acknowledge == {"Werewolf", "Minion", "Mason", "Insomniac"}
+
+
+def test_game_set_accepts_only_playable_roles():
+    assert "Doppelganger" not in roles.VALID_ROLES
+    with pytest.raises(ValidationError, match="Invalid role: Doppelganger"):
+        GameSetCreate(num_players=3, selected_roles=["Doppelganger", "Werewolf", "Seer", "Villager", "Villager", "Villager"])
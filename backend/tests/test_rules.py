@@ -0,0 +1,73 @@
+"""Tests for the database-free rules core (night moves, deaths, win conditions)."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from services import rules
+from services.rules import Table
+
+
+def test_night_moves_on_a_table():
+    table = Table(["Robber", "Werewolf", "Troublemaker", "Drunk"], ["Seer", "Villager", "Tanner"])
+
+    assert rules.seer_view_player(table, 0, 1) == "Werewolf"
+    assert rules.seer_view_center(table, [2, 0]) == [(0, "Seer"), (2, "Tanner")]
+
+    assert rules.rob(table, 0, 1) == "Werewolf"
+    rules.troublemake(table, 2, 0, 3)
+    rules.drink(table, 3, 1)
+    # The Robber took the Werewolf, the Troublemaker moved it to the Drunk's seat, the Drunk drank it away
+    assert table.current_roles == ["Drunk", "Robber", "Troublemaker", "Villager"]
+    assert table.center == ["Seer", "Werewolf", "Tanner"]
+
+
+@pytest.mark.parametrize("move, message", [
+    (lambda t: rules.seer_view_player(t, 0, 0), "own card"),
+    (lambda t: rules.seer_view_center(t, [1, 1]), "two different"),
+    (lambda t: rules.rob(t, 1, 1), "themselves"),
+    (lambda t: rules.troublemake(t, 0, 0, 1), "their own card"),
+    (lambda t: rules.troublemake(t, 0, 2, 2), "two different players"),
+    (lambda t: rules.drink(t, 0, 3), "0, 1, or 2"),
+])
+def test_invalid_night_moves_raise(move, message):
+    table = Table(["Seer", "Robber", "Villager"], ["Werewolf", "Werewolf", "Drunk"])
+    with pytest.raises(ValueError, match=message):
+        move(table)
+
+
+def test_nobody_dies_without_two_votes():
+    assert rules.resolve_deaths({"a": "b", "b": "c", "c": "a"}, {"a": "Villager", "b": "Villager", "c": "Werewolf"}) == []
+
+
+def test_tied_players_all_die():
+    votes = {"a": "b", "b": "a", "c": "a", "d": "b"}
+    assert sorted(rules.resolve_deaths(votes, dict.fromkeys(votes, "Villager"))) == ["a", "b"]
+
+
+def test_hunter_chain_follows_dead_hunters():
+    votes = {"a": "b", "b": "c", "c": "d", "d": "b"}
+    current_roles = {"a": "Villager", "b": "Hunter", "c": "Hunter", "d": "Werewolf"}
+    # b is voted out; b (Hunter) takes c; c (Hunter) takes d
+    assert rules.resolve_deaths(votes, current_roles) == ["b", "c", "d"]
+
+
+@pytest.mark.parametrize("deaths, current_roles, expected", [
+    (["t", "w"], {"t": "Tanner", "w": "Werewolf", "v": "Villager"}, rules.TANNER),
+    (["w"], {"t": "Tanner", "w": "Werewolf", "v": "Villager"}, rules.VILLAGE),
+    (["v"], {"t": "Tanner", "w": "Werewolf", "v": "Villager"}, rules.WEREWOLF),
+    (["v"], {"m": "Minion", "v": "Villager", "s": "Seer"}, rules.MINION),
+    (["m"], {"m": "Minion", "v": "Villager", "s": "Seer"}, rules.WEREWOLF),
+    ([], {"v": "Villager", "s": "Seer", "r": "Robber"}, rules.WEREWOLF),
+])
+def test_winning_team(deaths, current_roles, expected):
+    assert rules.winning_team(deaths, current_roles) == expected
+
+
+def test_player_won_uses_final_card_for_tanner_and_minion():
+    assert rules.player_won(rules.TANNER, "village", "Tanner")
+    assert not rules.player_won(rules.TANNER, "tanner", "Villager")
+    assert rules.player_won(rules.WEREWOLF, "village", "Minion")
+    assert rules.player_won(rules.VILLAGE, "village", "Werewolf")
+    assert not rules.player_won(rules.MINION, "werewolf", "Villager")
@@ -0,0 +1,133 @@
+"""Tests for game set sharding: the hash ring, shard-owned timers and the shard router."""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import pytest
+from sqlalchemy.orm import Session
+from models.game_set import GameSet
+from models.player import Player
+from services import game_service, sharding, timer_service
+from services.sharding import HashRing
+from shard_router import SHARD_HEADER, ShardRouter
+
+SHARD_URLS = ["http://shard-0", "http://shard-1", "http://shard-2"]
+
+
+def test_ring_spreads_keys_and_moves_few_when_growing():
+    keys = [f"set-{i}" for i in range(3000)]
+    three, four = HashRing(3), HashRing(4)
+
+    owners = [three.shard_for(key) for key in keys]
+    assert owners == [HashRing(3).shard_for(key) for key in keys]
+    for shard in range(3):
+        assert 700 < owners.count(shard) < 1300
+
+    moved = [key for key, owner in zip(keys, owners) if four.shard_for(key) != owner]
+    assert 500 < len(moved) < 1100
+    # Keys only move to the new shard
+    assert {four.shard_for(key) for key in moved} == {3}
+
+
+def test_preference_starts_with_owner_and_covers_every_shard():
+    ring = HashRing(3)
+    for key in ("set-a", "set-b", "set-c"):
+        order = ring.preference(key)
+        assert order[0] == ring.shard_for(key)
+        assert sorted(order) == [0, 1, 2]
+    with pytest.raises(ValueError):
+        HashRing(0)
+
+
+def test_shard_loads_only_its_own_timers(db: Session, monkeypatch):
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_set = GameSet(num_players=3, selected_roles=["Werewolf", "Villager", "Villager", "Seer", "Villager", "Villager"])
+    db.add(game_set)
+    db.flush()
+    for i in range(3):
+        player = Player(player_name=f"Player{i}")
+        db.add(player)
+        db.flush()
+        game_set.players.append(player)
+    db.commit()
+    game = game_service.start_game(db, game_set.game_set_id)
+    game.state = "DAY_DISCUSSION"
+    db.commit()
+    assert game.game_id in timer_service.load_pending_deadlines(db)
+
+    ring = HashRing(2)
+    owner = ring.shard_for(game_set.game_set_id)
+    monkeypatch.setattr(sharding, "SHARD_COUNT", 2)
+    monkeypatch.setattr(sharding, "ring", ring)
+    monkeypatch.setattr(sharding, "SHARD_INDEX", 1 - owner)
+    assert game.game_id not in timer_service.load_pending_deadlines(db)
+    monkeypatch.setattr(sharding, "SHARD_INDEX", owner)
+    assert game.game_id in timer_service.load_pending_deadlines(db)
+
+
+def _router(down: set[str] = frozenset(), game_sets: dict[str, str] | None = None):
+    """A router over three fake shards that echo the path they served; hosts in `down` refuse connections."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host in down:
+            raise httpx.ConnectError("refused", request=request)
+        if request.url.path == "/metrics":
+            text = f'# HELP onw_requests_total Requests.\n# TYPE onw_requests_total counter\nonw_requests_total{{route="/api/games"}} {request.url.host[-1]}\n'
+            return httpx.Response(200, headers={"content-type": "text/plain"}, stream=httpx.ByteStream(text.encode()))
+        body = json.dumps({"shard": request.url.host, "path": request.url.raw_path.decode()}).encode()
+        # Streamed, as a real shard's response is
+        return httpx.Response(200, headers={"content-type": "application/json"}, stream=httpx.ByteStream(body))
+
+    async def resolve(game_id: str):
+        return (game_sets or {}).get(game_id)
+
+    return ShardRouter(SHARD_URLS, resolve_game_set=resolve, transport=httpx.MockTransport(handler))
+
+
+async def _get(router: ShardRouter, path: str) -> httpx.Response:
+    async with httpx.AsyncClient(app=router, base_url="http://router") as client:
+        return await client.get(path)
+
+
+async def test_router_sends_a_game_set_and_its_games_to_one_shard():
+    router = _router(game_sets={"game-1": "set-1"})
+    owner = f"shard-{router.ring.shard_for('set-1')}"
+
+    for path in ("/api/game-sets/set-1", "/api/game-sets/set-1/standings", "/api/games/game-1/state?player_id=p1"):
+        response = await _get(router, path)
+        assert response.json() == {"shard": owner, "path": path}
+        assert response.headers[SHARD_HEADER.decode()] == owner.removeprefix("shard-")
+
+
+async def test_router_fails_over_to_next_shard():
+    ring = HashRing(len(SHARD_URLS))
+    owner, fallback = ring.preference("set-1")[:2]
+    response = await _get(_router(down={f"shard-{owner}"}), "/api/game-sets/set-1")
+    assert response.json()["shard"] == f"shard-{fallback}"
+
+    response = await _get(_router(down={f"shard-{i}" for i in range(3)}), "/api/game-sets/set-1")
+    assert response.status_code == 502
+
+
+async def test_router_serves_each_shards_metrics_and_their_merge():
+    response = await _get(_router(down={"shard-1"}), "/metrics")
+    assert response.text.splitlines() == [
+        "# HELP onw_requests_total Requests.",
+        "# TYPE onw_requests_total counter",
+        'onw_requests_total{shard="0",route="/api/games"} 0',
+        'onw_requests_total{shard="2",route="/api/games"} 2',
+        "# HELP onw_shard_up Whether the shard's metrics could be scraped.",
+        "# TYPE onw_shard_up gauge",
+        'onw_shard_up{shard="0"} 1',
+        'onw_shard_up{shard="1"} 0',
+        'onw_shard_up{shard="2"} 1',
+    ]
+
+    router = _router()
+    for shard in range(3):
+        response = await _get(router, f"/metrics?shard={shard}")
+        assert response.headers[SHARD_HEADER.decode()] == str(shard)
+        assert f'route="/api/games"}} {shard}' in response.text
+    assert (await _get(router, "/metrics?shard=3")).status_code == 404
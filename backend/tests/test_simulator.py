@@ -0,0 +1,88 @@
+"""Tests for the vectorized game simulator, checked against the scalar rules."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from models import roles
+from services import rules, simulator
+from services.simulator import ROLE_CODES, TEAMS
+
+SETUP = ["Werewolf", "Werewolf", "Minion", "Seer", "Robber", "Troublemaker", "Drunk", "Hunter", "Hunter", "Tanner"]
+
+
+def _roles(codes) -> list[str]:
+    return [ROLE_CODES[code].value for code in codes]
+
+
+def test_batch_matches_scalar_rules():
+    rng = np.random.default_rng(7)
+    games = simulator.play(rng, SETUP, 2000)
+    night, num_players = games.night, games.night.num_players
+
+    for g in range(2000):
+        initial, final = _roles(night.initial[g]), _roles(night.final[g])
+        assert sorted(initial) == sorted(final)
+        current_roles = dict(enumerate(final[:num_players]))
+        votes = {seat: int(target) for seat, target in enumerate(games.votes[g])}
+        assert all(target != seat for seat, target in votes.items())
+
+        deaths = rules.resolve_deaths(votes, current_roles)
+        assert sorted(deaths) == np.flatnonzero(games.died[g]).tolist()
+        team_won = rules.winning_team(deaths, current_roles)
+        assert TEAMS[games.winning_team[g]] == team_won
+        expected_won = [
+            rules.player_won(team_won, rules_team, final[seat])
+            for seat, rules_team in enumerate(map(roles.team_for, initial[:num_players]))
+        ]
+        assert games.won[g].tolist() == expected_won
+
+
+def test_night_moves_only_touch_center_with_a_drunk():
+    rng = np.random.default_rng(3)
+    games = simulator.play(rng, ["Robber", "Troublemaker", "Villager", "Werewolf", "Werewolf", "Seer"], 500)
+    night = games.night
+    assert not np.array_equal(night.initial, night.final)
+    # Without a Drunk the center never changes
+    assert np.array_equal(night.initial[:, 3:], night.final[:, 3:])
+
+
+def test_simulate_totals():
+    result = simulator.simulate(SETUP, 25_000, seed=1, batch_size=10_000)
+
+    assert result.games == 25_000
+    assert sum(result.team_wins.values()) == 25_000
+    assert sum(result.win_rates.values()) == pytest.approx(1.0)
+    assert sum(result.role_games.values()) == 25_000 * 7
+    assert set(result.role_win_rates) == set(SETUP)
+    assert all(0 <= rate <= 1 for rate in result.role_win_rates.values())
+    # Same seed, same games
+    assert simulator.simulate(SETUP, 25_000, seed=1, batch_size=10_000) == result
+
+
+def test_simulate_with_custom_policy():
+    def vote_first_other(rng, night):
+        votes = np.zeros((night.initial.shape[0], night.num_players), dtype=np.int64)
+        votes[:, 0] = 1
+        return votes
+
+    result = simulator.simulate(["Tanner", "Villager", "Villager", "Villager", "Villager", "Villager"], 100, vote_first_other, seed=0)
+    # Everyone but seat 0 votes for seat 0, who dies; the Tanner wins whenever they were dealt that seat
+    assert result.team_wins[rules.TANNER] + result.team_wins[rules.WEREWOLF] == 100
+    assert result.role_wins["Tanner"] == result.team_wins[rules.TANNER]
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"selected_roles": ["Werewolf", "Seer", "Villager", "Villager", "Robber"]}, "Need 6 to 13 roles"),
+    ({"selected_roles": ["Werewolf", "Seer", "Villager", "Villager", "Robber", "Wizard"]}, "Invalid roles"),
+    ({"n_games": 0}, "at least 1"),
+    ({"policy": "smart"}, "Unknown policy"),
+])
+def test_simulate_rejects_invalid_input(kwargs, message):
+    args = {"selected_roles": SETUP, "n_games": 10, **kwargs}
+    with pytest.raises(ValueError, match=message):
+        simulator.simulate(**args)
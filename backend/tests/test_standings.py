@@ -0,0 +1,156 @@
+"""Tests for game set standings (cumulative wins across a set's games)."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from main import app
+from models.game import GameState
+from models.game_result import GameResult
+from models.game_set import GameSet
+from models.game_set_standing import GameSetStanding
+from models.player import Player
+from models.player_role import PlayerRole
+from services import game_service, standings_service, voting_service
+
+client = TestClient(app)
+
+ROLES = ["Werewolf", "Villager", "Villager", "Villager", "Villager", "Villager"]
+
+
+@pytest.fixture
+def game_set(db, monkeypatch):
+    """A 3-player set; without the shuffle every game deals the Werewolf to the same player."""
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_set = GameSet(num_players=3, selected_roles=ROLES)
+    db.add(game_set)
+    db.flush()
+    for name in ("Ann", "Ben", "Cat"):
+        player = Player(player_name=name)
+        db.add(player)
+        db.flush()
+        game_set.players.append(player)
+    db.commit()
+    return game_set
+
+
+def _play(db, game_set_id: str, votes: dict[str, str]) -> dict[str, str]:
+    """
+    Start a game and cast votes (voter -> target) by seat label: "W" is the Werewolf,
+    "V1" and "V2" the Villagers by name. The last vote ends the game. Returns label -> player_id.
+    """
+    game = game_service.start_game(db, game_set_id)
+    game.state = GameState.DAY_VOTING
+    db.commit()
+    by_role = sorted(game.player_roles, key=lambda pr: (pr.initial_role != "Werewolf", pr.player.player_name))
+    ids = dict(zip(("W", "V1", "V2"), (pr.player_id for pr in by_role)))
+    for voter, target in votes.items():
+        voting_service.cast_vote(db, game.game_id, ids[voter], ids[target])
+    return ids
+
+
+def _by_label(standings: dict, ids: dict[str, str]) -> dict:
+    labels = {player_id: label for label, player_id in ids.items()}
+    return {labels[s["player_id"]]: s for s in standings["standings"]}
+
+
+def test_standings_before_any_game(db, game_set):
+    standings = standings_service.get_standings(db, game_set.game_set_id)
+    assert standings["games_played"] == 0
+    assert [s["rank"] for s in standings["standings"]] == [1, 1, 1]
+    assert all(s["wins"] == 0 and s["games_played"] == 0 for s in standings["standings"])
+
+
+def test_standings_accumulate_as_games_finish(db, game_set):
+    # Village wins: the Werewolf dies
+    ids = _play(db, game_set.game_set_id, {"W": "V1", "V1": "W", "V2": "W"})
+    # Werewolf wins: V1 dies
+    assert _play(db, game_set.game_set_id, {"W": "V1", "V1": "V2", "V2": "V1"}) == ids
+    # Werewolf wins: nobody gets two votes
+    assert _play(db, game_set.game_set_id, {"W": "V1", "V1": "V2", "V2": "W"}) == ids
+
+    standings = standings_service.get_standings(db, game_set.game_set_id)
+    assert standings["games_played"] == 3
+    by_label = _by_label(standings, ids)
+    assert {label: s["wins"] for label, s in by_label.items()} == {"W": 2, "V1": 1, "V2": 1}
+    assert {label: s["deaths"] for label, s in by_label.items()} == {"W": 1, "V1": 1, "V2": 0}
+    assert {label: s["votes_received"] for label, s in by_label.items()} == {"W": 3, "V1": 4, "V2": 2}
+    # Ranked by wins; the Villagers tie on wins, fewer deaths first
+    assert [s["player_id"] for s in standings["standings"]] == [ids["W"], ids["V2"], ids["V1"]]
+    assert [s["rank"] for s in standings["standings"]] == [1, 2, 2]
+
+    # The incremental totals match a rebuild from player_roles and votes
+    incremental = {s.player_id: (s.games_played, s.wins, s.deaths, s.votes_received) for s in db.query(GameSetStanding)}
+    standings_service.rebuild_standings(db, game_set.game_set_id)
+    db.flush()
+    rebuilt = {s.player_id: (s.games_played, s.wins, s.deaths, s.votes_received) for s in db.query(GameSetStanding)}
+    assert rebuilt == incremental
+
+
+def test_standings_read_does_not_grow_with_games(db, game_set):
+    def statements_for_read():
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.get_bind(), "before_cursor_execute", listener)
+        try:
+            db.expire_all()
+            standings_service.get_standings(db, game_set.game_set_id)
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", listener)
+        return len(statements)
+
+    _play(db, game_set.game_set_id, {"W": "V1", "V1": "W", "V2": "W"})
+    after_one = statements_for_read()
+    for _ in range(3):
+        _play(db, game_set.game_set_id, {"W": "V1", "V1": "V2", "V2": "V1"})
+    assert statements_for_read() == after_one
+
+
+def test_standings_rebuilt_for_games_finished_before_they_were_kept(db, game_set):
+    _play(db, game_set.game_set_id, {"W": "V1", "V1": "W", "V2": "W"})
+    _play(db, game_set.game_set_id, {"W": "V1", "V1": "V2", "V2": "V1"})
+    expected = standings_service.get_standings(db, game_set.game_set_id)
+
+    # As recorded before standings and player_roles.won existed
+    db.query(GameSetStanding).delete()
+    db.query(PlayerRole).update({PlayerRole.won: None})
+    db.commit()
+
+    assert standings_service.get_standings(db, game_set.game_set_id) == expected
+    assert db.query(GameSetStanding).count() == 3
+
+
+def test_standings_count_finished_games_whose_results_were_never_recorded(db, game_set):
+    """A game that reached RESULTS before results were recorded counts without its results being read."""
+    game = game_service.start_game(db, game_set.game_set_id)
+    game.state = GameState.RESULTS
+    db.commit()
+
+    standings = standings_service.get_standings(db, game_set.game_set_id)
+    assert standings["games_played"] == 1
+    assert db.query(GameResult).filter(GameResult.game_id == game.game_id).count() == 1
+    assert [s["games_played"] for s in standings["standings"]] == [1, 1, 1]
+
+
+def test_standings_unknown_game_set(db):
+    with pytest.raises(ValueError, match="not found"):
+        standings_service.get_standings(db, "no-such-set")
+
+
+def test_standings_endpoint():
+    game_set = client.post("/api/game-sets", json={
+        "num_players": 3, "selected_roles": ROLES, "discussion_timer_seconds": 300,
+    }).json()
+    player = client.post("/api/players", json={"player_name": "Solo"}).json()
+    client.post(f"/api/game-sets/{game_set['game_set_id']}/players/{player['player_id']}/join")
+
+    response = client.get(f"/api/game-sets/{game_set['game_set_id']}/standings")
+    assert response.status_code == 200
+    assert response.json()["standings"] == [{
+        "player_id": player["player_id"], "player_name": "Solo",
+        "games_played": 0, "wins": 0, "deaths": 0, "votes_received": 0, "rank": 1,
+    }]
+    assert client.get("/api/game-sets/no-such-set/standings").status_code == 404
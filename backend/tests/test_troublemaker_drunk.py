@@ -6,8 +6,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from main import app
-from services import game_service
+from models.game_set import GameSet
+from models.player import Player
+from services import action_service, game_service, troublemaker_service
 
 client = TestClient(app)
 
@@ -171,3 +174,34 @@ def test_drunk_advances_night_to_insomniac_or_day(monkeypatch):
     assert "Drunk" in status["roles_completed"]
     game = client.get(f"/api/games/{game_id}").json()
     assert game["state"] == "DAY_DISCUSSION"
+
+
+def test_player_actions_load_names_in_one_query(db, monkeypatch):
+    """Descriptions use one roster query instead of a Player lookup per action."""
+    monkeypatch.setattr(game_service.random, "shuffle", lambda items: None)
+    game_set = GameSet(num_players=3, selected_roles=["Troublemaker", "Villager", "Villager", "Villager", "Villager", "Villager"])
+    db.add(game_set)
+    db.flush()
+    for i in range(3):
+        player = Player(player_name=f"Player{i}")
+        db.add(player)
+        db.flush()
+        game_set.players.append(player)
+    db.commit()
+    game = game_service.start_game(db, game_set.game_set_id)
+    roles = {pr.initial_role: pr.player_id for pr in game.player_roles}
+    troublemaker_id = roles["Troublemaker"]
+    others = [pr.player_id for pr in game.player_roles if pr.player_id != troublemaker_id]
+    troublemaker_service.perform_troublemaker_action(db, game.game_id, troublemaker_id, others[0], others[1])
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        result = action_service.get_player_actions(db, game.game_id, troublemaker_id)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    names = [db.query(Player).filter(Player.player_id == pid).first().player_name for pid in others]
+    assert result["actions"][0]["description"] == f"You swapped the cards of {names[0]} and {names[1]}."
+    assert sum("FROM players" in s for s in statements) == 1
@@ -12,6 +12,13 @@ from services import game_service
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True, scope="module")
+def phase_scheduler_running():
+    """Run the app lifespan so the phase scheduler fires the discussion timer."""
+    with client:
+        yield
+
+
 def _game_to_day_voting():
     """Get a game in DAY_VOTING (short discussion timer, then sleep)."""
     game_set_response = client.post("/api/game-sets", json={
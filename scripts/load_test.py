@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Load-test the backend by playing full games through the HTTP API.
+
+Each game set gets one bot per player. Bots behave like the frontend: they create a
+player and join, wait in the lobby, acknowledge their role, then poll the same routes
+at the same cadence as GameBoard.tsx (game, available actions, discussion status and
+night info every second; players, accrued actions and votes every two seconds). When
+their role's step comes up they act (Seer, Robber, Troublemaker, Drunk, lone Werewolf)
+or acknowledge (Werewolves, Minion, Mason, Insomniac). In the day they vote-now and
+then vote for a random player, and stop once the results are in.
+
+At the end it prints p50/p95/p99 latency, request and 4xx/5xx counts per route, plus
+"database is locked" errors. Use --start-server to run a local uvicorn against a
+scratch database; the lock count then also includes errors from the server log.
+
+Roles that are only in the center take 15-40 seconds each at night (the backend's
+simulated turn), so a game takes a minute or two. Use --games to play several games
+back to back per game set.
+
+Run with the backend's dependencies (httpx), e.g. from backend/:
+  uv run python ../scripts/load_test.py --start-server --game-sets 20 --players 6
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from urllib.parse import urlparse
+
+import httpx
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+BACKEND_DIR = REPO_ROOT / "backend"
+
+# Frontend polling intervals (components/game/GameBoard.tsx, app/lobby/[game_set_id]/page.tsx)
+FAST_POLL_SECONDS = 1.0
+SLOW_POLL_SECONDS = 2.0
+
+# Roles dealt for a game of N players: the first N + 3, padded with Villagers
+ROLE_POOL = [
+    "Werewolf", "Werewolf", "Seer", "Robber", "Troublemaker", "Drunk",
+    "Insomniac", "Minion", "Mason", "Mason", "Tanner", "Hunter",
+]
+# Roles that fetch night info and then acknowledge it
+NIGHT_INFO_ROLES = {"Werewolf", "Minion", "Mason", "Insomniac"}
+
+LOCKED_MESSAGE = "database is locked"
+
+
+def roles_for(num_players: int) -> list[str]:
+    selected = ROLE_POOL[: num_players + 3]
+    return selected + ["Villager"] * (num_players + 3 - len(selected))
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Stats:
+    """Latency and status counts per route template (e.g. GET /api/games/{game_id})."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.locked_responses = 0
+        self.games_finished = 0
+        self.game_seconds: list[float] = []
+
+    def record(self, route: str, status: int | str, seconds: float, body: str = "") -> None:
+        self.latencies[route].append(seconds)
+        self.statuses[route][status] += 1
+        if LOCKED_MESSAGE in body:
+            self.locked_responses += 1
+
+    def report(self, elapsed: float, server_locked_lines: int | None) -> dict:
+        routes = {}
+        for route in sorted(self.latencies):
+            values = sorted(self.latencies[route])
+            statuses = self.statuses[route]
+            routes[route] = {
+                "requests": len(values),
+                # 4xx are usually expected (e.g. the lobby polling active-game before the start)
+                "client_errors": sum(n for status, n in statuses.items() if isinstance(status, int) and 400 <= status < 500),
+                # 5xx and transport errors (timeouts, refused connections)
+                "server_errors": sum(n for status, n in statuses.items() if not isinstance(status, int) or status >= 500),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "statuses": {str(status): n for status, n in statuses.items()},
+            }
+        total = sum(route["requests"] for route in routes.values())
+        return {
+            "elapsed_seconds": round(elapsed, 1),
+            "requests": total,
+            "requests_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+            "games_finished": self.games_finished,
+            "median_game_seconds": round(percentile(sorted(self.game_seconds), 50), 1),
+            "locked_errors_in_responses": self.locked_responses,
+            "locked_errors_in_server_log": server_locked_lines,
+            "routes": routes,
+        }
+
+
+def print_report(report: dict) -> None:
+    width = max([len(route) for route in report["routes"]] + [5])
+    print(f"\n{'route':<{width}}  {'reqs':>7}  {'4xx':>5}  {'5xx':>5}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}")
+    for route, row in report["routes"].items():
+        print(
+            f"{route:<{width}}  {row['requests']:>7}  {row['client_errors']:>5}  {row['server_errors']:>5}  "
+            f"{row['p50_ms']:>8}  {row['p95_ms']:>8}  {row['p99_ms']:>8}"
+        )
+    print(
+        f"\n{report['requests']} requests in {report['elapsed_seconds']}s "
+        f"({report['requests_per_second']} req/s), {report['games_finished']} games finished "
+        f"(median {report['median_game_seconds']}s)"
+    )
+    print(f"'{LOCKED_MESSAGE}' in responses: {report['locked_errors_in_responses']}")
+    if report["locked_errors_in_server_log"] is not None:
+        print(f"'{LOCKED_MESSAGE}' in server log: {report['locked_errors_in_server_log']}")
+
+
+class Api:
+    """Thin httpx wrapper that times every call under its route template."""
+
+    def __init__(self, client: httpx.AsyncClient, stats: Stats) -> None:
+        self.client = client
+        self.stats = stats
+
+    async def call(self, method: str, route: str, payload: dict | None = None, **params: str) -> httpx.Response | None:
+        path = route.format(**params)
+        label = f"{method} {route}"
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, json=payload)
+        except httpx.HTTPError as e:
+            self.stats.record(label, type(e).__name__, time.perf_counter() - start)
+            return None
+        body = response.text if response.status_code >= 400 else ""
+        self.stats.record(label, response.status_code, time.perf_counter() - start, body)
+        return response
+
+    async def json(self, method: str, route: str, payload: dict | None = None, **params: str) -> dict | None:
+        response = await self.call(method, route, payload, **params)
+        if response is None or response.status_code >= 400:
+            return None
+        return response.json()
+
+
+class Bot:
+    """One player: joins the game set and plays every game through the API like the frontend does."""
+
+    def __init__(self, api: Api, game_set_id: str, name: str) -> None:
+        self.api = api
+        self.game_set_id = game_set_id
+        self.name = name
+        self.player_id: str | None = None
+        self.other_player_ids: list[str] = []
+
+    async def join(self) -> None:
+        player = await self.api.json("POST", "/api/players", {"player_name": self.name})
+        if player is None:
+            raise RuntimeError(f"{self.name}: could not create player")
+        self.player_id = player["player_id"]
+        joined = await self.api.json(
+            "POST", "/api/game-sets/{game_set_id}/players/{player_id}/join",
+            game_set_id=self.game_set_id, player_id=self.player_id,
+        )
+        if joined is None:
+            raise RuntimeError(f"{self.name}: could not join game set {self.game_set_id}")
+
+    async def wait_in_lobby(self, previous_game_id: str | None, deadline: float) -> str | None:
+        """Poll the lobby routes until a new game starts; returns its ID (None on timeout)."""
+        while time.monotonic() < deadline:
+            players = await self.api.json("GET", "/api/game-sets/{game_set_id}/players", game_set_id=self.game_set_id)
+            if players:
+                self.other_player_ids = [
+                    p["player_id"] for p in players.get("players", []) if p["player_id"] != self.player_id
+                ]
+            game = await self.api.json("GET", "/api/game-sets/{game_set_id}/active-game", game_set_id=self.game_set_id)
+            if game and game["game_id"] != previous_game_id:
+                return game["game_id"]
+            await asyncio.sleep(SLOW_POLL_SECONDS)
+        return None
+
+    async def play(self, game_id: str, deadline: float) -> bool:
+        """Play one game until RESULTS; returns False if the deadline passed first."""
+        ids = {"game_id": game_id, "player_id": self.player_id}
+        role = await self.api.json("GET", "/api/games/{game_id}/players/{player_id}/role", **ids)
+        if role is None:
+            return False
+        initial_role = role["initial_role"]
+        await asyncio.sleep(random.uniform(0.5, 2.0))  # reading the role card
+        await self.api.call("POST", "/api/games/{game_id}/players/{player_id}/acknowledge-role", **ids)
+
+        acted = False
+        voted_now = False
+        voted = False
+        tick = 0
+        while time.monotonic() < deadline:
+            slow_tick = tick % 2 == 0
+            tick += 1
+            game = await self.api.json("GET", "/api/games/{game_id}", **ids)
+            if game is None:
+                await asyncio.sleep(FAST_POLL_SECONDS)
+                continue
+            state = game["state"]
+            if slow_tick:
+                await self.api.call("GET", "/api/game-sets/{game_set_id}/players", game_set_id=self.game_set_id)
+                await self.api.call("GET", "/api/games/{game_id}/players/{player_id}/actions", **ids)
+
+            if state == "NIGHT":
+                await self.api.call("GET", "/api/games/{game_id}/players/{player_id}/available-actions", **ids)
+                if not acted and game["current_role_step"] == initial_role:
+                    acted = await self.night_action(initial_role, ids)
+            elif state == "DAY_DISCUSSION":
+                await self.api.call(
+                    "GET", "/api/games/{game_id}/discussion-status?player_id={player_id}", **ids
+                )
+                if not voted_now:
+                    response = await self.api.call("POST", "/api/games/{game_id}/players/{player_id}/vote-now", **ids)
+                    voted_now = response is not None and response.status_code < 400
+            elif state == "DAY_VOTING":
+                if slow_tick:
+                    await self.api.call("GET", "/api/games/{game_id}/votes", **ids)
+                if not voted and self.other_player_ids:
+                    response = await self.api.call(
+                        "POST", "/api/games/{game_id}/players/{player_id}/vote",
+                        {"target_player_id": random.choice(self.other_player_ids)}, **ids,
+                    )
+                    voted = response is not None and response.status_code < 400
+            elif state == "RESULTS":
+                await self.api.call("GET", "/api/games/{game_id}/results", **ids)
+                return True
+            await asyncio.sleep(FAST_POLL_SECONDS)
+        return False
+
+    async def night_action(self, role: str, ids: dict) -> bool:
+        """Take this role's night action; returns True once it went through."""
+        others = self.other_player_ids
+        if role in NIGHT_INFO_ROLES:
+            info = await self.api.json("GET", "/api/games/{game_id}/players/{player_id}/night-info", **ids)
+            if info is None:
+                return False
+            await asyncio.sleep(random.uniform(0.5, 2.0))
+            if role == "Werewolf" and info.get("is_lone_wolf"):
+                route, payload = "/api/games/{game_id}/players/{player_id}/view-center", {"card_index": random.randrange(3)}
+            else:
+                route, payload = "/api/games/{game_id}/players/{player_id}/acknowledge", None
+        elif role == "Seer":
+            if others and random.random() < 0.5:
+                payload = {"action_type": "view_player", "target_player_id": random.choice(others)}
+            else:
+                payload = {"action_type": "view_center", "card_indices": random.sample(range(3), 2)}
+            route = "/api/games/{game_id}/players/{player_id}/seer-action"
+        elif role == "Robber" and others:
+            route, payload = "/api/games/{game_id}/players/{player_id}/robber-action", {"target_player_id": random.choice(others)}
+        elif role == "Troublemaker" and len(others) >= 2:
+            first, second = random.sample(others, 2)
+            route, payload = "/api/games/{game_id}/players/{player_id}/troublemaker-action", {"player1_id": first, "player2_id": second}
+        elif role == "Drunk":
+            route, payload = "/api/games/{game_id}/players/{player_id}/drunk-action", {"card_index": random.randrange(3)}
+        else:
+            return True  # No night action for this role
+        response = await self.api.call("POST", route, payload, **ids)
+        return response is not None and response.status_code < 400
+
+
+async def run_game_set(api: Api, args: argparse.Namespace, index: int) -> None:
+    """Create a game set, join its bots and play args.games games in a row."""
+    game_set = await api.json("POST", "/api/game-sets", {
+        "num_players": args.players,
+        "selected_roles": roles_for(args.players),
+        "discussion_timer_seconds": args.discussion_seconds,
+    })
+    if game_set is None:
+        print(f"game set {index}: could not be created", file=sys.stderr)
+        return
+    game_set_id = game_set["game_set_id"]
+    bots = [Bot(api, game_set_id, f"Bot{index}-{seat + 1}") for seat in range(args.players)]
+    await asyncio.gather(*(bot.join() for bot in bots))
+
+    game_id = None
+    for _ in range(args.games):
+        started_at = time.monotonic()
+        deadline = started_at + args.game_timeout
+        waiting = [asyncio.create_task(bot.wait_in_lobby(game_id, deadline)) for bot in bots]
+        # The first bot acts as host and starts the game once everyone is in
+        await asyncio.sleep(random.uniform(0, SLOW_POLL_SECONDS))
+        started = await api.json("POST", "/api/game-sets/{game_set_id}/start", game_set_id=game_set_id)
+        lobby_ids = await asyncio.gather(*waiting)
+        if started is None or started["game_id"] not in lobby_ids:
+            print(f"game set {index}: game did not start", file=sys.stderr)
+            return
+        game_id = started["game_id"]
+        finished = await asyncio.gather(*(bot.play(game_id, deadline) for bot in bots))
+        if not all(finished):
+            print(f"game set {index}: game {game_id} did not finish in {args.game_timeout}s", file=sys.stderr)
+            return
+        api.stats.games_finished += 1
+        api.stats.game_seconds.append(time.monotonic() - started_at)
+
+
+class Server:
+    """
+    A local uvicorn on a scratch SQLite database, with its log scanned for lock errors.
+
+    With several workers, as in start_prod.sh: one shard per worker behind the shard
+    router, and a local broker carrying the event bus between them.
+    """
+
+    def __init__(self, backend_url: str, workers: int) -> None:
+        self.port = urlparse(backend_url).port or 8000
+        self.workers = workers
+        self.locked_lines = 0
+        self._scratch = tempfile.TemporaryDirectory(prefix="onw-load-")
+        self._processes: list[subprocess.Popen] = []
+        self._broker: subprocess.Popen | None = None
+
+    def start(self) -> None:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{Path(self._scratch.name) / 'load.db'}")
+        if self.workers == 1:
+            self._start_uvicorn("main:app", self.port, env)
+            return
+
+        if "EVENT_BUS_URL" not in env:
+            broker_port = _free_port()
+            self._broker = subprocess.Popen(
+                [sys.executable, "-m", "services.local_broker", "--port", str(broker_port)],
+                cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            env["EVENT_BUS_URL"] = f"redis://127.0.0.1:{broker_port}"
+        shard_urls = []
+        for index in range(self.workers):
+            port = _free_port()
+            self._start_uvicorn("main:app", port, dict(env, SHARD_INDEX=str(index), SHARD_COUNT=str(self.workers)))
+            shard_urls.append(f"http://127.0.0.1:{port}")
+        self._start_uvicorn("shard_router:app", self.port, dict(env, SHARD_URLS=",".join(shard_urls)))
+
+    def _start_uvicorn(self, app: str, port: int, env: dict) -> None:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        self._processes.append(process)
+        threading.Thread(target=self._scan_log, args=(process,), daemon=True).start()
+
+    def _scan_log(self, process: subprocess.Popen) -> None:
+        for line in process.stderr:
+            if LOCKED_MESSAGE in line:
+                self.locked_lines += 1
+
+    async def wait_ready(self, client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for process in self._processes:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                if await self._ready(client):
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+        raise RuntimeError(f"uvicorn did not become ready within {timeout}s")
+
+    async def _ready(self, client: httpx.AsyncClient) -> bool:
+        if self.workers == 1:
+            return (await client.get("/health")).status_code == 200
+        # The router's merged /metrics reports whether it can reach each shard
+        metrics = (await client.get("/metrics")).text
+        return all(f'onw_shard_up{{shard="{index}"}} 1' in metrics for index in range(self.workers))
+
+    def stop(self) -> None:
+        for process in reversed(self._processes):
+            if process.poll() is None:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        if self._broker:
+            self._broker.terminate()
+            self._broker.wait()
+        self._scratch.cleanup()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    stats = Stats()
+    server = Server(args.backend, args.workers) if args.start_server else None
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=args.backend, timeout=args.request_timeout, limits=limits) as client:
+        try:
+            if server:
+                server.start()
+                await server.wait_ready(client)
+            api = Api(client, stats)
+            started = time.perf_counter()
+            await asyncio.gather(*(run_game_set(api, args, i + 1) for i in range(args.game_sets)))
+            elapsed = time.perf_counter() - started
+        finally:
+            if server:
+                server.stop()
+    return stats.report(elapsed, server.locked_lines if server else None)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Play N concurrent game sets through the HTTP API and report latency per route.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--game-sets", type=int, default=10, help="Concurrent game sets (default 10)")
+    parser.add_argument("--players", type=int, default=5, help="Players (bots) per game set, 3-10 (default 5)")
+    parser.add_argument("--games", type=int, default=1, help="Games played back to back per game set (default 1)")
+    parser.add_argument(
+        "--discussion-seconds", type=int, default=60,
+        help="Discussion timer; bots vote-now straight away so it rarely runs out (default 60)",
+    )
+    parser.add_argument("--game-timeout", type=float, default=300.0, help="Seconds before a game counts as stuck")
+    parser.add_argument("--request-timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default=os.environ.get("BACKEND_URL", "http://localhost:8000").rstrip("/"),
+        help="Backend base URL",
+    )
+    parser.add_argument(
+        "--start-server",
+        action="store_true",
+        help="Start uvicorn from backend/ on the --backend port with a scratch database, and count lock errors in its log",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="With --start-server, run this many shards behind the shard router (default 1: a single uvicorn)",
+    )
+    parser.add_argument("--json", type=str, default="", metavar="PATH", help="Also write the report as JSON to PATH")
+    args = parser.parse_args()
+
+    if not 3 <= args.players <= 10:
+        print("Error: --players must be between 3 and 10.", file=sys.stderr)
+        return 1
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
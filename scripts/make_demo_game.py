@@ -31,6 +31,9 @@ sys.path.insert(0, str(BACKEND_DIR))
 # DB path same as backend/db/database.py (sqlite:///./onw.db -> backend/onw.db)
 DB_PATH = BACKEND_DIR / "onw.db"
 
+# Teams and wake order come from the backend's role registry
+from models import roles  # noqa: E402
+
 # One alias per role; same first letter as name, two letters when needed for uniqueness
 ROLE_ALIASES = {
     "Werewolf": "w",
@@ -48,11 +51,6 @@ ROLE_ALIASES = {
 CANONICAL_ROLES = list(ROLE_ALIASES.keys())
 SHORT_CODES = {alias: role for role, alias in ROLE_ALIASES.items()}
 
-# Wake order for active_roles (must match backend)
-WAKE_ORDER = [
-    "Doppelganger", "Werewolf", "Minion", "Mason", "Seer",
-    "Robber", "Troublemaker", "Drunk", "Insomniac",
-]
 
 
 def _roles_help_text() -> str:
@@ -80,14 +78,6 @@ def normalize_roles(tokens: list[str]) -> list[str]:
     return [normalize_role(t) for t in tokens]
 
 
-def team_for_role(role: str) -> str:
-    if role in ("Werewolf", "Minion"):
-        return "werewolf"
-    if role == "Tanner":
-        return "tanner"
-    return "village"
-
-
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Seed a dev game. Use --players and --center to fix roles; else random 3-player game.",
@@ -185,16 +175,16 @@ def main() -> int:
             raise RuntimeError(f"GET {url} failed: {e.code} {body}")
 
     if full_roles is None:
-        roles = ["Werewolf", "Werewolf", "Villager", "Seer", "Robber", "Villager"]
+        selected_roles = ["Werewolf", "Werewolf", "Villager", "Seer", "Robber", "Villager"]
         if num_players != 3:
-            roles = ["Werewolf", "Villager"] * max(0, (num_players + 3) // 2)
-            roles = (roles + ["Villager"])[: num_players + 3]
+            selected_roles = ["Werewolf", "Villager"] * max(0, (num_players + 3) // 2)
+            selected_roles = (selected_roles + ["Villager"])[: num_players + 3]
     else:
-        roles = full_roles
+        selected_roles = full_roles
 
     payload = {
         "num_players": num_players,
-        "selected_roles": roles,
+        "selected_roles": selected_roles,
         "discussion_timer_seconds": 300,
     }
     game_set = post("/api/game-sets", payload)
@@ -226,6 +216,7 @@ def main() -> int:
         from models.player import Player
         from models.player_role import PlayerRole
         from models.center_card import CenterCard
+        from services import night_service, version_service
 
         engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -248,7 +239,7 @@ def main() -> int:
                     role = player_roles[i]
                     pr.initial_role = role
                     pr.current_role = role
-                    pr.team = team_for_role(role)
+                    pr.team = roles.team_for(role)
 
                 positions = ["left", "center", "right"]
                 for i, pos in enumerate(positions):
@@ -260,12 +251,18 @@ def main() -> int:
                         cc.role = center_roles[i]
 
                 all_roles_in_game = set(player_roles) | set(center_roles)
-                active_roles = [r for r in WAKE_ORDER if r in all_roles_in_game]
+                active_roles = roles.wake_plan(all_roles_in_game)
                 game.active_roles = active_roles
+                # start_game woke the first role of the dealt roles; wake the fixed setup's instead.
+                # The backend's scheduler picks up a simulated role's deadline from the DB.
+                for column, value in night_service.first_step_values(active_roles, player_roles).items():
+                    setattr(game, column, value)
 
             # Mark all players as having acknowledged role (dev convenience: tabs open to main board)
             for pr in db.query(PlayerRole).filter(PlayerRole.game_id == game_id).all():
                 pr.role_revealed = True
+            # Open tabs and pollers must not keep the game as it was dealt
+            version_service.bump_version(db, game_id)
 
             if args.vote:
                 # Jump to day voting; shift final roles: each player gets initial_role of player to their left (mod N)
@@ -284,7 +281,7 @@ def main() -> int:
                 for i in range(n):
                     left_initial = initial_roles[(i - 1) % n]
                     roles_in_order[i].current_role = left_initial
-                    roles_in_order[i].team = team_for_role(left_initial)
+                    roles_in_order[i].team = roles.team_for(left_initial)
                 db.commit()
                 # Table: player name, original role, new role (printed at end of CLI output)
                 vote_table = []
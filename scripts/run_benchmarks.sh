@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+set -e
+cd "$(dirname "$0")/../backend"
+python -m pytest benchmarks/ --benchmark-json="${BENCHMARK_JSON:-benchmark.json}" "$@"
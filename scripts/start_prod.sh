@@ -5,10 +5,46 @@
 
 set -e
 
-# Start backend in background
+# Backend worker processes: one per core unless WEB_CONCURRENCY says otherwise
+WORKERS=${WEB_CONCURRENCY:-$(nproc)}
+
 cd /app/backend
-uv run uvicorn main:app --host 0.0.0.0 --port 8000 &
-BACKEND_PID=$!
+
+# Workers share game notifications over the event bus. Without an external
+# broker (EVENT_BUS_URL=redis://...), run the local stand-in on this machine.
+BROKER_PID=
+if [ "$WORKERS" -gt 1 ] && [ -z "$EVENT_BUS_URL" ]; then
+    uv run python -m services.local_broker --host 127.0.0.1 --port 6380 &
+    BROKER_PID=$!
+    export EVENT_BUS_URL=redis://127.0.0.1:6380
+fi
+
+# Start backend in background. With several workers, each is a shard owning a
+# slice of the game sets, behind the router on :8000 (see backend/shard_router.py);
+# a shard that exits is restarted and picks its games' timers back up from the
+# database. Never plain `uvicorn --workers N`: every worker would fire every
+# game's timers and act on its own cached copy of games the others change.
+SHARD_PIDS=
+if [ "$WORKERS" -gt 1 ]; then
+    SHARD_URLS=
+    for i in $(seq 0 $((WORKERS - 1))); do
+        port=$((8001 + i))
+        (
+            while true; do
+                SHARD_INDEX=$i SHARD_COUNT=$WORKERS uv run uvicorn main:app --host 127.0.0.1 --port $port || true
+                echo "Shard $i exited; restarting"
+                sleep 1
+            done
+        ) &
+        SHARD_PIDS="$SHARD_PIDS $!"
+        SHARD_URLS="${SHARD_URLS:+$SHARD_URLS,}http://127.0.0.1:$port"
+    done
+    SHARD_URLS=$SHARD_URLS uv run uvicorn shard_router:app --host 0.0.0.0 --port 8000 &
+    BACKEND_PID=$!
+else
+    uv run uvicorn main:app --host 0.0.0.0 --port 8000 &
+    BACKEND_PID=$!
+fi
 
 # Wait for backend to start
 sleep 2
@@ -25,7 +61,12 @@ sleep 2
 cleanup() {
     echo "Shutting down servers..."
     kill $BACKEND_PID 2>/dev/null || true
+    for pid in $SHARD_PIDS; do
+        pkill -P $pid 2>/dev/null || true
+        kill $pid 2>/dev/null || true
+    done
     kill $FRONTEND_PID 2>/dev/null || true
+    [ -n "$BROKER_PID" ] && kill $BROKER_PID 2>/dev/null || true
     exit 0
 }
 